@@ -1,11 +1,14 @@
 """API dependencies for dependency injection."""
 
 from functools import lru_cache
+from typing import TYPE_CHECKING
 from ..config import Settings, get_settings
 from ..services.llm_service import LLMService
-from ..services.scraper import ScraperService
 from ..services.summarizer import SummarizerService
 
+if TYPE_CHECKING:
+    from ..services.scraper import ScraperService
+
 
 @lru_cache()
 def get_llm_service() -> LLMService:
@@ -14,8 +17,10 @@ def get_llm_service() -> LLMService:
 
 
 @lru_cache()
-def get_scraper_service() -> ScraperService:
+def get_scraper_service() -> "ScraperService":
     """Get cached scraper service instance."""
+    from ..services.scraper import ScraperService
+
     return ScraperService()
 
 
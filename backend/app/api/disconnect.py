@@ -0,0 +1,55 @@
+"""Cancel request handlers whose client has disconnected."""
+
+import asyncio
+from typing import Awaitable, TypeVar
+
+from fastapi import HTTPException, Request
+
+from ..services.cancellation import get_cancellation_counters
+
+T = TypeVar("T")
+
+
+class ClientDisconnected(HTTPException):
+    """The client closed the connection; nobody will read the response."""
+
+    def __init__(self):
+        # 499 is the de facto "client closed request" status
+        super().__init__(
+            status_code=499,
+            detail={"message": "Client closed the request", "code": "CLIENT_DISCONNECTED"},
+        )
+
+
+async def _wait_for_disconnect(request: Request) -> None:
+    # The body has already been read, so the next message is the disconnect
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
+
+
+async def cancel_on_disconnect(request: Request, work: Awaitable[T], route: str) -> T:
+    """
+    Await work, cancelling it if the client disconnects first.
+
+    Cancellation reaches the in-flight LLM request, whose connection is
+    closed so the provider stops generating, and the scraper, whose
+    browser contexts and pages are closed in its finally blocks.
+
+    Raises:
+        ClientDisconnected: If the client went away before work finished
+    """
+    task = asyncio.ensure_future(work)
+    watcher = asyncio.create_task(_wait_for_disconnect(request))
+    try:
+        await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        # Also runs if this handler is itself cancelled
+        watcher.cancel()
+        if not task.done():
+            task.cancel()
+        await asyncio.gather(task, watcher, return_exceptions=True)
+
+    if task.cancelled():
+        get_cancellation_counters().request_cancelled(route)
+        raise ClientDisconnected()
+    return task.result()
@@ -0,0 +1,369 @@
+"""ASGI middleware for the API."""
+
+import asyncio
+import hmac
+import random
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config import get_settings
+from ..services.compression import BodyTooLargeError, decode_body, supported_encodings
+from ..services.profiling import RequestProfiler, profile_id_for
+from ..services.rate_limit import (
+    RateLimitedError,
+    RateLimiter,
+    client_key,
+    get_rate_limiter,
+    trusted_networks,
+)
+from ..services.tracing import current_trace, end_trace, get_trace_exporter, span, start_trace
+
+settings = get_settings()
+
+
+def _error(status_code: int, message: str, code: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code, content={"detail": {"message": message, "code": code}}
+    )
+
+
+class TracingMiddleware:
+    """
+    Trace each HTTP request and report its stages in a Server-Timing header.
+
+    The header is written when the response starts, so for streamed
+    responses it covers the work done before the first byte. The exported
+    trace covers the whole request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.exporter = get_trace_exporter()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        traceparent = headers.get(b"traceparent")
+        trace, token = start_trace(
+            f"{scope['method']} {scope['path']}",
+            traceparent.decode("latin-1") if traceparent else None,
+        )
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"server-timing", trace.server_timing().encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            end_trace(token)
+            trace.finish(
+                **{
+                    "http.method": scope["method"],
+                    "http.target": scope["path"],
+                    "http.status_code": status,
+                }
+            )
+            if self.exporter:
+                self.exporter.submit(trace)
+
+
+class ProfilingMiddleware:
+    """
+    Profile selected requests and write the profiles to disk.
+
+    A request is profiled when it sends the profiling header with the
+    configured token, or at random at the configured sample rate. Only
+    one request is profiled at a time. The profiler sees the whole event
+    loop, including other requests running at the same time.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.header = settings.profiling_header.lower().encode("latin-1")
+        self.token = settings.profiling_token
+        self.sample_rate = settings.profiling_sample_rate
+        self._busy = False
+        self.profiled = 0
+
+    def _selected(self, scope: Scope) -> bool:
+        if self.token:
+            for name, value in scope.get("headers") or []:
+                if name == self.header and hmac.compare_digest(
+                    value.decode("latin-1"), self.token
+                ):
+                    return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._busy or not self._selected(scope):
+            await self.app(scope, receive, send)
+            return
+
+        self._busy = True
+        profile_id = profile_id_for(scope["method"], scope["path"])
+        # Stage timings come from the request's trace; start one if tracing is off
+        trace, token = current_trace(), None
+        if trace is None:
+            trace, token = start_trace(f"{scope['method']} {scope['path']}")
+        status = 500
+
+        async def send_with_id(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-profile-id", profile_id.encode("latin-1")),
+                ]
+            await send(message)
+
+        profiler = RequestProfiler()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            duration_ms = profiler.stop()
+            if token is not None:
+                end_trace(token)
+                trace.finish()
+            self._busy = False
+            self.profiled += 1
+            request = {
+                "id": profile_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status,
+                "duration_ms": round(duration_ms, 1),
+            }
+            try:
+                await asyncio.to_thread(profiler.write, profile_id, request, trace)
+            except OSError as e:
+                print(f"Profile write error: {e}")
+
+
+class RateLimitMiddleware:
+    """
+    Apply per-client rate limits and fair queuing to POST /api/* requests.
+
+    Requests over the limit get a 429 with RATE_LIMITED. Every limited
+    route's response carries RateLimit-Limit, -Remaining and -Reset headers.
+    Clients are told apart by address unless the peer is a trusted proxy
+    (see client_key).
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiter: Optional[RateLimiter] = None,
+        trusted_proxies: Optional[list[str]] = None,
+    ):
+        self.app = app
+        self.limiter = limiter or get_rate_limiter()
+        self.trusted_proxies = trusted_networks(
+            settings.rate_limit_trusted_proxies if trusted_proxies is None else trusted_proxies
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        route = None
+        if scope["type"] == "http" and scope["method"] == "POST":
+            parts = scope["path"].split("/")
+            if len(parts) > 2 and parts[1] == "api":
+                route = parts[2]
+        if route is None or self.limiter.cost(route) is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        client = client_key(headers, (scope.get("client") or (None,))[0], self.trusted_proxies)
+        try:
+            with span("rate_limit.wait", route=route):
+                decision = await self.limiter.acquire(client, route)
+        except RateLimitedError as e:
+            response = _error(429, str(e), "RATE_LIMITED")
+            if e.decision:
+                response.raw_headers.extend(e.decision.headers())
+            await response(scope, receive, send)
+            return
+
+        async def send_with_limits(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), *decision.headers()]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_limits)
+        finally:
+            self.limiter.release(route)
+
+
+class RequestDecompressionMiddleware:
+    """
+    Accept gzip-, deflate- or zstd-encoded request bodies.
+
+    The route sees the decompressed body. Bodies are limited to max_bytes
+    both as sent and after decompression, and decompression stops as soon
+    as the limit is passed, so a small compressed bomb cannot exhaust memory.
+    Uncompressed bodies without a Content-Length (chunked uploads) are
+    counted as they arrive.
+    """
+
+    def __init__(self, app: ASGIApp, max_bytes: Optional[int] = None):
+        self.app = app
+        self.max_bytes = max_bytes or settings.request_max_body_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        encoding = headers.get(b"content-encoding", b"").decode("latin-1").strip().lower()
+        too_large = _error(
+            413, f"Request body exceeds {self.max_bytes} bytes", "PAYLOAD_TOO_LARGE"
+        )
+        length = headers.get(b"content-length", b"")
+        if length.isdigit() and int(length) > self.max_bytes:
+            await too_large(scope, receive, send)
+            return
+        identity = encoding in ("", "identity")
+        if identity and length.isdigit():
+            # The server ends the body at Content-Length
+            await self.app(scope, receive, send)
+            return
+        if not identity and encoding not in supported_encodings():
+            response = _error(
+                415, f"Unsupported Content-Encoding: {encoding}", "UNSUPPORTED_ENCODING"
+            )
+            response.headers["Accept-Encoding"] = ", ".join(supported_encodings())
+            await response(scope, receive, send)
+            return
+
+        chunks, size = [], 0
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            size += len(chunks[-1])
+            if size > self.max_bytes:
+                await too_large(scope, receive, send)
+                return
+            if not message.get("more_body", False):
+                break
+
+        try:
+            body = b"".join(chunks)
+            if not identity:
+                body = decode_body(encoding, body, self.max_bytes)
+        except BodyTooLargeError:
+            await too_large(scope, receive, send)
+            return
+        except ValueError as e:
+            await _error(400, str(e), "INVALID_BODY")(scope, receive, send)
+            return
+
+        scope = dict(scope)
+        scope["headers"] = [
+            (name, value)
+            for name, value in scope.get("headers") or []
+            if name not in (b"content-encoding", b"content-length", b"transfer-encoding")
+        ] + [(b"content-length", str(len(body)).encode("latin-1"))]
+        replayed = False
+
+        async def receive_body() -> Message:
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # Later reads wait for the disconnect, as with the original body
+            return await receive()
+
+        await self.app(scope, receive_body, send)
+
+
+class ResponseCompressionMiddleware:
+    """
+    Gzip responses of at least min_bytes for clients that accept it.
+
+    Event streams are never compressed: gzip holds output back until it has
+    a full block, which would delay SSE events. Starlette's GZipMiddleware
+    only skips them in recent versions, so this does not rely on it.
+    """
+
+    def __init__(self, app: ASGIApp, min_bytes: Optional[int] = None, level: int = 6):
+        self.app = app
+        self.min_bytes = settings.response_compression_min_bytes if min_bytes is None else min_bytes
+        self.level = level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or "gzip" not in Headers(scope=scope).get(
+            "accept-encoding", ""
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        # None until the first body chunk decides; False sends as-is
+        compressor = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, compressor
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if "content-encoding" in headers or headers.get("content-type", "").startswith(
+                    "text/event-stream"
+                ):
+                    compressor = False
+                    await send(message)
+                else:
+                    start = message
+                return
+            if compressor is False:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                if message["type"] != "http.response.body" or (
+                    not more_body and len(body) < self.min_bytes
+                ):
+                    compressor = False
+                    await send(start)
+                    await send(message)
+                    return
+                compressor = zlib.compressobj(self.level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+                headers = MutableHeaders(scope=start)
+                headers["Content-Encoding"] = "gzip"
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    body = compressor.compress(body) + compressor.flush()
+                    headers["Content-Length"] = str(len(body))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send(start)
+
+            body = compressor.compress(body)
+            if not more_body:
+                body += compressor.flush()
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
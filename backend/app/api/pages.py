@@ -0,0 +1,39 @@
+"""Resolve the page a request refers to, inline or by content hash."""
+
+from typing import Optional
+
+from fastapi import HTTPException
+
+from ..models import PageContent
+from ..services.page_store import get_page_store
+
+
+class ContentNotFound(HTTPException):
+    """No page is stored under the content hash; the client has to upload it."""
+
+    def __init__(self, content_hash: str):
+        super().__init__(
+            status_code=404,
+            detail={
+                "message": (
+                    f"No page stored under content_hash {content_hash}; "
+                    "upload it with POST /api/pages and retry"
+                ),
+                "code": "CONTENT_NOT_FOUND",
+            },
+        )
+
+
+def resolve_page(page: Optional[PageContent], content_hash: Optional[str]) -> PageContent:
+    """
+    The request's page: the inline one if given, else the stored one.
+
+    Raises:
+        ContentNotFound: If content_hash is unknown or has expired
+    """
+    if page is not None:
+        return page
+    stored = get_page_store().get(content_hash)
+    if stored is None:
+        raise ContentNotFound(content_hash)
+    return stored
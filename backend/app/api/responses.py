@@ -0,0 +1,27 @@
+"""Fast JSON responses for the hot routes."""
+
+from typing import Any
+
+from pydantic_core import to_json
+from starlette.responses import JSONResponse
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode content as JSON with pydantic-core's serializer.
+
+    Pydantic models are serialized directly, without a model_dump() copy.
+    """
+    return to_json(content)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse encoded by pydantic-core.
+
+    Returned directly from a route, it also skips FastAPI's
+    jsonable_encoder pass over the whole response.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
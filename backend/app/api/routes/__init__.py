@@ -1,4 +1,13 @@
 # API routes
-from . import analyze, compare, summarize, chat
+#
+# Route modules are imported on first access so a process serving only some
+# routers (see Settings.api_routes) never imports the others' dependencies.
+from importlib import import_module
 
-__all__ = ["analyze", "compare", "summarize", "chat"]
+__all__ = ["analyze", "compare", "summarize", "chat", "pages", "stats"]
+
+
+def __getattr__(name: str):
+    if name in __all__:
+        return import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
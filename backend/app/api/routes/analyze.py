@@ -1,25 +1,30 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from ...models import AnalyzeRequest, AnalyzeResponse
 from ...services.summarizer import SummarizerService
+from ..disconnect import cancel_on_disconnect
+from ..pages import resolve_page
+from ..responses import FastJSONResponse
 
 router = APIRouter()
 
 
 @router.post("/analyze", response_model=dict)
-async def analyze_page(request: AnalyzeRequest):
+async def analyze_page(request: AnalyzeRequest, http_request: Request):
     """
     Perform deep analysis of a web page's content.
 
     Returns detailed analysis including entities, questions, and more.
     """
+    content = resolve_page(request.content, request.content_hash)
     try:
         summarizer = SummarizerService()
-        result = await summarizer.analyze(request.content)
+        result = await cancel_on_disconnect(
+            http_request, summarizer.analyze(content), "analyze"
+        )
 
-        return {
-            "success": True,
-            "data": result.model_dump(),
-        }
+        return FastJSONResponse({"success": True, "data": result})
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
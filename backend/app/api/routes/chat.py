@@ -1,24 +1,32 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from uuid import uuid4
 from datetime import datetime
 from ...models import ChatRequest, ChatMessage
 from ...services.llm_service import LLMService
+from ..disconnect import cancel_on_disconnect
+from ..pages import resolve_page
+from ..responses import FastJSONResponse
 
 router = APIRouter()
 
 
 @router.post("/chat", response_model=dict)
-async def chat_with_context(request: ChatRequest):
+async def chat_with_context(request: ChatRequest, http_request: Request):
     """
     Chat with AI using page content as context.
 
     Maintains conversation history and uses page content to answer questions.
     """
+    context = resolve_page(request.context, request.content_hash)
     try:
         llm_service = LLMService()
-        response_content = await llm_service.chat(
-            messages=[msg.model_dump() for msg in request.messages],
-            context=request.context.model_dump(),
+        response_content = await cancel_on_disconnect(
+            http_request,
+            llm_service.chat(
+                messages=[msg.model_dump() for msg in request.messages],
+                context=context.model_dump(),
+            ),
+            "chat",
         )
 
         response_message = ChatMessage(
@@ -28,10 +36,9 @@ async def chat_with_context(request: ChatRequest):
             timestamp=datetime.utcnow().isoformat(),
         )
 
-        return {
-            "success": True,
-            "data": {"message": response_message.model_dump()},
-        }
+        return FastJSONResponse({"success": True, "data": {"message": response_message}})
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
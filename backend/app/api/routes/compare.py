@@ -1,67 +1,80 @@
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from ...config import get_settings
 from ...models import CompareRequest, CompareResponse, ProductInfo
-from ...services.product_extractor import ProductExtractorService
-from ...services.scraper import ScraperService
-from ...services.llm_service import LLMService
+from ...services.comparison import ComparisonService
+from ...services.cancellation import get_cancellation_counters
+from ...services.jobs import JobQueueFullError, get_job_manager
+from ..disconnect import cancel_on_disconnect
+from ..pages import resolve_page
+from ..responses import FastJSONResponse, dumps
 
 router = APIRouter()
+settings = get_settings()
+
+
+def _require_product(request: CompareRequest) -> ProductInfo:
+    """Return the request's product or fail with NO_PRODUCT_INFO."""
+    content = resolve_page(request.content, request.content_hash)
+    if not content.product:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "message": "No product information found on this page",
+                "code": "NO_PRODUCT_INFO",
+            },
+        )
+    return content.product
+
+
+def _deadline(header: Optional[str]) -> Optional[float]:
+    """
+    Seconds from an X-Request-Deadline header, capped by compare_deadline_max.
+
+    None (use the configured deadline) if the header is absent.
+    """
+    if header is None:
+        return None
+    try:
+        seconds = float(header)
+    except ValueError:
+        seconds = 0.0
+    if not 0 < seconds < float("inf"):
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "message": "X-Request-Deadline must be a positive number of seconds",
+                "code": "INVALID_DEADLINE",
+            },
+        )
+    return min(seconds, settings.compare_deadline_max)
 
 
 @router.post("/compare", response_model=dict)
-async def compare_product(request: CompareRequest):
+async def compare_product(
+    request: CompareRequest,
+    http_request: Request,
+    x_request_deadline: Optional[str] = Header(None),
+):
     """
     Compare a product with alternatives from across the web.
 
     Scrapes alternative products and provides AI-powered comparison.
     """
     try:
-        content = request.content
-
         # Ensure we have product info
-        if not content.product:
-            raise HTTPException(
-                status_code=400,
-                detail={
-                    "message": "No product information found on this page",
-                    "code": "NO_PRODUCT_INFO",
-                },
-            )
-
-        product = content.product
-
-        # Build search query
-        search_query = f"{product.name} alternatives"
-        if product.brand:
-            search_query = f"{product.name} vs {product.brand} alternatives"
-
-        # Scrape for alternatives
-        scraper = ScraperService()
-        alternatives = await scraper.search_product_alternatives(
-            query=search_query,
-            current_product_name=product.name,
-            max_results=5,
-        )
+        product = _require_product(request)
+        timeout = _deadline(x_request_deadline)
 
-        # Get LLM comparison analysis
-        llm_service = LLMService()
-        analysis = await llm_service.compare_products(
-            current_product=product.model_dump(),
-            alternatives=[alt.model_dump() for alt in alternatives],
+        comparison = ComparisonService()
+        data = await cancel_on_disconnect(
+            http_request,
+            comparison.compare(product, max_results=5, timeout=timeout),
+            "compare",
         )
 
-        return {
-            "success": True,
-            "data": {
-                "current_product": product.model_dump(),
-                "alternatives": [alt.model_dump() for alt in alternatives],
-                "verdict": analysis.get("verdict", "Unable to generate verdict"),
-                "pros_cons_analysis": {
-                    "current": analysis.get("current_analysis", {"pros": [], "cons": []}),
-                    "alternatives": analysis.get("alternatives_analysis", []),
-                },
-                "recommendation": analysis.get("recommendation"),
-            },
-        }
+        return FastJSONResponse({"success": True, "data": data})
     except HTTPException:
         raise
     except Exception as e:
@@ -69,3 +82,115 @@ async def compare_product(request: CompareRequest):
             status_code=500,
             detail={"message": str(e), "code": "COMPARISON_ERROR"},
         )
+
+
+@router.post("/compare/stream")
+async def stream_compare_product(
+    request: CompareRequest,
+    x_request_deadline: Optional[str] = Header(None),
+):
+    """
+    Compare a product with alternatives, streaming results as Server-Sent Events.
+
+    Alternatives are sent per source as soon as they are scraped, and the
+    LLM comparison starts before the slowest source has finished.
+    """
+    product = _require_product(request)
+    timeout = _deadline(x_request_deadline)
+    comparison = ComparisonService()
+
+    async def event_stream():
+        finished = False
+        try:
+            async for event, data in comparison.stream(product, max_results=5, timeout=timeout):
+                yield f"event: {event}\ndata: {dumps(data).decode()}\n\n"
+            finished = True
+        except Exception as e:
+            finished = True
+            error = {"message": str(e), "code": "COMPARISON_ERROR"}
+            yield f"event: error\ndata: {dumps(error).decode()}\n\n"
+        finally:
+            # The response stops the stream early when the client disconnects
+            if not finished:
+                get_cancellation_counters().request_cancelled("compare_stream")
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/compare/jobs", response_model=dict, status_code=202)
+async def create_compare_job(request: CompareRequest):
+    """
+    Start a product comparison in the background.
+
+    Returns a job id immediately. Requests for a product that already has a
+    live job attach to that job instead of starting a new one.
+    """
+    product = _require_product(request)
+
+    try:
+        job, deduplicated = get_job_manager().submit(request.url, product, max_results=5)
+    except JobQueueFullError as e:
+        raise HTTPException(
+            status_code=503,
+            detail={"message": str(e), "code": "JOB_QUEUE_FULL"},
+        ) from e
+
+    return {
+        "success": True,
+        "data": {
+            "job_id": job.id,
+            "status": job.status,
+            "deduplicated": deduplicated,
+        },
+    }
+
+
+def _get_job(job_id: str):
+    job = get_job_manager().get(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=404,
+            detail={"message": f"Compare job {job_id} not found", "code": "JOB_NOT_FOUND"},
+        )
+    return job
+
+
+@router.get("/compare/jobs/{job_id}", response_model=dict)
+async def get_compare_job(job_id: str):
+    """
+    Poll a comparison job.
+
+    Includes progress events so far and, once done, the comparison result.
+    """
+    return {
+        "success": True,
+        "data": _get_job(job_id).snapshot(),
+    }
+
+
+@router.get("/compare/jobs/{job_id}/events")
+async def stream_compare_job(job_id: str):
+    """
+    Subscribe to a comparison job's progress as Server-Sent Events.
+
+    Replays events so far, then streams new ones until the job finishes.
+    The final "done" event carries the comparison result.
+    """
+    job = _get_job(job_id)
+
+    async def event_stream():
+        async for event in job.subscribe():
+            data = event["data"]
+            if event["event"] == "done":
+                data = {**data, "result": job.result}
+            yield f"event: {event['event']}\ndata: {dumps(data).decode()}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
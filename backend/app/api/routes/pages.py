@@ -0,0 +1,35 @@
+from fastapi import APIRouter, HTTPException
+from ...models import StorePageRequest
+from ...services.page_store import PageTooLargeError, get_page_store
+from ..pages import resolve_page
+from ..responses import FastJSONResponse
+
+router = APIRouter()
+
+
+@router.post("/pages", response_model=dict)
+async def store_page(request: StorePageRequest):
+    """
+    Store a page under its content hash.
+
+    Other endpoints then accept the hash as content_hash instead of the
+    page itself. Storing the same page again refreshes its TTL.
+    """
+    store = get_page_store()
+    try:
+        key = store.put(request.content)
+    except PageTooLargeError as e:
+        raise HTTPException(
+            status_code=413,
+            detail={"message": str(e), "code": "PAYLOAD_TOO_LARGE"},
+        ) from e
+
+    return FastJSONResponse(
+        {"success": True, "data": {"content_hash": key, "expires_in": store.ttl}}
+    )
+
+
+@router.get("/pages/{content_hash}", response_model=dict)
+async def get_page(content_hash: str):
+    """Return a stored page, or CONTENT_NOT_FOUND if it has expired."""
+    return FastJSONResponse({"success": True, "data": resolve_page(None, content_hash)})
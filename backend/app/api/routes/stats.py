@@ -0,0 +1,46 @@
+from fastapi import APIRouter
+from ...config import get_settings
+from ...services.cache import get_llm_cache, get_product_cache
+from ...services.cancellation import get_cancellation_counters
+from ...services.page_store import get_page_store
+from ...services.summary_cache import get_summary_cache
+
+router = APIRouter()
+settings = get_settings()
+
+
+@router.get("/stats", response_model=dict)
+async def get_stats():
+    """
+    Report runtime counters for parsers and caches.
+
+    Useful for spotting slow or failing site parsers and cache hit rates.
+    Sections for routers this process does not serve are left out.
+    """
+    data = {}
+    if settings.serves_scraping:
+        from ...services.site_parsers import get_parser_registry
+
+        data["parsers"] = get_parser_registry().stats()
+    data["product_cache"] = get_product_cache().stats()
+    data["llm_cache"] = get_llm_cache().stats()
+    data["summary_cache"] = get_summary_cache().stats()
+    data["page_store"] = get_page_store().stats()
+    if settings.serves("compare"):
+        from ...services.jobs import get_job_manager
+
+        data["compare_jobs"] = get_job_manager().stats()
+    if settings.serves_scraping:
+        from ...services.prefetch import get_prefetcher
+
+        data["prefetch"] = get_prefetcher().stats()
+    if settings.serves("chat"):
+        from ...services.chat_history import get_chat_history
+
+        data["chat_history"] = get_chat_history().stats()
+    data["cancellations"] = get_cancellation_counters().stats()
+    if settings.rate_limit_enabled:
+        from ...services.rate_limit import get_rate_limiter
+
+        data["rate_limit"] = get_rate_limiter().stats()
+    return {"success": True, "data": data}
@@ -1,25 +1,41 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from ...config import get_settings
 from ...models import SummaryRequest, SummaryResponse
 from ...services.summarizer import SummarizerService
+from ..disconnect import cancel_on_disconnect
+from ..pages import resolve_page
+from ..responses import FastJSONResponse
 
 router = APIRouter()
+settings = get_settings()
 
 
 @router.post("/summarize", response_model=dict)
-async def summarize_page(request: SummaryRequest):
+async def summarize_page(request: SummaryRequest, http_request: Request):
     """
     Summarize a web page's content.
 
-    Returns a summary with key points, sentiment, and topics.
+    Returns a summary with key points, sentiment, and topics. On product
+    pages this also starts a speculative alternatives search when
+    prefetching is enabled, so a following compare is fast.
     """
+    content = resolve_page(request.content, request.content_hash)
+    if settings.prefetch_enabled and content.page_type == "product" and content.product:
+        # Imported on first use: the prefetcher pulls in the scraping stack
+        from ...services.comparison import build_search_query
+        from ...services.prefetch import get_prefetcher
+
+        get_prefetcher().submit(content.product, build_search_query(content.product))
+
     try:
         summarizer = SummarizerService()
-        result = await summarizer.summarize(request.content)
+        result = await cancel_on_disconnect(
+            http_request, summarizer.summarize(content), "summarize"
+        )
 
-        return {
-            "success": True,
-            "data": result.model_dump(),
-        }
+        return FastJSONResponse({"success": True, "data": result})
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -1,3 +1,4 @@
+from pydantic import Field
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 
@@ -12,6 +13,10 @@ class Settings(BaseSettings):
     # CORS settings
     cors_origins: list[str] = ["*"]
 
+    # Routers this process serves; ["chat"] runs a chat-only worker that
+    # never imports the scraping stack
+    api_routes: list[str] = ["summarize", "analyze", "compare", "chat", "pages", "stats"]
+
     # LLM settings
     llm_provider: str = "ollama"  # Options: ollama, vllm, openai
     llm_model: str = "qwen2.5:7b"
@@ -19,20 +24,145 @@ class Settings(BaseSettings):
     llm_api_key: str = ""  # For OpenAI/Anthropic
     llm_temperature: float = 0.7
     llm_max_tokens: int = 4096
+    llm_keep_alive: str = "30m"  # How long Ollama keeps the model loaded after a request
+    llm_timeout: float = 120.0  # Seconds per LLM call, less if a request deadline is nearer
+
+    # Chat history settings
+    chat_history_turns: int = 6  # Latest user/assistant exchanges sent verbatim
+    chat_history_token_budget: int = 3000  # Approximate tokens for those verbatim messages
+    chat_summary_enabled: bool = True  # Fold older messages into a rolling summary
+    chat_summary_ttl: int = 3600  # Seconds a conversation's summary is kept
+    chat_summary_max_entries: int = 1000  # Conversations with a cached summary
 
     # Scraper settings
     scraper_headless: bool = True
     scraper_timeout: int = 30000
+    scraper_selector_timeout: int = 10000  # Milliseconds to wait for search results to render
     scraper_max_pages: int = 5
+    browser_pool_size: int = 1  # Long-lived Chromium processes shared by requests
+    google_shopping_base_url: str = "https://www.google.com"  # Search origins; point both at
+    amazon_base_url: str = "https://www.amazon.com"  # benchmarks.mock_shop for load tests
+    dedup_similarity_threshold: float = 0.6  # Token-set Jaccard for merging alternatives
+    product_http_fast_path: bool = True  # Try a plain HTTP fetch before launching a browser
+    product_http_timeout: float = 5.0  # Seconds before giving up on the fast path for the browser
+
+    # Content extraction settings
+    content_max_bytes: int = 50000  # Budget for extracted main-content text
+    content_scan_bytes: int = 1000000  # Stop scanning a page after this much text
+
+    # Compare job settings
+    compare_job_workers: int = 4  # Comparisons running at once
+    compare_job_max_pending: int = 100  # Reject new jobs beyond this many unfinished
+    compare_job_ttl: int = 600  # Keep finished jobs (and dedupe onto them) this long
+
+    # Streaming compare settings
+    compare_stream_min_alternatives: int = 3  # Start the LLM once this many are found
+    compare_stream_llm_deadline: float = 8.0  # ...or after this many seconds regardless
+
+    # Compare deadline settings
+    compare_deadline: float = 90.0  # Seconds a comparison may take end to end
+    compare_deadline_max: float = 300.0  # Cap on a client's X-Request-Deadline
+    compare_llm_reserve: float = 20.0  # Seconds of the budget kept for the LLM (at most half)
+
+    # Value scoring settings
+    scoring_prior_reviews: int = Field(50, ge=0)  # Prior weight, in reviews, toward the mean rating
+    scoring_default_reviews: int = 10  # Assumed review count when a listing omits it
+    scoring_rating_weight: float = 0.6  # Share of the value score from rating vs price
+
+    # Relevance ranking settings
+    compare_llm_top_k: int = 3  # Most comparable alternatives sent to the LLM (0 = all)
+    relevance_price_weight: float = 0.4  # Share of relevance from price-band proximity
+    relevance_feature_dims: int = 1024  # Hashed n-gram feature buckets
+
+    # Compare analysis settings
+    compare_mode: str = "single"  # Options: single, fanout, auto
+    compare_fanout_min_alternatives: int = 5  # In auto mode, fan out from this many alternatives
+    compare_fanout_concurrency: int = 4  # Per-product LLM calls in flight at once
+
+    # Alternatives prefetch settings
+    prefetch_enabled: bool = False  # Search alternatives when a product page is summarized
+    prefetch_max_inflight: int = 2  # Prefetches running at once
+    prefetch_budget_per_minute: int = 30  # Prefetches started per minute
+    prefetch_max_foreground: int = 2  # Drop prefetches while this many compares are scraping
+
+    # Startup warmup settings
+    warmup_enabled: bool = False  # Warm up in the background; /ready is 503 until done
+    warmup_llm: bool = True  # Load the model with a one-token generation
+    warmup_browsers: bool = True  # Launch the browser pool
+    warmup_timeout: float = 120.0  # Per warmup step
+    cache_snapshot_path: str = ""  # Load caches from this file at startup, save at shutdown
+
+    # Tracing settings
+    tracing_enabled: bool = False  # Time request stages and send a Server-Timing header
+    tracing_exporter: str = ""  # Also export spans as OTLP/JSON. Options: "", jsonl, otlp
+    tracing_export_path: str = "traces.jsonl"  # For the jsonl exporter
+    tracing_otlp_endpoint: str = "http://localhost:4318/v1/traces"  # For the otlp exporter
+
+    # Profiling settings
+    profiling_enabled: bool = False  # Install the profiling middleware
+    profiling_header: str = "X-Profile"  # Profile requests sending this header...
+    profiling_token: str = ""  # ...with this value (header trigger is off while empty)
+    profiling_sample_rate: float = 0.0  # Also profile this share of all requests
+    profiling_mode: str = "sampling"  # Options: sampling (folded stacks), cprofile (.prof)
+    profiling_interval: float = 0.005  # Seconds between stack samples
+    profiling_dir: str = "profiles"  # Profiles and stage timings are written here
+
+    # Compression settings
+    request_decompression: bool = True  # Accept gzip/deflate/zstd-encoded request bodies
+    request_max_body_bytes: int = 2097152  # Largest request body, sent or decompressed (2 MB)
+    response_compression_min_bytes: int = 1024  # Gzip responses at least this large (0 = off)
+
+    # Rate limiting settings
+    rate_limit_enabled: bool = False  # Per-client token buckets and fair queuing on POST /api/*
+    rate_limit_backend: str = "memory"  # Options: memory, sqlite (shared by workers)
+    rate_limit_sqlite_path: str = "rate_limits.sqlite3"  # Used by the sqlite backend
+    rate_limit_per_minute: float = 60.0  # Tokens a client regains per minute, per route class
+    rate_limit_burst: float = 120.0  # Most tokens a client can hold, per route class
+    rate_limit_costs: dict[str, float] = {"chat": 1, "summarize": 2, "analyze": 2, "compare": 10}
+    rate_limit_llm_slots: int = 8  # Chat/summarize/analyze requests in flight (0 = unlimited)
+    rate_limit_browser_slots: int = 4  # Compare requests in flight (0 = unlimited)
+    rate_limit_max_queued: int = 10  # Requests one client may have waiting for a slot
+    # Peers (IPs or CIDRs) whose X-API-Key, X-Client-Id and X-Forwarded-For
+    # headers identify clients; everyone else is keyed on their address
+    rate_limit_trusted_proxies: list[str] = []
 
     # Cache settings
     cache_enabled: bool = True
+    cache_backend: str = "memory"  # Options: memory, disk (SQLite shared by workers)
+    cache_disk_path: str = "cache.sqlite3"  # Used by the disk backend
+    cache_disk_max_bytes: int = 268435456  # Stored size across all caches (256 MB)
+    cache_disk_compress_min_bytes: int = 1024  # Compress values at least this large
+    cache_disk_sweep_interval: float = 60.0  # Seconds between expiry/eviction sweeps
     cache_ttl: int = 3600  # 1 hour
+    llm_cache_max_entries: int = 2000  # Cached per-product LLM responses
+    alternatives_cache_ttl: int = 900  # Scraped alternatives per search query
+    alternatives_cache_max_entries: int = 1000
+    product_cache_ttl: int = 900  # Freshness of cached product pages
+    product_cache_domain_ttls: dict[str, int] = {}  # e.g. {"amazon.com": 300}
+    product_cache_stale_ttl: int = 86400  # Keep entries with ETag/Last-Modified for revalidation
+    product_cache_max_entries: int = 5000
+    summary_cache_max_entries: int = 2000  # Cached summaries and analyses
+    near_dup_enabled: bool = True  # Reuse summaries of near-identical pages on the same site
+    near_dup_threshold: float = 0.95  # SimHash similarity for a near-duplicate (0.95 = 3 of 64 bits)
+
+    # Page store settings
+    page_store_ttl: int = 1800  # Seconds a page uploaded to /api/pages can be referenced
+    page_store_max_entries: int = 500  # Pages kept, least recently used evicted first
+    page_store_max_page_bytes: int = 262144  # Largest page accepted, as JSON (256 KB)
 
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
 
+    def serves(self, *routes: str) -> bool:
+        """Whether this process serves any of the given routers."""
+        return any(route in self.api_routes for route in routes)
+
+    @property
+    def serves_scraping(self) -> bool:
+        """Whether any served router can reach the scraper and browser pool."""
+        return self.serves("summarize", "compare")
+
 
 @lru_cache()
 def get_settings() -> Settings:
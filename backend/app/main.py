@@ -1,24 +1,73 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+from importlib import import_module
 
 from .config import get_settings
-from .api.routes import analyze, compare, summarize, chat
 from .services.llm_service import LLMService
+from .services.warmup import get_warmup, save_cache_snapshot
 from .models import HealthResponse
 
 
 settings = get_settings()
 
+# Router module -> OpenAPI tag, in the order they are mounted
+ROUTERS = {
+    "summarize": "Summarization",
+    "analyze": "Analysis",
+    "compare": "Comparison",
+    "chat": "Chat",
+    "pages": "Pages",
+    "stats": "Stats",
+}
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifecycle manager for startup/shutdown events."""
     # Startup
     print(f"Starting {settings.app_name}...")
+    warmup = get_warmup()
+    if settings.warmup_enabled:
+        # /ready answers 503 until the model, browsers and caches are warm
+        warmup.start()
+    else:
+        warmup.ready = True
     yield
     # Shutdown
     print("Shutting down...")
+    await warmup.shutdown()
+    # Scraping services are imported here, not at module level, so a
+    # chat-only process never loads them
+    if settings.serves("compare"):
+        from .services.jobs import get_job_manager
+
+        await get_job_manager().shutdown()
+    if settings.serves_scraping:
+        from .services.prefetch import get_prefetcher
+
+        await get_prefetcher().shutdown()
+    if settings.serves("chat"):
+        from .services.chat_history import get_chat_history
+
+        await get_chat_history().shutdown()
+    if settings.tracing_enabled:
+        from .services.tracing import get_trace_exporter
+
+        exporter = get_trace_exporter()
+        if exporter:
+            await exporter.shutdown()
+    if settings.cache_snapshot_path:
+        try:
+            saved = save_cache_snapshot(settings.cache_snapshot_path)
+            print(f"Saved cache snapshot: {saved}")
+        except Exception as e:
+            print(f"Cache snapshot error: {e}")
+    if settings.serves_scraping:
+        from .services.browser_pool import get_browser_pool
+
+        await get_browser_pool().close()
 
 
 app = FastAPI(
@@ -28,6 +77,23 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Middleware added first runs innermost, closest to the routes
+if settings.request_decompression:
+    from .api.middleware import RequestDecompressionMiddleware
+
+    app.add_middleware(RequestDecompressionMiddleware)
+
+if settings.response_compression_min_bytes:
+    from .api.middleware import ResponseCompressionMiddleware
+
+    app.add_middleware(ResponseCompressionMiddleware)
+
+if settings.rate_limit_enabled:
+    # Added before CORS so 429 responses get CORS headers too
+    from .api.middleware import RateLimitMiddleware
+
+    app.add_middleware(RateLimitMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -37,11 +103,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Include routers
-app.include_router(summarize.router, prefix="/api", tags=["Summarization"])
-app.include_router(analyze.router, prefix="/api", tags=["Analysis"])
-app.include_router(compare.router, prefix="/api", tags=["Comparison"])
-app.include_router(chat.router, prefix="/api", tags=["Chat"])
+if settings.profiling_enabled:
+    # Added before tracing so it runs inside it and reuses the request's trace
+    from .api.middleware import ProfilingMiddleware
+
+    app.add_middleware(ProfilingMiddleware)
+
+if settings.tracing_enabled:
+    # Not installed at all when off, so untraced requests pay nothing
+    from .api.middleware import TracingMiddleware
+
+    app.add_middleware(TracingMiddleware)
+
+# Include routers; only the configured ones are imported
+for name, tag in ROUTERS.items():
+    if settings.serves(name):
+        module = import_module(f".api.routes.{name}", __package__)
+        app.include_router(module.router, prefix="/api", tags=[tag])
 
 
 @app.get("/health", response_model=HealthResponse, tags=["Health"])
@@ -57,6 +135,13 @@ async def health_check():
     )
 
 
+@app.get("/ready", tags=["Health"])
+async def readiness_check():
+    """Report whether startup warmup has finished; 503 until it has."""
+    status = get_warmup().status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+
 @app.get("/", tags=["Root"])
 async def root():
     """Root endpoint with API information."""
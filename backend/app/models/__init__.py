@@ -3,6 +3,7 @@ from .schemas import (
     ProductInfo,
     ArticleInfo,
     ChatMessage,
+    StorePageRequest,
     SummaryRequest,
     SummaryResponse,
     CompareRequest,
@@ -12,6 +13,7 @@ from .schemas import (
     AnalyzeRequest,
     AnalyzeResponse,
     ProductAlternative,
+    ValueScore,
     HealthResponse,
 )
 
@@ -20,6 +22,7 @@ __all__ = [
     "ProductInfo",
     "ArticleInfo",
     "ChatMessage",
+    "StorePageRequest",
     "SummaryRequest",
     "SummaryResponse",
     "CompareRequest",
@@ -29,5 +32,6 @@ __all__ = [
     "AnalyzeRequest",
     "AnalyzeResponse",
     "ProductAlternative",
+    "ValueScore",
     "HealthResponse",
 ]
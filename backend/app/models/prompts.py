@@ -39,6 +39,8 @@ Current Product:
 Alternatives:
 {alternatives}
 
+{value_table}
+
 Provide your analysis as JSON with this structure:
 {{
     "verdict": "A brief overall verdict (1-2 sentences)",
@@ -58,6 +60,44 @@ Provide your analysis as JSON with this structure:
 
 Only return valid JSON, no additional text."""
 
+PRODUCT_PROS_CONS_USER = """List the main pros and cons of this product for a shopper.
+
+Product:
+- Name: {name}
+- Price: {currency} {price}
+- Rating: {rating}/5 ({reviews} reviews)
+- Brand: {brand}
+- Source: {source}
+
+Provide your analysis as JSON with this structure:
+{{
+    "pros": ["pro 1", "pro 2"],
+    "cons": ["con 1", "con 2"]
+}}
+
+Only return valid JSON, no additional text."""
+
+COMPARE_VERDICT_USER = """Decide between the following product and its alternatives.
+
+Current Product:
+- Name: {product_name}
+- Price: {product_currency} {product_price}
+- Rating: {product_rating}/5 ({product_reviews} reviews)
+- Brand: {product_brand}
+
+Pros and cons of each option:
+{pros_cons}
+
+{value_table}
+
+Provide your answer as JSON with this structure:
+{{
+    "verdict": "A brief overall verdict (1-2 sentences)",
+    "recommendation": "Your recommendation based on value, quality, and price"
+}}
+
+Only return valid JSON, no additional text."""
+
 CHAT_SYSTEM = """You are a helpful assistant that helps users understand and interact with web pages.
 You have access to the following page content:
 
@@ -74,6 +114,25 @@ Answer questions about this page helpfully and accurately.
 If asked about something not on the page, say so clearly.
 Be concise but thorough in your responses."""
 
+CHAT_HISTORY_SUMMARY = """
+
+Summary of the earlier conversation:
+{summary}"""
+
+CHAT_SUMMARY_SYSTEM = """You condense conversations into short running summaries.
+Keep the user's questions, the facts and answers given, and any preferences or decisions.
+Leave out pleasantries and repetition."""
+
+CHAT_SUMMARY_USER = """Update the summary of a conversation about a web page with the messages below.
+
+Summary so far:
+{summary}
+
+New messages:
+{messages}
+
+Reply with the updated summary only, in at most {max_words} words."""
+
 ANALYZE_SYSTEM = """You are an expert content analyst who provides deep insights into web content.
 You identify key themes, extract entities, and generate thoughtful questions about the content."""
 
@@ -142,3 +201,46 @@ def format_alternatives(alternatives: list[dict]) -> str:
         lines.extend(alt_lines)
 
     return "\n".join(lines)
+
+
+def format_value_table(scores: list[dict]) -> str:
+    """Format precomputed value scores as a compact table for prompts."""
+    if not scores:
+        return ""
+
+    def cell(value, fmt="{}"):
+        return fmt.format(value) if value is not None else "-"
+
+    lines = [
+        "Precomputed value metrics (rank 1 = best value; adj rating accounts for review counts):",
+        "rank | product | price | adj rating | price pct | price/pt | savings",
+    ]
+    for score in scores:
+        name = score["name"][:60] + (" (current)" if score.get("is_current") else "")
+        lines.append(
+            " | ".join(
+                [
+                    str(score["rank"]),
+                    name,
+                    cell(score.get("price")),
+                    cell(score.get("adjusted_rating"), "{:.2f}"),
+                    cell(score.get("price_percentile"), "{:.0%}"),
+                    cell(score.get("price_per_rating_point"), "{:.2f}"),
+                    cell(score.get("relative_savings"), "{:+.0%}"),
+                ]
+            )
+        )
+    lines.append("Use these numbers rather than recomputing them; keep the verdict short.")
+
+    return "\n".join(lines)
+
+
+def format_pros_cons(analyses: list[dict]) -> str:
+    """Format per-product pros and cons for the verdict prompt."""
+    lines = []
+    for analysis in analyses:
+        lines.append(f"\n{analysis.get('name', 'Unknown')}:")
+        lines.append(f"- Pros: {'; '.join(analysis.get('pros', [])) or 'none listed'}")
+        lines.append(f"- Cons: {'; '.join(analysis.get('cons', [])) or 'none listed'}")
+
+    return "\n".join(lines)
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import Optional, Literal
+from pydantic import BaseModel, Field, model_validator
+from typing import ClassVar, Optional, Literal
 from datetime import datetime
 
 
@@ -48,12 +48,32 @@ class ChatMessage(BaseModel):
     timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
 
 
-class SummaryRequest(BaseModel):
-    """Request for page summarization."""
+class PageReference(BaseModel):
+    """Base for requests that carry a page inline or by its content hash."""
+
+    page_field: ClassVar[str] = "content"
+
+    content_hash: Optional[str] = None  # From POST /api/pages, instead of the page itself
+
+    @model_validator(mode="after")
+    def _require_page(self):
+        if getattr(self, self.page_field) is None and not self.content_hash:
+            raise ValueError(f"Either {self.page_field} or content_hash is required")
+        return self
+
+
+class StorePageRequest(BaseModel):
+    """Request to store a page for later reference by content hash."""
 
     content: PageContent
 
 
+class SummaryRequest(PageReference):
+    """Request for page summarization."""
+
+    content: Optional[PageContent] = None
+
+
 class SummaryResponse(BaseModel):
     """Response with page summary."""
 
@@ -72,7 +92,9 @@ class ProductAlternative(BaseModel):
     url: str
     image: Optional[str] = None
     rating: Optional[float] = None
+    review_count: Optional[int] = None
     source: str = ""
+    relevance: Optional[float] = None  # Similarity to the compared product, 0-1
 
 
 class ProsConsAnalysis(BaseModel):
@@ -97,11 +119,27 @@ class ProsConsResult(BaseModel):
     alternatives: list[AlternativeAnalysis] = Field(default_factory=list)
 
 
-class CompareRequest(BaseModel):
+class ValueScore(BaseModel):
+    """Locally computed value metrics for one product in a comparison."""
+
+    name: str
+    is_current: bool = False
+    price: Optional[float] = None
+    rating: Optional[float] = None
+    review_count: Optional[int] = None
+    adjusted_rating: Optional[float] = None
+    price_percentile: Optional[float] = None
+    price_per_rating_point: Optional[float] = None
+    relative_savings: Optional[float] = None
+    value_score: float = 0.0
+    rank: int = 0
+
+
+class CompareRequest(PageReference):
     """Request for product comparison."""
 
     url: str
-    content: PageContent
+    content: Optional[PageContent] = None
 
 
 class CompareResponse(BaseModel):
@@ -112,13 +150,18 @@ class CompareResponse(BaseModel):
     verdict: str
     pros_cons_analysis: ProsConsResult
     recommendation: Optional[str] = None
+    value_scores: list[ValueScore] = Field(default_factory=list)
+    compared: list[str] = Field(default_factory=list)  # Alternatives sent to the LLM
+    partial: bool = False  # Some sources were cut off by the deadline
 
 
-class ChatRequest(BaseModel):
+class ChatRequest(PageReference):
     """Request for chat completion."""
 
+    page_field: ClassVar[str] = "context"
+
     messages: list[ChatMessage]
-    context: PageContent
+    context: Optional[PageContent] = None
 
 
 class ChatResponse(BaseModel):
@@ -127,10 +170,10 @@ class ChatResponse(BaseModel):
     message: ChatMessage
 
 
-class AnalyzeRequest(BaseModel):
+class AnalyzeRequest(PageReference):
     """Request for deep page analysis."""
 
-    content: PageContent
+    content: Optional[PageContent] = None
 
 
 class AnalyzeResponse(BaseModel):
@@ -1,8 +1,23 @@
 # Services package
-from .llm_service import LLMService
-from .scraper import ScraperService
-from .summarizer import SummarizerService
-from .product_extractor import ProductExtractorService
+#
+# Services are imported on first attribute access, so importing one service
+# module (e.g. the LLM client for chat) does not pull in Playwright and the
+# scraping stack.
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .llm_service import LLMService
+    from .product_extractor import ProductExtractorService
+    from .scraper import ScraperService
+    from .summarizer import SummarizerService
+
+_LAZY = {
+    "LLMService": ".llm_service",
+    "ScraperService": ".scraper",
+    "SummarizerService": ".summarizer",
+    "ProductExtractorService": ".product_extractor",
+}
 
 __all__ = [
     "LLMService",
@@ -10,3 +25,9 @@ __all__ = [
     "SummarizerService",
     "ProductExtractorService",
 ]
+
+
+def __getattr__(name: str):
+    if name in _LAZY:
+        return getattr(import_module(_LAZY[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,105 @@
+import asyncio
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
+
+from ..config import get_settings
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext, Playwright
+
+settings = get_settings()
+
+
+class BrowserPool:
+    """
+    Long-lived Chromium processes that hand out isolated browser contexts.
+
+    Launching Chromium takes around a second; a new context on a running
+    browser takes milliseconds. Closing a context closes its pages and
+    leaves the browser up for the next request.
+    """
+
+    def __init__(self, size: Optional[int] = None, headless: Optional[bool] = None):
+        self.size = max(1, size if size is not None else settings.browser_pool_size)
+        self.headless = headless if headless is not None else settings.scraper_headless
+        self._playwright: Optional["Playwright"] = None
+        self._browsers: list["Browser"] = []
+        self._next = 0
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.launches = 0
+        self.contexts = 0
+
+    def _reset_for_loop(self) -> None:
+        # Playwright objects belong to the loop that created them
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._playwright = None
+            self._browsers = []
+
+    async def _launch(self) -> "Browser":
+        if self._playwright is None:
+            # Imported on first launch; Playwright is the heaviest dependency
+            from playwright.async_api import async_playwright
+
+            self._playwright = await async_playwright().start()
+        browser = await self._playwright.chromium.launch(
+            headless=self.headless,
+            args=["--no-sandbox", "--disable-setuid-sandbox"],
+        )
+        self.launches += 1
+        return browser
+
+    async def start(self) -> None:
+        """Launch every browser in the pool."""
+        self._reset_for_loop()
+        async with self._lock:
+            self._browsers = [b for b in self._browsers if b.is_connected()]
+            while len(self._browsers) < self.size:
+                self._browsers.append(await self._launch())
+
+    async def new_context(self) -> "BrowserContext":
+        """Open a fresh context on the next pooled browser, launching it if needed."""
+        self._reset_for_loop()
+        async with self._lock:
+            self._next = (self._next + 1) % self.size
+            if self._next >= len(self._browsers):
+                self._browsers.append(await self._launch())
+                self._next = len(self._browsers) - 1
+            elif not self._browsers[self._next].is_connected():
+                self._browsers[self._next] = await self._launch()
+            browser = self._browsers[self._next]
+
+        self.contexts += 1
+        return await browser.new_context()
+
+    async def close(self) -> None:
+        """Close every browser and stop Playwright."""
+        if self._loop is not asyncio.get_running_loop():
+            self._browsers, self._playwright = [], None
+            return
+        browsers, self._browsers = self._browsers, []
+        for browser in browsers:
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "running": sum(1 for b in self._browsers if b.is_connected()),
+            "launches": self.launches,
+            "contexts": self.contexts,
+        }
+
+
+@lru_cache()
+def get_browser_pool() -> BrowserPool:
+    """Get the shared browser pool."""
+    return BrowserPool()
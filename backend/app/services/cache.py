@@ -0,0 +1,263 @@
+import re
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from ..config import get_settings
+from ..models import ProductInfo
+
+if TYPE_CHECKING:
+    from .disk_cache import DiskCache
+
+settings = get_settings()
+
+# Query parameters that only track the visit and never change the page, on any site.
+TRACKING_PARAMS = frozenset(
+    {
+        "gclid", "gclsrc", "dclid", "fbclid", "msclkid", "yclid", "igshid",
+        "mc_cid", "mc_eid", "srsltid",
+    }
+)
+TRACKING_PREFIXES = ("utm_", "_hs", "ga_")
+
+# Retailer-specific tracking parameters, keyed by a host marker. Elsewhere
+# names like "tag", "ref" or "th" can select a real product or variant.
+RETAILER_TRACKING_PARAMS = {
+    "amazon.": (
+        frozenset(
+            {
+                "ref", "ref_", "referrer", "tag", "linkcode", "linkid", "camp",
+                "creative", "creativeasin", "psc", "th", "smid", "_encoding",
+                "qid", "sr", "crid", "sprefix", "keywords",
+            }
+        ),
+        ("pd_rd_", "pf_rd_"),
+    ),
+    "ebay.": (
+        frozenset(
+            {
+                "_trkparms", "_trksid", "mkcid", "mkevt", "mkrid", "campid",
+                "toolid", "customid", "hash", "amdata",
+            }
+        ),
+        (),
+    ),
+    "aliexpress.": (frozenset({"spm", "scm", "pvid", "algo_pvid", "algo_exp_id"}), ()),
+    "alibaba.": (frozenset({"spm", "scm"}), ()),
+}
+
+
+def _tracking_rules(host: str) -> tuple[frozenset[str], tuple[str, ...]]:
+    """Tracking parameter names and prefixes to strip for a host."""
+    names, prefixes = TRACKING_PARAMS, TRACKING_PREFIXES
+    for marker, (extra_names, extra_prefixes) in RETAILER_TRACKING_PARAMS.items():
+        if marker in host:
+            names, prefixes = names | extra_names, prefixes + extra_prefixes
+    return names, prefixes
+
+
+_AMAZON_ASIN_RE = re.compile(r"/(?:dp|gp/product|gp/aw/d)/([A-Z0-9]{10})", re.I)
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize a product URL so that equivalent links share one cache key.
+
+    Lowercases the scheme and host, drops the fragment, default ports and
+    tracking parameters (global ones plus the retailer's own), sorts the remaining query, and collapses Amazon
+    product links to /dp/<ASIN>.
+    """
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or "https").lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path or "/"
+    if "amazon." in host:
+        match = _AMAZON_ASIN_RE.search(path)
+        if match:
+            path = f"/dp/{match.group(1).upper()}"
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    tracking, tracking_prefixes = _tracking_rules(host)
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in tracking
+        and not key.lower().startswith(tracking_prefixes)
+    )
+
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+class MemoryCache:
+    """In-process LRU cache with a TTL per entry."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the value for key, or default if missing or expired."""
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return default
+        expires_at, value = item
+        if expires_at <= time.time():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store value under key for ttl seconds."""
+        self._data[key] = (time.time() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def dump(self) -> list[list]:
+        """Unexpired entries as [key, expires_at, value], oldest first."""
+        now = time.time()
+        return [
+            [key, expires_at, value]
+            for key, (expires_at, value) in self._data.items()
+            if expires_at > now
+        ]
+
+    def load(self, entries: list[list]) -> int:
+        """Restore entries from dump(), skipping expired ones. Returns the count loaded."""
+        now = time.time()
+        loaded = 0
+        for key, expires_at, value in entries:
+            if expires_at > now:
+                self.set(key, value, expires_at - now)
+                loaded += 1
+        return loaded
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+def make_cache(namespace: str, max_entries: int) -> "MemoryCache | DiskCache":
+    """
+    Build a cache on the configured backend.
+
+    "memory" keeps entries in this process. "disk" stores them in the SQLite
+    file at cache_disk_path, shared by every worker on the host and kept
+    across restarts; namespace separates the caches within that file.
+    """
+    if settings.cache_backend == "disk":
+        from .disk_cache import DiskCache
+
+        return DiskCache(
+            settings.cache_disk_path,
+            namespace,
+            max_entries=max_entries,
+            max_bytes=settings.cache_disk_max_bytes,
+            compress_min_bytes=settings.cache_disk_compress_min_bytes,
+            sweep_interval=settings.cache_disk_sweep_interval,
+        )
+    return MemoryCache(max_entries)
+
+
+class ProductCache:
+    """ProductInfo cache keyed by canonical URL, with HTTP validators."""
+
+    def __init__(self, backend: Optional[MemoryCache] = None):
+        self.backend = backend or make_cache("product", settings.product_cache_max_entries)
+        self.default_ttl = settings.product_cache_ttl
+        self.domain_ttls = settings.product_cache_domain_ttls
+        self.stale_ttl = settings.product_cache_stale_ttl
+        self.revalidated = 0
+
+    def ttl_for(self, url: str) -> int:
+        """Freshness lifetime for a URL, matching the most specific domain."""
+        host = (urlsplit(url).hostname or "").lower()
+        while host:
+            if host in self.domain_ttls:
+                return self.domain_ttls[host]
+            _, _, host = host.partition(".")
+        return self.default_ttl
+
+    def get(self, url: str) -> Optional[dict]:
+        """
+        Look up a cached product entry.
+
+        Returns:
+            Entry dict with "product", "etag", "last_modified" and "fresh"
+            keys, or None. Stale entries are returned so callers can
+            revalidate them.
+        """
+        entry = self.backend.get(canonicalize_url(url))
+        if entry is None:
+            return None
+        return {
+            **entry,
+            "product": ProductInfo(**entry["product"]),
+            "fresh": entry["fresh_until"] > time.time(),
+        }
+
+    def store(
+        self,
+        url: str,
+        product: ProductInfo,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Cache a freshly extracted product and its validators."""
+        ttl = self.ttl_for(url)
+        entry = {
+            "product": product.model_dump(),
+            "etag": etag,
+            "last_modified": last_modified,
+            "fresh_until": time.time() + ttl,
+        }
+        # Entries with validators outlive their freshness so they can be
+        # revalidated with a conditional request instead of re-extracted.
+        keep = ttl + self.stale_ttl if (etag or last_modified) else ttl
+        self.backend.set(canonicalize_url(url), entry, keep)
+
+    def refresh(self, url: str, entry: dict) -> None:
+        """Extend a stale entry after the origin answered 304 Not Modified."""
+        self.revalidated += 1
+        self.store(url, entry["product"], entry.get("etag"), entry.get("last_modified"))
+
+    def stats(self) -> dict:
+        return {**self.backend.stats(), "revalidated": self.revalidated}
+
+
+@lru_cache()
+def get_product_cache() -> ProductCache:
+    """Get the shared product cache instance."""
+    return ProductCache()
+
+
+@lru_cache()
+def get_llm_cache() -> MemoryCache:
+    """Get the shared LLM response cache instance."""
+    return make_cache("llm", settings.llm_cache_max_entries)
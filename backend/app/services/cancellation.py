@@ -0,0 +1,26 @@
+from functools import lru_cache
+
+
+class CancellationCounters:
+    """Work abandoned because the client went away before the response."""
+
+    def __init__(self):
+        self.requests: dict[str, int] = {}
+        self.llm_calls = 0
+        self.scrapes = 0
+
+    def request_cancelled(self, route: str) -> None:
+        self.requests[route] = self.requests.get(route, 0) + 1
+
+    def stats(self) -> dict:
+        return {
+            "requests": dict(self.requests),
+            "llm_calls": self.llm_calls,
+            "scrapes": self.scrapes,
+        }
+
+
+@lru_cache()
+def get_cancellation_counters() -> CancellationCounters:
+    """Get the process-wide cancellation counters."""
+    return CancellationCounters()
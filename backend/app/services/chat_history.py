@@ -0,0 +1,176 @@
+import asyncio
+import hashlib
+from collections import Counter
+from functools import lru_cache
+from typing import Awaitable, Callable, Optional
+
+from ..config import get_settings
+from .cache import MemoryCache, make_cache
+from .tracing import span
+
+settings = get_settings()
+
+# Generates an updated summary from the previous one and newer messages
+Summarize = Callable[[str, list[dict]], Awaitable[str]]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a message: about four characters a token, plus role overhead."""
+    return len(text) // 4 + 4
+
+
+def _message_ref(message: dict) -> str:
+    """A message's id, or a digest of it for clients that send none."""
+    if message.get("id"):
+        return message["id"]
+    data = f"{message['role']}\x00{message['content']}".encode("utf-8")
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def conversation_key(messages: list[dict], page_url: str) -> str:
+    """Summary cache key: the page and the conversation's first message."""
+    data = f"{page_url}\x00{_message_ref(messages[0])}".encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+class ChatHistory:
+    """
+    Bounded chat history: recent messages verbatim, older ones summarized.
+
+    The last chat_history_turns exchanges are sent as they are, newest
+    first until chat_history_token_budget is spent. Older messages are
+    folded into a rolling summary cached per conversation. Folding runs in
+    the background, so a turn never waits for it: the prompt gets the
+    latest summary available, and older messages it does not cover yet are
+    left out until the refresh lands, usually before the next turn.
+    """
+
+    def __init__(self, backend: Optional[MemoryCache] = None):
+        self.backend = backend or make_cache("chat_summaries", settings.chat_summary_max_entries)
+        self.ttl = settings.chat_summary_ttl
+        self.max_turns = settings.chat_history_turns
+        self.token_budget = settings.chat_history_token_budget
+        self.summary_enabled = settings.chat_summary_enabled
+        self.counters: Counter[str] = Counter()
+        self._refreshing: dict[str, asyncio.Task] = {}
+
+    def split(self, messages: list[dict]) -> tuple[list[dict], list[dict]]:
+        """
+        Split messages into older ones and the recent window.
+
+        The window always holds the latest message, even if it is over the
+        token budget on its own.
+        """
+        start = len(messages)
+        tokens = 0
+        turns = 0
+        while start > 0:
+            message = messages[start - 1]
+            if turns == self.max_turns:
+                break
+            cost = estimate_tokens(message["content"])
+            if start < len(messages) and tokens + cost > self.token_budget:
+                break
+            tokens += cost
+            turns += message["role"] == "user"
+            start -= 1
+        return messages[:start], messages[start:]
+
+    def window(
+        self, messages: list[dict], page_url: str, summarize: Summarize
+    ) -> tuple[Optional[str], list[dict]]:
+        """
+        The messages to send for a turn.
+
+        Starts a background refresh when the cached summary does not cover
+        every older message yet.
+
+        Args:
+            messages: The conversation's user and assistant messages, oldest first
+            page_url: URL of the page the conversation is about
+            summarize: Generates an updated summary
+
+        Returns:
+            (summary of the older messages or None, recent messages)
+        """
+        older, recent = self.split(messages)
+        if not older:
+            return None, recent
+        self.counters["windowed"] += 1
+        if not self.summary_enabled:
+            self.counters["unsummarized"] += len(older)
+            return None, recent
+
+        key = conversation_key(messages, page_url)
+        entry = self.backend.get(key)
+        # Only usable if it summarizes a prefix of this conversation; an
+        # edited or truncated history starts over
+        covered = entry["covered"] if entry else 0
+        if covered > len(messages) or (
+            covered and _message_ref(messages[covered - 1]) != entry["last_ref"]
+        ):
+            entry, covered = None, 0
+
+        if covered < len(older):
+            self.counters["unsummarized"] += len(older) - covered
+            self._schedule(key, entry["summary"] if entry else "", older, covered, summarize)
+        if entry is None:
+            return None, recent
+        self.counters["summarized"] += 1
+        return entry["summary"], recent
+
+    def _schedule(
+        self, key: str, summary: str, older: list[dict], covered: int, summarize: Summarize
+    ) -> None:
+        if key in self._refreshing:
+            return
+        task = asyncio.create_task(self._refresh(key, summary, older, covered, summarize))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def _refresh(
+        self, key: str, summary: str, older: list[dict], covered: int, summarize: Summarize
+    ) -> None:
+        # Fold in a token budget's worth of messages per call, so a long
+        # history arriving at once does not become one huge prompt
+        while covered < len(older):
+            end = covered + 1
+            tokens = estimate_tokens(older[covered]["content"])
+            while end < len(older):
+                tokens += estimate_tokens(older[end]["content"])
+                if tokens > self.token_budget:
+                    break
+                end += 1
+            try:
+                with span("chat.summarize_history", messages=end - covered):
+                    summary = (await summarize(summary, older[covered:end])).strip()
+            except Exception:
+                self.counters["refresh_failures"] += 1
+                return
+            covered = end
+            last_ref = _message_ref(older[end - 1])
+            self.backend.set(
+                key, {"summary": summary, "covered": covered, "last_ref": last_ref}, self.ttl
+            )
+            self.counters["refreshes"] += 1
+
+    async def shutdown(self) -> None:
+        """Cancel summary refreshes still running."""
+        tasks = list(self._refreshing.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "summary_enabled": self.summary_enabled,
+            "refreshing": len(self._refreshing),
+            "entries": self.backend.stats()["entries"],
+            **self.counters,
+        }
+
+
+@lru_cache()
+def get_chat_history() -> ChatHistory:
+    """Get the shared chat history manager."""
+    return ChatHistory()
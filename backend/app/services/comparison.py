@@ -0,0 +1,320 @@
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+from ..config import get_settings
+from ..models import ProductAlternative, ProductInfo
+from . import deadline
+from .llm_service import LLMService
+from .prefetch import AlternativesPrefetcher, get_prefetcher
+from .relevance import RelevanceRanker
+from .scoring import ValueScorer
+from .scraper import ScraperService
+from .tracing import span
+
+settings = get_settings()
+
+ProgressCallback = Callable[[str, dict], Awaitable[None]]
+
+
+def build_search_query(product: ProductInfo) -> str:
+    """Build the alternatives search query for a product."""
+    search_query = f"{product.name} alternatives"
+    if product.brand:
+        search_query = f"{product.name} vs {product.brand} alternatives"
+    return search_query
+
+
+async def _cached_source(
+    alternatives: list[ProductAlternative],
+) -> AsyncIterator[tuple[str, list[ProductAlternative]]]:
+    """Stand-in for the scraper stream when alternatives are already cached."""
+    yield "cache", alternatives
+
+
+async def _next(
+    sources: AsyncIterator[tuple[str, list[ProductAlternative]]],
+) -> tuple[str, list[ProductAlternative]]:
+    """Coroutine for the next item of a source stream, so it can run as a task."""
+    return await anext(sources)
+
+
+async def _foreground_source(
+    prefetcher: AlternativesPrefetcher,
+    sources: AsyncIterator[tuple[str, list[ProductAlternative]]],
+) -> AsyncIterator[tuple[str, list[ProductAlternative]]]:
+    """Count a scraper stream as foreground load while it runs."""
+    async with prefetcher.foreground():
+        try:
+            async for item in sources:
+                yield item
+        finally:
+            await sources.aclose()
+
+
+class ComparisonService:
+    """Service running the scrape-then-compare pipeline for a product."""
+
+    def __init__(self):
+        self.scraper = ScraperService()
+        self.llm = LLMService()
+        self.scorer = ValueScorer()
+        self.ranker = RelevanceRanker()
+        self.prefetcher = get_prefetcher()
+        self.stream_min_alternatives = settings.compare_stream_min_alternatives
+        self.stream_llm_deadline = settings.compare_stream_llm_deadline
+        self.deadline = settings.compare_deadline
+        self.llm_reserve = settings.compare_llm_reserve
+
+    def _scrape_budget(self) -> float:
+        """Seconds left for finding alternatives, keeping a share for the LLM."""
+        left = deadline.remaining()
+        return max(0.0, left - min(self.llm_reserve, left / 2))
+
+    async def compare(
+        self,
+        product: ProductInfo,
+        max_results: int = 5,
+        progress: Optional[ProgressCallback] = None,
+        timeout: Optional[float] = None,
+    ) -> dict:
+        """
+        Find alternatives for a product and compare them with the LLM.
+
+        Every stage gets what is left of the deadline. If scraping runs
+        into the time kept for the LLM, the alternatives found so far are
+        compared and the result is marked partial.
+
+        Args:
+            product: The product being viewed
+            max_results: Maximum number of alternatives to compare
+            progress: Optional callback awaited with (event, data) at each stage
+            timeout: Seconds the comparison may take (default: compare_deadline)
+
+        Returns:
+            Comparison data as returned by the compare endpoints
+        """
+        found: list[ProductAlternative] = []
+
+        async def emit(event: str, data: dict) -> None:
+            if progress:
+                await progress(event, data)
+
+        async def on_results(source: str, results: list[ProductAlternative]) -> None:
+            found.extend(results)
+            await emit("alternatives_found", {"source": source, "count": len(results)})
+
+        async def find_alternatives() -> list[ProductAlternative]:
+            # Use prefetched alternatives, or scrape for them
+            with span("alternatives.lookup"):
+                alternatives = await self.prefetcher.lookup(query, max_results)
+            if alternatives is not None:
+                await on_results("cache", alternatives)
+                return alternatives
+            await emit("scraping_started", {"query": query})
+            with span("scrape"):
+                async with self.prefetcher.foreground():
+                    alternatives = await self.scraper.search_product_alternatives(
+                        query=query,
+                        current_product_name=product.name,
+                        max_results=max_results,
+                        on_results=on_results,
+                    )
+            self.prefetcher.store(query, alternatives)
+            return alternatives
+
+        query = build_search_query(product)
+        with deadline.scope(timeout or self.deadline):
+            partial = False
+            try:
+                alternatives = await asyncio.wait_for(find_alternatives(), self._scrape_budget())
+            except asyncio.TimeoutError:
+                # Compare what the finished sources found instead of running late
+                partial = True
+                unique = self.scraper.deduplicator.deduplicate(found, product.name)
+                alternatives = unique[:max_results]
+
+            # Get LLM comparison analysis
+            await emit("llm_started", {"alternatives": len(alternatives)})
+            analysis = await self._analyze(product, alternatives)
+
+        # Analysis carries every alternative, annotated with its relevance
+        return {
+            "current_product": product.model_dump(),
+            **analysis,
+            "partial": partial,
+        }
+
+    async def stream(
+        self,
+        product: ProductInfo,
+        max_results: int = 5,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[tuple[str, dict]]:
+        """
+        Run the comparison as a pipeline, yielding events as results arrive.
+
+        Alternatives are yielded per source as soon as they are parsed. The
+        LLM stage starts once enough alternatives exist or the LLM deadline
+        passes, and overlaps with the remaining scraping. Sources still
+        running when the scrape budget is spent are dropped and the result
+        is marked partial.
+
+        Yields:
+            (event, data) tuples: "alternatives", "llm_started", "comparison", "done"
+        """
+        loop = asyncio.get_running_loop()
+        llm_deadline = loop.time() + self.stream_llm_deadline
+        collected: list[ProductAlternative] = []
+        partial = False
+
+        # A generator cannot hold a scope across yields; its tasks carry the deadline
+        budget = deadline.context(timeout or self.deadline)
+        scrape_deadline = loop.time() + budget.run(self._scrape_budget)
+
+        def start(coro) -> asyncio.Task:
+            return asyncio.create_task(coro, context=budget.copy())
+
+        query = build_search_query(product)
+        cached = await self.prefetcher.lookup(query, max_results)
+        if cached is not None:
+            sources = _cached_source(cached)
+        else:
+            sources = _foreground_source(
+                self.prefetcher,
+                self.scraper.stream_product_alternatives(
+                    query=query,
+                    current_product_name=product.name,
+                    max_results=max_results,
+                ),
+            )
+        next_source: Optional[asyncio.Task] = start(_next(sources))
+        llm_task: Optional[asyncio.Task] = None
+        llm_reported = False
+
+        try:
+            while next_source or (llm_task and not llm_reported):
+                waiting = {t for t in (next_source, llm_task) if t and not t.done()}
+                wakeups = []
+                if llm_task is None:
+                    wakeups.append(llm_deadline)
+                if next_source:
+                    wakeups.append(scrape_deadline)
+                wait = max(0.0, min(wakeups) - loop.time()) if wakeups else None
+                if waiting:
+                    await asyncio.wait(waiting, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+
+                if next_source and next_source.done():
+                    try:
+                        source, found = next_source.result()
+                    except StopAsyncIteration:
+                        next_source = None
+                    else:
+                        collected.extend(found)
+                        next_source = start(_next(sources))
+                        yield "alternatives", {
+                            "source": source,
+                            "alternatives": [alt.model_dump() for alt in found],
+                        }
+
+                # Out of scrape budget: compare what has been found so far
+                if next_source and not next_source.done() and loop.time() >= scrape_deadline:
+                    next_source.cancel()
+                    await asyncio.gather(next_source, return_exceptions=True)
+                    next_source = None
+                    partial = True
+
+                # Start the LLM with what we have once it is enough or it is time
+                if llm_task is None and (
+                    len(collected) >= self.stream_min_alternatives
+                    or next_source is None
+                    or loop.time() >= llm_deadline
+                ):
+                    yield "llm_started", {"alternatives": len(collected)}
+                    llm_task = start(self._analyze(product, list(collected)))
+
+                if llm_task and llm_task.done() and not llm_reported:
+                    llm_reported = True
+                    if llm_task.exception():
+                        yield "error", {
+                            "message": str(llm_task.exception()),
+                            "code": "COMPARISON_ERROR",
+                        }
+                    else:
+                        yield "comparison", llm_task.result()
+
+            if cached is None and not partial:
+                self.prefetcher.store(query, collected)
+            yield "done", {
+                "current_product": product.model_dump(),
+                "alternatives": [alt.model_dump() for alt in collected],
+                "partial": partial,
+            }
+
+        finally:
+            # Also runs when the client goes away mid-stream
+            pending = [t for t in (next_source, llm_task) if t and not t.done()]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            await sources.aclose()
+
+    async def _analyze(
+        self,
+        product: ProductInfo,
+        alternatives: list[ProductAlternative],
+    ) -> dict:
+        """
+        Score products locally, then ask the LLM for the verdict.
+
+        Only the top-k most comparable alternatives go to the LLM; the rest
+        are still scored and returned. The value scores are fed to the
+        prompt so the LLM does not have to derive them. If the LLM call
+        fails, the local ranking still produces a verdict.
+        """
+        with span("rank"):
+            annotated, selected = self.ranker.select(product, alternatives)
+        with span("score"):
+            scores = [s.model_dump() for s in self.scorer.score(product, annotated)]
+            # Ranks and percentiles in the prompt cover exactly the products it lists
+            prompt_scores = (
+                scores
+                if len(selected) == len(annotated)
+                else [s.model_dump() for s in self.scorer.score(product, selected)]
+            )
+
+        try:
+            analysis = await self.llm.compare_products(
+                current_product=product.model_dump(),
+                alternatives=[alt.model_dump() for alt in selected],
+                value_scores=prompt_scores,
+            )
+            source = "llm"
+        except Exception as e:
+            print(f"LLM comparison error, using local ranking: {e}")
+            analysis = {"verdict": self._local_verdict(scores)}
+            source = "local"
+
+        return {
+            "alternatives": [alt.model_dump() for alt in annotated],
+            "compared": [alt.name for alt in selected],
+            "verdict": analysis.get("verdict", "Unable to generate verdict"),
+            "pros_cons_analysis": {
+                "current": analysis.get("current_analysis", {"pros": [], "cons": []}),
+                "alternatives": analysis.get("alternatives_analysis", []),
+            },
+            "recommendation": analysis.get("recommendation"),
+            "value_scores": scores,
+            "analysis_source": source,
+        }
+
+    def _local_verdict(self, scores: list[dict]) -> str:
+        """One-line verdict from the local value ranking."""
+        if len(scores) < 2:
+            return "No alternatives found to compare against."
+        best = scores[0]
+        if best["is_current"]:
+            return f"{best['name']} is the best value among the options found."
+        verdict = f"{best['name']} looks like the best value"
+        if best.get("relative_savings") and best["relative_savings"] > 0:
+            verdict += f", {best['relative_savings']:.0%} cheaper than the current product"
+        return verdict + "."
@@ -0,0 +1,63 @@
+import io
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # Optional; only gzip and deflate bodies are accepted without it
+    zstandard = None
+
+
+class BodyTooLargeError(Exception):
+    """A request body is, or inflates to, more than the allowed size."""
+
+
+def supported_encodings() -> list[str]:
+    """Content-Encoding values accepted on request bodies."""
+    encodings = ["gzip", "deflate"]
+    if zstandard is not None:
+        encodings.append("zstd")
+    return encodings
+
+
+def _inflate(data: bytes, wbits: int, limit: int) -> bytes:
+    decompressor = zlib.decompressobj(wbits)
+    try:
+        # max_length stops inflating one byte past the limit, so a bomb
+        # never gets expanded in memory
+        out = decompressor.decompress(data, limit + 1)
+    except zlib.error as e:
+        raise ValueError(f"Invalid compressed body: {e}") from e
+    if len(out) > limit:
+        raise BodyTooLargeError(f"Decompressed body exceeds {limit} bytes")
+    if not decompressor.eof:
+        raise ValueError("Truncated compressed body")
+    return out
+
+
+def _unzstd(data: bytes, limit: int) -> bytes:
+    try:
+        with zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data)) as reader:
+            out = reader.read(limit + 1)
+    except zstandard.ZstdError as e:
+        raise ValueError(f"Invalid compressed body: {e}") from e
+    if len(out) > limit:
+        raise BodyTooLargeError(f"Decompressed body exceeds {limit} bytes")
+    return out
+
+
+def decode_body(encoding: str, data: bytes, limit: int) -> bytes:
+    """
+    Decompress a request body, refusing to produce more than limit bytes.
+
+    Raises:
+        BodyTooLargeError: If the body inflates past limit
+        ValueError: If the body is not valid for its encoding
+        KeyError: If the encoding is not supported
+    """
+    if encoding == "gzip":
+        return _inflate(data, 16 + zlib.MAX_WBITS, limit)
+    if encoding == "deflate":
+        return _inflate(data, zlib.MAX_WBITS, limit)
+    if encoding == "zstd" and zstandard is not None:
+        return _unzstd(data, limit)
+    raise KeyError(encoding)
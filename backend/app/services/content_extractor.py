@@ -0,0 +1,286 @@
+import re
+from html.parser import HTMLParser
+from typing import Optional
+
+from ..config import get_settings
+
+settings = get_settings()
+
+# Subtrees that never hold main content.
+SKIP_TAGS = frozenset(
+    {
+        "script", "style", "noscript", "template", "svg", "iframe", "canvas",
+        "nav", "header", "footer", "aside", "form", "button", "select",
+    }
+)
+
+# Elements whose start or end separates one block of text from the next.
+BLOCK_TAGS = frozenset(
+    {
+        "p", "div", "section", "article", "main", "body", "li", "ul", "ol",
+        "h1", "h2", "h3", "h4", "h5", "h6", "pre", "blockquote", "table",
+        "tr", "td", "th", "dl", "dd", "dt", "figure", "figcaption",
+    }
+)
+
+# Blocks that are "paragraphs"; their score goes to the enclosing container.
+PARAGRAPH_TAGS = frozenset(
+    {
+        "p", "li", "h1", "h2", "h3", "h4", "h5", "h6", "pre", "blockquote",
+        "td", "th", "dd", "dt", "figcaption",
+    }
+)
+
+VOID_TAGS = frozenset(
+    {
+        "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+        "meta", "param", "source", "track", "wbr",
+    }
+)
+
+# Tags that implicitly close an open element of the same name.
+SELF_CLOSING_SIBLINGS = frozenset({"p", "li", "dd", "dt", "td", "th", "tr"})
+
+POSITIVE_HINTS = re.compile(
+    r"article|body|content|entry|main|page|post|story|text|blog", re.I
+)
+NEGATIVE_HINTS = re.compile(
+    r"ad-|ads|banner|breadcrumb|comment|cookie|footer|menu|modal|nav|"
+    r"popup|promo|related|share|sidebar|social|sponsor|subscribe|widget",
+    re.I,
+)
+
+MIN_SCORED_LENGTH = 25
+MAX_LINK_DENSITY = 0.5
+
+
+class _Block:
+    """A run of text owned by one block-level element."""
+
+    __slots__ = ("tag", "node", "text", "link_chars")
+
+    def __init__(self, tag: str, node: int, text: str, link_chars: int):
+        self.tag = tag
+        self.node = node
+        self.text = text
+        self.link_chars = link_chars
+
+    @property
+    def link_density(self) -> float:
+        return self.link_chars / len(self.text) if self.text else 0.0
+
+
+class _BlockCollector(HTMLParser):
+    """Stream HTML into text blocks without building a DOM."""
+
+    def __init__(self, scan_limit: int):
+        super().__init__(convert_charrefs=True)
+        self.scan_limit = scan_limit
+        self.scanned = 0
+        self.exhausted = False
+
+        self.title = ""
+        self.description = ""
+
+        # Per element: (tag, parent node id, class/id hint weight)
+        self.nodes: list[tuple[str, int, int]] = [("#root", -1, 0)]
+        self.stack: list[int] = [0]
+        self.blocks: list[_Block] = []
+
+        self._skip_depth = 0
+        self._link_depth = 0
+        self._in_title = False
+        self._parts: list[str] = []
+        self._link_chars = 0
+
+    def _owner(self) -> int:
+        """Innermost open block-level element."""
+        for node in reversed(self.stack):
+            if self.nodes[node][0] in BLOCK_TAGS:
+                return node
+        return 0
+
+    def _flush(self) -> None:
+        if not self._parts:
+            return
+        text = " ".join("".join(self._parts).split())
+        if text:
+            owner = self._owner()
+            self.blocks.append(_Block(self.nodes[owner][0], owner, text, self._link_chars))
+            self.scanned += len(text.encode("utf-8"))
+            if self.scanned >= self.scan_limit:
+                self.exhausted = True
+        self._parts = []
+        self._link_chars = 0
+
+    def _pop_to(self, tag: str) -> bool:
+        for depth in range(len(self.stack) - 1, 0, -1):
+            if self.nodes[self.stack[depth]][0] == tag:
+                del self.stack[depth:]
+                return True
+        return False
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, Optional[str]]]) -> None:
+        if tag == "meta" and not self.description:
+            attr = dict(attrs)
+            if (attr.get("name") or "").lower() == "description":
+                self.description = attr.get("content") or ""
+            return
+        if tag == "title":
+            self._in_title = True
+            return
+        if tag in VOID_TAGS:
+            if tag == "br" and not self._skip_depth:
+                self._parts.append(" ")
+            return
+
+        if self._skip_depth:
+            if tag in SKIP_TAGS:
+                self._skip_depth += 1
+            return
+        if tag in SKIP_TAGS:
+            self._skip_depth = 1
+            return
+
+        if tag in BLOCK_TAGS:
+            self._flush()
+            if tag in SELF_CLOSING_SIBLINGS and self.nodes[self.stack[-1]][0] == tag:
+                self.stack.pop()
+        elif tag == "a":
+            self._link_depth += 1
+
+        attr = dict(attrs)
+        hints = f"{attr.get('class') or ''} {attr.get('id') or ''}"
+        weight = 0
+        if hints.strip():
+            if NEGATIVE_HINTS.search(hints):
+                weight -= 25
+            if POSITIVE_HINTS.search(hints):
+                weight += 25
+        if tag in ("article", "main"):
+            weight += 25
+
+        self.nodes.append((tag, self.stack[-1], weight))
+        self.stack.append(len(self.nodes) - 1)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "title":
+            self._in_title = False
+            return
+        if self._skip_depth:
+            if tag in SKIP_TAGS:
+                self._skip_depth -= 1
+            return
+
+        if tag in BLOCK_TAGS:
+            self._flush()
+        elif tag == "a" and self._link_depth:
+            self._link_depth -= 1
+        self._pop_to(tag)
+
+    def handle_data(self, data: str) -> None:
+        if self._in_title:
+            self.title += data
+            return
+        if self._skip_depth:
+            return
+        self._parts.append(data)
+        if self._link_depth:
+            self._link_chars += len(data.strip())
+
+    def close(self) -> None:
+        super().close()
+        self._flush()
+
+
+class ContentExtractor:
+    """Readability-style main-content extraction with bounded memory."""
+
+    def __init__(
+        self,
+        max_bytes: Optional[int] = None,
+        scan_bytes: Optional[int] = None,
+        chunk_size: int = 65536,
+    ):
+        self.max_bytes = settings.content_max_bytes if max_bytes is None else max_bytes
+        self.scan_bytes = settings.content_scan_bytes if scan_bytes is None else scan_bytes
+        self.chunk_size = chunk_size
+
+    def extract(self, html: str) -> dict:
+        """
+        Extract the main content of a page as structured paragraphs.
+
+        Args:
+            html: Raw page HTML
+
+        Returns:
+            Dictionary with title, description, paragraphs and joined text
+        """
+        collector = _BlockCollector(self.scan_bytes)
+        for start in range(0, len(html), self.chunk_size):
+            collector.feed(html[start : start + self.chunk_size])
+            if collector.exhausted:
+                break
+        collector.close()
+
+        blocks = self._select_blocks(collector)
+        paragraphs = self._take_budget(blocks)
+
+        return {
+            "title": " ".join(collector.title.split()),
+            "description": collector.description,
+            "paragraphs": paragraphs,
+            "text": "\n\n".join(p["text"] for p in paragraphs),
+        }
+
+    def _select_blocks(self, collector: _BlockCollector) -> list[_Block]:
+        """Pick the blocks belonging to the highest-scoring container."""
+        nodes = collector.nodes
+        scores: dict[int, float] = {}
+
+        for block in collector.blocks:
+            if len(block.text) < MIN_SCORED_LENGTH:
+                continue
+            score = 1 + block.text.count(",") + min(len(block.text) // 100, 3)
+            score *= 1 - block.link_density
+
+            # Paragraph scores go to their container; text directly inside a
+            # container counts for the container itself.
+            node = nodes[block.node][1] if block.tag in PARAGRAPH_TAGS else block.node
+            if node < 0:
+                continue
+            scores[node] = scores.get(node, 0.0) + score
+            parent = nodes[node][1]
+            if parent >= 0:
+                scores[parent] = scores.get(parent, 0.0) + score / 2
+
+        if not scores:
+            return [b for b in collector.blocks if b.link_density <= MAX_LINK_DENSITY]
+
+        top = max(scores, key=lambda node: scores[node] + nodes[node][2])
+
+        selected = []
+        for block in collector.blocks:
+            if block.link_density > MAX_LINK_DENSITY:
+                continue
+            node = block.node
+            while node > top:
+                node = nodes[node][1]
+            if node == top:
+                selected.append(block)
+        return selected
+
+    def _take_budget(self, blocks: list[_Block]) -> list[dict]:
+        """Emit paragraphs in document order until the byte budget is spent."""
+        paragraphs = []
+        remaining = self.max_bytes
+        for block in blocks:
+            encoded = block.text.encode("utf-8")
+            if len(encoded) > remaining:
+                text = encoded[:remaining].decode("utf-8", errors="ignore").strip()
+                if text:
+                    paragraphs.append({"tag": block.tag, "text": text})
+                break
+            paragraphs.append({"tag": block.tag, "text": block.text})
+            remaining -= len(encoded)
+        return paragraphs
@@ -0,0 +1,80 @@
+import contextvars
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+# Monotonic time by which the current request must be answered
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceededError(Exception):
+    """A stage was skipped because the request's time budget is spent."""
+
+
+def _tightened(seconds: Optional[float]) -> Optional[float]:
+    """The deadline seconds from now, or the one in effect if that is earlier."""
+    current = _deadline.get()
+    if seconds is None:
+        return current
+    proposed = time.monotonic() + seconds
+    return proposed if current is None else min(current, proposed)
+
+
+@contextmanager
+def scope(seconds: Optional[float]) -> Iterator[None]:
+    """Run the enclosed code under a deadline seconds from now; None adds none."""
+    token = _deadline.set(_tightened(seconds))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def context(seconds: Optional[float]) -> contextvars.Context:
+    """
+    A copy of the current context with the deadline set.
+
+    For tasks started from an async generator, where a scope() could not
+    be reset in the same context it was entered.
+    """
+    ctx = contextvars.copy_context()
+    ctx.run(_deadline.set, _tightened(seconds))
+    return ctx
+
+
+def remaining(cap: Optional[float] = None) -> Optional[float]:
+    """
+    Seconds left before the deadline, at most cap.
+
+    Returns cap when no deadline is set (None if neither is).
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return cap
+    left = max(0.0, deadline - time.monotonic())
+    return left if cap is None else min(cap, left)
+
+
+def expired() -> bool:
+    """Whether the current deadline has passed."""
+    deadline = _deadline.get()
+    return deadline is not None and time.monotonic() >= deadline
+
+
+def budget(cap: float) -> float:
+    """
+    Timeout in seconds for the next stage: the remaining budget, at most cap.
+
+    Raises:
+        DeadlineExceededError: If no time is left
+    """
+    left = remaining(cap)
+    if left is not None and left <= 0:
+        raise DeadlineExceededError("Request deadline exceeded")
+    return left
+
+
+def budget_ms(cap_ms: float) -> float:
+    """budget() in milliseconds, as Playwright timeouts expect."""
+    return budget(cap_ms / 1000) * 1000
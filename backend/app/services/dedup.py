@@ -0,0 +1,179 @@
+import re
+from typing import Optional
+
+from ..config import get_settings
+from ..models import ProductAlternative
+
+settings = get_settings()
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?")
+# "16 GB" and "16GB" should produce the same token.
+_UNIT_RE = re.compile(r"(\d)\s+(gb|tb|mb|mm|cm|inch|oz|lb|lbs|w|mah|hz|ml|l)\b")
+
+# Words that describe a listing or a variant rather than the product itself.
+_NOISE_TOKENS = frozenset(
+    {
+        "a", "an", "and", "the", "for", "with", "of", "in", "by", "to", "on",
+        "new", "brand", "latest", "version", "edition", "model", "pack", "set",
+        "black", "white", "silver", "gray", "grey", "blue", "red", "green",
+        "gold", "pink", "purple", "rose", "midnight", "graphite",
+    }
+)
+
+
+def normalize_tokens(name: str) -> frozenset[str]:
+    """Turn a product title into a normalized token set."""
+    tokens = _TOKEN_RE.findall(_UNIT_RE.sub(r"\1\2", name.lower()))
+    return frozenset(t for t in tokens if t not in _NOISE_TOKENS)
+
+
+def jaccard(a: frozenset[str], b: frozenset[str]) -> float:
+    """Jaccard similarity of two token sets."""
+    if not a or not b:
+        return 0.0
+    intersection = len(a & b)
+    return intersection / (len(a) + len(b) - intersection)
+
+
+def similarity(a: frozenset[str], b: frozenset[str]) -> float:
+    """
+    Jaccard similarity that treats conflicting model numbers as different products.
+
+    Tokens with digits ("14", "1000xm5", "128gb") must agree before shared
+    words count: one title's digit tokens have to be a subset of the
+    other's, so "iPhone 14" matches "iPhone 14 128GB" but not "iPhone 13".
+    """
+    digits_a = {t for t in a if any(c.isdigit() for c in t)}
+    digits_b = {t for t in b if any(c.isdigit() for c in t)}
+    if not (digits_a <= digits_b or digits_b <= digits_a):
+        return 0.0
+    return jaccard(a, b)
+
+
+def _richness(alt: ProductAlternative) -> int:
+    """Score how complete an alternative record is."""
+    score = 0
+    if alt.price is not None:
+        score += 2
+    if alt.rating is not None:
+        score += 2
+    if alt.review_count is not None:
+        score += 1
+    if alt.image:
+        score += 1
+    if alt.url:
+        score += 1
+    return score
+
+
+def _merge(records: list[ProductAlternative]) -> ProductAlternative:
+    """Merge duplicate records, keeping the richest and filling its gaps."""
+    best = max(records, key=_richness)
+    update = {}
+    for field in ("price", "rating", "review_count", "image"):
+        if getattr(best, field) is None:
+            for other in records:
+                value = getattr(other, field)
+                if value is not None:
+                    update[field] = value
+                    break
+    return best.model_copy(update=update) if update else best
+
+
+class AlternativeDeduplicator:
+    """Merge near-duplicate alternatives using token-set similarity."""
+
+    def __init__(self, threshold: Optional[float] = None):
+        self.threshold = (
+            threshold if threshold is not None else settings.dedup_similarity_threshold
+        )
+
+    def deduplicate(
+        self,
+        alternatives: list[ProductAlternative],
+        current_product_name: str = "",
+    ) -> list[ProductAlternative]:
+        """
+        Collapse near-duplicate alternatives into single records.
+
+        Args:
+            alternatives: Candidates from all sources, in priority order
+            current_product_name: Name of the current product (its variants are dropped)
+
+        Returns:
+            Deduplicated alternatives, in order of first appearance
+        """
+        current_tokens = normalize_tokens(current_product_name)
+        current_lower = current_product_name.lower()
+
+        clusters: list[list[ProductAlternative]] = []
+        cluster_tokens: list[frozenset[str]] = []
+        # Inverted index from token to cluster ids, so each candidate is only
+        # compared against clusters it shares at least one token with.
+        index: dict[str, set[int]] = {}
+
+        for alt in alternatives:
+            if current_lower and current_lower in alt.name.lower():
+                continue
+
+            tokens = normalize_tokens(alt.name)
+            if current_tokens and similarity(tokens, current_tokens) >= self.threshold:
+                continue
+
+            candidates: set[int] = set()
+            for token in tokens:
+                candidates.update(index.get(token, ()))
+
+            match = None
+            best_score = self.threshold
+            for cluster_id in sorted(candidates):
+                score = similarity(tokens, cluster_tokens[cluster_id])
+                if score >= best_score:
+                    match, best_score = cluster_id, score
+
+            if match is None and not tokens:
+                # Titles with no meaningful tokens can only match exactly.
+                for cluster_id, cluster in enumerate(clusters):
+                    if cluster[0].name.lower() == alt.name.lower():
+                        match = cluster_id
+                        break
+
+            if match is None:
+                match = len(clusters)
+                clusters.append([])
+                cluster_tokens.append(tokens)
+                for token in tokens:
+                    index.setdefault(token, set()).add(match)
+
+            clusters[match].append(alt)
+
+        return [_merge(records) for records in clusters]
+
+    def filter_new(
+        self,
+        existing: list[ProductAlternative],
+        candidates: list[ProductAlternative],
+        current_product_name: str = "",
+    ) -> list[ProductAlternative]:
+        """
+        Deduplicate candidates that arrive after others were already used.
+
+        Args:
+            existing: Alternatives already handed out (never merged again)
+            candidates: Newly found alternatives
+            current_product_name: Name of the current product (its variants are dropped)
+
+        Returns:
+            Candidates that are not near-duplicates of existing ones or each other
+        """
+        existing_tokens = [normalize_tokens(alt.name) for alt in existing]
+        existing_names = {alt.name.lower() for alt in existing}
+        fresh = []
+        for alt in self.deduplicate(candidates, current_product_name):
+            if alt.name.lower() in existing_names:
+                continue
+            tokens = normalize_tokens(alt.name)
+            if any(similarity(tokens, other) >= self.threshold for other in existing_tokens):
+                continue
+            fresh.append(alt)
+        return fresh
@@ -0,0 +1,337 @@
+import atexit
+import json
+import queue
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any
+
+try:
+    import zstandard
+except ImportError:  # Optional; values are compressed with zlib without it
+    zstandard = None
+
+# Codec byte stored with each value
+RAW, ZLIB, ZSTD = 0, 1, 2
+
+_DELETED = object()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    codec INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires_at);
+CREATE INDEX IF NOT EXISTS cache_accessed ON cache (namespace, accessed_at);
+"""
+
+
+def encode_value(value: Any, compress_min_bytes: int) -> tuple[bytes, int]:
+    """Serialize a JSON-compatible value, compressing it if it is large."""
+    data = json.dumps(value, separators=(",", ":")).encode("utf-8")
+    if len(data) < compress_min_bytes:
+        return data, RAW
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=3).compress(data), ZSTD
+    return zlib.compress(data, 6), ZLIB
+
+
+def decode_value(data: bytes, codec: int) -> Any:
+    """Inverse of encode_value."""
+    if codec == ZSTD:
+        if zstandard is None:
+            raise ValueError("zstd-compressed cache entry but zstandard is not installed")
+        data = zstandard.ZstdDecompressor().decompress(data)
+    elif codec == ZLIB:
+        data = zlib.decompress(data)
+    return json.loads(data)
+
+
+class DiskCache:
+    """
+    Persistent LRU cache with a TTL per entry, stored in SQLite.
+
+    Drop-in for MemoryCache. Several caches share one database file, each
+    under its own namespace, and every uvicorn worker on the host opens the
+    same file: WAL mode lets readers run alongside the single writer, so a
+    response cached by one worker is a hit in the others and survives
+    restarts. Values must be JSON-compatible.
+
+    Writes, access-time updates and sweeps run on a writer thread, so a
+    worker waiting for another worker's write lock never stalls the event
+    loop. Values set here are readable at once; other workers see them once
+    the writer commits. Reads use their own connection, and one that cannot
+    get the database quickly is a miss.
+
+    Expired entries and the least recently used ones beyond max_entries
+    (per namespace) or max_bytes (whole file) are swept out periodically
+    rather than on every write.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        namespace: str,
+        max_entries: int = 1024,
+        max_bytes: int = 256 * 1024 * 1024,
+        compress_min_bytes: int = 1024,
+        sweep_interval: float = 60.0,
+        read_timeout: float = 0.05,
+        write_timeout: float = 5.0,
+    ):
+        self.path = path
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.compress_min_bytes = compress_min_bytes
+        self.sweep_interval = sweep_interval
+        self.write_timeout = write_timeout
+        # Access times are rewritten at most this often per entry, so hot
+        # keys do not turn every read into a write
+        self.touch_interval = min(sweep_interval, 60.0)
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self.write_errors = 0
+        self._last_sweep = 0.0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=read_timeout, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        # Values set but not committed yet, so this process reads its own
+        # writes; _DELETED marks a queued delete
+        self._pending: dict[str, tuple[Any, float]] = {}
+        self._touching: set[str] = set()
+        self._pending_lock = threading.Lock()
+        self._writes: queue.Queue = queue.Queue()
+        self._closed = False
+        self._writer = threading.Thread(
+            target=self._write_loop, name=f"disk-cache-{namespace}", daemon=True
+        )
+        self._writer.start()
+        atexit.register(self.close)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the value for key, or default if missing or expired."""
+        now = time.time()
+        with self._pending_lock:
+            pending = self._pending.get(key)
+        if pending is not None:
+            value, expires_at = pending
+            if value is _DELETED or expires_at <= now:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value, codec, expires_at, accessed_at FROM cache"
+                    " WHERE namespace = ? AND key = ?",
+                    (self.namespace, key),
+                ).fetchone()
+        except sqlite3.Error:
+            row = None
+        if row is None or row[2] <= now:
+            self.misses += 1
+            return default
+        try:
+            value = decode_value(row[0], row[1])
+        except ValueError:
+            self.misses += 1
+            return default
+        if now - row[3] > self.touch_interval:
+            with self._pending_lock:
+                queued = key in self._touching
+                self._touching.add(key)
+            if not queued:
+                self._writes.put(("touch", key, now))
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store value under key for ttl seconds."""
+        now = time.time()
+        entry = (value, now + ttl)
+        with self._pending_lock:
+            self._pending[key] = entry
+        self._writes.put(("set", key, entry, now))
+
+    def delete(self, key: str) -> None:
+        entry = (_DELETED, 0.0)
+        with self._pending_lock:
+            self._pending[key] = entry
+        self._writes.put(("delete", key, entry))
+
+    def clear(self) -> None:
+        with self._pending_lock:
+            self._pending.clear()
+        self._writes.put(("clear",))
+
+    def flush(self) -> None:
+        """Wait until every queued write is committed."""
+        if not self._closed:
+            self._writes.join()
+
+    def sweep(self) -> int:
+        """Drop expired entries, then least recently used ones over the limits."""
+        result: list[int] = []
+        self._writes.put(("sweep", result))
+        self.flush()
+        return result[0] if result else 0
+
+    def _write_loop(self) -> None:
+        conn = sqlite3.connect(self.path, timeout=self.write_timeout, isolation_level=None)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            while True:
+                op = self._writes.get()
+                try:
+                    if op[0] == "stop":
+                        return
+                    self._apply(conn, op)
+                except sqlite3.Error as e:
+                    self.write_errors += 1
+                    print(f"Disk cache {self.namespace} write failed: {e}")
+                finally:
+                    if op[0] in ("set", "delete"):
+                        self._settle(op[1], op[2])
+                    self._writes.task_done()
+        finally:
+            conn.close()
+
+    def _settle(self, key: str, entry: tuple[Any, float]) -> None:
+        # Leave a newer pending value for the same key in place
+        with self._pending_lock:
+            if self._pending.get(key) is entry:
+                del self._pending[key]
+
+    def _apply(self, conn: sqlite3.Connection, op: tuple) -> None:
+        kind = op[0]
+        if kind == "set":
+            _, key, (value, expires_at), now = op
+            data, codec = encode_value(value, self.compress_min_bytes)
+            conn.execute(
+                "INSERT OR REPLACE INTO cache"
+                " (namespace, key, value, codec, size, expires_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.namespace, key, data, codec, len(data), expires_at, now),
+            )
+            if now - self._last_sweep >= self.sweep_interval:
+                self._sweep(conn)
+        elif kind == "touch":
+            with self._pending_lock:
+                self._touching.discard(op[1])
+            conn.execute(
+                "UPDATE cache SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (op[2], self.namespace, op[1]),
+            )
+        elif kind == "delete":
+            conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND key = ?", (self.namespace, op[1])
+            )
+        elif kind == "clear":
+            conn.execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+        elif kind == "sweep":
+            op[1].append(self._sweep(conn))
+
+    def _sweep(self, conn: sqlite3.Connection) -> int:
+        self._last_sweep = time.time()
+        removed = conn.execute(
+            "DELETE FROM cache WHERE expires_at <= ?", (self._last_sweep,)
+        ).rowcount
+        removed += conn.execute(
+            "DELETE FROM cache WHERE namespace = ? AND key IN ("
+            " SELECT key FROM cache WHERE namespace = ?"
+            " ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.namespace, self.namespace, self.max_entries),
+        ).rowcount
+        # The byte budget covers every namespace in the file
+        removed += conn.execute(
+            "DELETE FROM cache WHERE rowid IN ("
+            " SELECT rowid FROM (SELECT rowid,"
+            " SUM(size) OVER (ORDER BY accessed_at DESC, rowid) AS running"
+            " FROM cache) WHERE running > ?)",
+            (self.max_bytes,),
+        ).rowcount
+        self.evicted += removed
+        return removed
+
+    def __len__(self) -> int:
+        self.flush()
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM cache WHERE namespace = ? AND expires_at > ?",
+                (self.namespace, time.time()),
+            ).fetchone()[0]
+
+    def dump(self) -> list[list]:
+        """Unexpired entries as [key, expires_at, value], oldest first."""
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, expires_at, value, codec FROM cache"
+                " WHERE namespace = ? AND expires_at > ? ORDER BY accessed_at",
+                (self.namespace, time.time()),
+            ).fetchall()
+        entries = []
+        for key, expires_at, data, codec in rows:
+            try:
+                entries.append([key, expires_at, decode_value(data, codec)])
+            except ValueError:
+                continue
+        return entries
+
+    def load(self, entries: list[list]) -> int:
+        """Restore entries from dump(), skipping expired ones. Returns the count loaded."""
+        now = time.time()
+        loaded = 0
+        for key, expires_at, value in entries:
+            if expires_at > now:
+                self.set(key, value, expires_at - now)
+                loaded += 1
+        return loaded
+
+    def stats(self) -> dict:
+        """Counters and stored size; entries still being written are not counted yet."""
+        try:
+            with self._lock:
+                entries, size = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache"
+                    " WHERE namespace = ? AND expires_at > ?",
+                    (self.namespace, time.time()),
+                ).fetchone()
+        except sqlite3.Error:
+            entries, size = None, None
+        total = self.hits + self.misses
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "bytes": size,
+            "evicted": self.evicted,
+            "pending_writes": self._writes.unfinished_tasks,
+            "write_errors": self.write_errors,
+        }
+
+    def close(self) -> None:
+        """Commit queued writes, then close the connections."""
+        if self._closed:
+            return
+        self._writes.put(("stop",))
+        self._writer.join()
+        self._closed = True
+        atexit.unregister(self.close)
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,184 @@
+import asyncio
+import time
+from functools import lru_cache
+from typing import AsyncIterator, Optional
+from uuid import uuid4
+
+from ..config import get_settings
+from ..models import ProductInfo
+from .cache import canonicalize_url
+from .comparison import ComparisonService
+
+settings = get_settings()
+
+
+class JobQueueFullError(Exception):
+    """Raised when too many compare jobs are already pending."""
+
+
+class CompareJob:
+    """A background product comparison and its progress events."""
+
+    def __init__(self, key: str, product: ProductInfo, max_results: int):
+        self.id = str(uuid4())
+        self.key = key
+        self.product = product
+        self.max_results = max_results
+        self.status = "queued"
+        self.events: list[dict] = []
+        self.result: Optional[dict] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def add_event(self, event: str, data: dict) -> None:
+        self.events.append({"event": event, "data": data, "ts": time.time()})
+        # Wake every subscriber, then arm a fresh event for the next change.
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def subscribe(self) -> AsyncIterator[dict]:
+        """Yield past and future events until the job finishes."""
+        index = 0
+        while True:
+            changed = self._changed
+            while index < len(self.events):
+                yield self.events[index]
+                index += 1
+            if self.finished:
+                return
+            await changed.wait()
+
+    def snapshot(self) -> dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "events": self.events,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class CompareJobManager:
+    """Runs compare jobs on a bounded worker pool, deduplicated by product."""
+
+    def __init__(self):
+        self.workers = settings.compare_job_workers
+        self.max_pending = settings.compare_job_max_pending
+        self.ttl = settings.compare_job_ttl
+        self.jobs: dict[str, CompareJob] = {}
+        self._by_key: dict[str, str] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._loop is not loop:
+            self._slots = asyncio.Semaphore(self.workers)
+            self._loop = loop
+        return self._slots
+
+    @staticmethod
+    def job_key(url: str, product: ProductInfo, max_results: int) -> str:
+        """Identity used to attach repeat requests to an existing job."""
+        return f"{canonicalize_url(url)}|{product.name.strip().lower()}|{max_results}"
+
+    def _sweep(self) -> None:
+        """Forget finished jobs older than the TTL."""
+        now = time.time()
+        for job_id, job in list(self.jobs.items()):
+            if job.finished and job.finished_at and now - job.finished_at > self.ttl:
+                del self.jobs[job_id]
+                if self._by_key.get(job.key) == job_id:
+                    del self._by_key[job.key]
+
+    def get(self, job_id: str) -> Optional[CompareJob]:
+        self._sweep()
+        return self.jobs.get(job_id)
+
+    def submit(
+        self,
+        url: str,
+        product: ProductInfo,
+        max_results: int = 5,
+    ) -> tuple[CompareJob, bool]:
+        """
+        Start a compare job, or attach to a live one for the same product.
+
+        Returns:
+            The job and whether it was an existing (deduplicated) job
+        """
+        self._sweep()
+        key = self.job_key(url, product, max_results)
+        existing = self.jobs.get(self._by_key.get(key, ""))
+        if existing and existing.status != "failed":
+            return existing, True
+
+        pending = sum(1 for job in self.jobs.values() if not job.finished)
+        if pending >= self.max_pending:
+            raise JobQueueFullError(f"{pending} compare jobs already pending")
+
+        job = CompareJob(key, product, max_results)
+        self.jobs[job.id] = job
+        self._by_key[key] = job.id
+        job.add_event("queued", {"job_id": job.id})
+        job.task = asyncio.create_task(self._run(job))
+        return job, False
+
+    async def _run(self, job: CompareJob) -> None:
+        async def progress(event: str, data: dict) -> None:
+            job.add_event(event, data)
+
+        try:
+            async with self._semaphore():
+                job.status = "running"
+                job.add_event("started", {})
+                job.result = await ComparisonService().compare(
+                    job.product, job.max_results, progress=progress
+                )
+                job.status = "done"
+                job.finished_at = time.time()
+                job.add_event("done", {})
+        except Exception as e:
+            print(f"Compare job {job.id} error: {e}")
+            self._fail(job, str(e))
+        finally:
+            # Cancellation (e.g. at shutdown, possibly while still waiting
+            # for a worker slot) is not an Exception; still give
+            # subscribers a terminal event.
+            if not job.finished:
+                self._fail(job, "Compare job was cancelled")
+
+    @staticmethod
+    def _fail(job: CompareJob, message: str) -> None:
+        job.error = message
+        job.status = "failed"
+        job.finished_at = time.time()
+        job.add_event("failed", {"message": message})
+
+    async def shutdown(self) -> None:
+        """Cancel jobs still running."""
+        tasks = [job.task for job in self.jobs.values() if job.task and not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        counts: dict[str, int] = {}
+        for job in self.jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {"workers": self.workers, "jobs": counts}
+
+
+@lru_cache()
+def get_job_manager() -> CompareJobManager:
+    """Get the shared compare job manager."""
+    return CompareJobManager()
@@ -1,3 +1,5 @@
+import asyncio
+import hashlib
 import json
 import httpx
 from typing import Any
@@ -7,12 +9,24 @@ from ..models.prompts import (
     SUMMARIZE_USER,
     COMPARE_SYSTEM,
     COMPARE_USER,
+    COMPARE_VERDICT_USER,
+    PRODUCT_PROS_CONS_USER,
     CHAT_SYSTEM,
+    CHAT_HISTORY_SUMMARY,
+    CHAT_SUMMARY_SYSTEM,
+    CHAT_SUMMARY_USER,
     ANALYZE_SYSTEM,
     ANALYZE_USER,
     format_product_info,
     format_alternatives,
+    format_value_table,
+    format_pros_cons,
 )
+from . import deadline
+from .cache import get_llm_cache
+from .cancellation import get_cancellation_counters
+from .chat_history import get_chat_history
+from .tracing import span
 
 settings = get_settings()
 
@@ -27,6 +41,11 @@ class LLMService:
         self.api_key = settings.llm_api_key
         self.temperature = settings.llm_temperature
         self.max_tokens = settings.llm_max_tokens
+        self.keep_alive = settings.llm_keep_alive
+        self.timeout = settings.llm_timeout
+        self.compare_mode = settings.compare_mode
+        self.fanout_min_alternatives = settings.compare_fanout_min_alternatives
+        self.fanout_concurrency = settings.compare_fanout_concurrency
 
     async def health_check(self) -> bool:
         """Check if the LLM service is available."""
@@ -45,22 +64,65 @@ class LLMService:
         except Exception:
             return False
 
+    async def warmup(self) -> None:
+        """
+        Load the model with a one-token generation.
+
+        For Ollama, keep_alive keeps the model resident afterwards, so the
+        first user request does not pay the model load.
+        """
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            if self.provider == "ollama":
+                response = await client.post(
+                    f"{self.base_url}/api/chat",
+                    json={
+                        "model": self.model,
+                        "messages": [{"role": "user", "content": "hi"}],
+                        "stream": False,
+                        "keep_alive": self.keep_alive,
+                        "options": {"num_predict": 1},
+                    },
+                )
+            else:  # OpenAI-compatible
+                headers = {"Content-Type": "application/json"}
+                if self.api_key:
+                    headers["Authorization"] = f"Bearer {self.api_key}"
+                response = await client.post(
+                    f"{self.base_url}/v1/chat/completions",
+                    headers=headers,
+                    json={
+                        "model": self.model,
+                        "messages": [{"role": "user", "content": "hi"}],
+                        "max_tokens": 1,
+                    },
+                )
+            response.raise_for_status()
+
     async def _call_ollama(
         self,
         system_prompt: str,
         user_prompt: str,
+        timeout: float,
+        messages: list[dict] | None = None,
     ) -> str:
         """Call Ollama API."""
-        async with httpx.AsyncClient(timeout=120.0) as client:
+        if messages:
+            chat_messages = [{"role": "system", "content": system_prompt}]
+            chat_messages.extend(messages)
+        else:
+            chat_messages = [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ]
+
+        async with httpx.AsyncClient(timeout=timeout) as client:
             response = await client.post(
                 f"{self.base_url}/api/chat",
                 json={
                     "model": self.model,
-                    "messages": [
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt},
-                    ],
+                    "messages": chat_messages,
                     "stream": False,
+                    "keep_alive": self.keep_alive,
                     "options": {
                         "temperature": self.temperature,
                         "num_predict": self.max_tokens,
@@ -75,6 +137,7 @@ class LLMService:
         self,
         system_prompt: str,
         user_prompt: str,
+        timeout: float,
         messages: list[dict] | None = None,
     ) -> str:
         """Call OpenAI-compatible API (vLLM, OpenAI, etc.)."""
@@ -91,7 +154,7 @@ class LLMService:
                 {"role": "user", "content": user_prompt},
             ]
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
+        async with httpx.AsyncClient(timeout=timeout) as client:
             response = await client.post(
                 f"{self.base_url}/v1/chat/completions",
                 headers=headers,
@@ -112,16 +175,49 @@ class LLMService:
         user_prompt: str,
         messages: list[dict] | None = None,
     ) -> str:
-        """Generate response using configured provider."""
-        if self.provider == "ollama":
-            return await self._call_ollama(system_prompt, user_prompt)
-        else:
-            return await self._call_openai_compatible(
-                system_prompt, user_prompt, messages
-            )
+        """
+        Generate response using configured provider.
+
+        The call gets the request's remaining deadline budget, at most the
+        configured LLM timeout.
+
+        Raises:
+            DeadlineExceededError: If the request's deadline has passed
+        """
+        timeout = deadline.budget(self.timeout)
+        with span("llm.generate", provider=self.provider, model=self.model):
+            try:
+                if self.provider == "ollama":
+                    call = self._call_ollama(system_prompt, user_prompt, timeout, messages)
+                else:
+                    call = self._call_openai_compatible(
+                        system_prompt, user_prompt, timeout, messages
+                    )
+                # httpx timeouts bound each read, not the whole call
+                return await asyncio.wait_for(call, timeout)
+            except asyncio.TimeoutError as e:
+                raise deadline.DeadlineExceededError(
+                    f"LLM call exceeded its {timeout:.1f}s budget"
+                ) from e
+            except asyncio.CancelledError:
+                # Closing the connection makes the provider stop generating
+                get_cancellation_counters().llm_calls += 1
+                raise
+
+    def _cache_key(self, system_prompt: str, user_prompt: str) -> str:
+        """LLM response cache key for a prompt on the configured model."""
+        return hashlib.sha256(
+            "\x00".join(
+                [self.provider, self.model, str(self.temperature), system_prompt, user_prompt]
+            ).encode()
+        ).hexdigest()
 
     def _parse_json_response(self, response: str) -> dict:
         """Parse JSON from LLM response."""
+        with span("llm.parse"):
+            return self._extract_json(response)
+
+    def _extract_json(self, response: str) -> dict:
         # Try to extract JSON from the response
         try:
             # Find JSON block
@@ -186,18 +282,129 @@ class LLMService:
         self,
         current_product: dict,
         alternatives: list[dict],
+        value_scores: list[dict] | None = None,
+    ) -> dict:
+        """
+        Compare current product with alternatives.
+
+        Uses one completion for small comparisons. With many alternatives
+        (or compare_mode "fanout") pros and cons are generated per product
+        in parallel and merged by a short verdict call, so latency does not
+        grow with the number of alternatives.
+        """
+        if self.compare_mode == "fanout" or (
+            self.compare_mode == "auto"
+            and len(alternatives) >= self.fanout_min_alternatives
+        ):
+            return await self._compare_fanout(current_product, alternatives, value_scores)
+        return await self._compare_single(current_product, alternatives, value_scores)
+
+    async def _compare_single(
+        self,
+        current_product: dict,
+        alternatives: list[dict],
+        value_scores: list[dict] | None = None,
+    ) -> dict:
+        """Compare all products in a single completion."""
+        with span("llm.prompt"):
+            alternatives_text = format_alternatives(alternatives)
+
+            user_prompt = COMPARE_USER.format(
+                product_name=current_product.get("name", "Unknown"),
+                product_price=current_product.get("price", "N/A"),
+                product_currency=current_product.get("currency", "USD"),
+                product_rating=current_product.get("rating", "N/A"),
+                product_reviews=current_product.get("review_count", "N/A"),
+                product_brand=current_product.get("brand", "Unknown"),
+                alternatives=alternatives_text,
+                value_table=format_value_table(value_scores or []),
+            )
+
+        response = await self._generate(COMPARE_SYSTEM, user_prompt)
+        parsed = self._parse_json_response(response)
+
+        return {
+            "verdict": parsed.get("verdict", "Unable to generate comparison"),
+            "current_analysis": parsed.get(
+                "current_analysis", {"pros": [], "cons": []}
+            ),
+            "alternatives_analysis": parsed.get("alternatives_analysis", []),
+            "recommendation": parsed.get("recommendation"),
+        }
+
+    async def analyze_pros_cons(self, product: dict) -> dict:
+        """
+        Pros and cons of a single product.
+
+        The prompt depends only on the product, so results are cached and
+        reused across comparisons that share it.
+        """
+        user_prompt = PRODUCT_PROS_CONS_USER.format(
+            name=product.get("name", "Unknown"),
+            price=product.get("price", "N/A"),
+            currency=product.get("currency", "USD"),
+            rating=product.get("rating", "N/A"),
+            reviews=product.get("review_count", "N/A"),
+            brand=product.get("brand") or "Unknown",
+            source=product.get("source") or "Product page",
+        )
+
+        key = self._cache_key(COMPARE_SYSTEM, user_prompt)
+        cache = get_llm_cache()
+        if settings.cache_enabled:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        response = await self._generate(COMPARE_SYSTEM, user_prompt)
+        parsed = self._parse_json_response(response)
+        result = {
+            "pros": parsed.get("pros", []),
+            "cons": parsed.get("cons", []),
+        }
+
+        # Only well-formed answers are cached; a malformed one is retried next time
+        if (
+            settings.cache_enabled
+            and isinstance(parsed.get("pros"), list)
+            and isinstance(parsed.get("cons"), list)
+        ):
+            cache.set(key, result, settings.cache_ttl)
+        return result
+
+    async def _compare_fanout(
+        self,
+        current_product: dict,
+        alternatives: list[dict],
+        value_scores: list[dict] | None = None,
     ) -> dict:
-        """Compare current product with alternatives."""
-        alternatives_text = format_alternatives(alternatives)
+        """Analyze each product concurrently, then merge them in a verdict call."""
+        slots = asyncio.Semaphore(self.fanout_concurrency)
+
+        async def pros_cons(product: dict) -> dict:
+            async with slots:
+                try:
+                    return await self.analyze_pros_cons(product)
+                except Exception as e:
+                    print(f"Pros/cons error for {product.get('name')}: {e}")
+                    return {"pros": [], "cons": []}
 
-        user_prompt = COMPARE_USER.format(
+        products = [current_product] + alternatives
+        analyses = await asyncio.gather(*(pros_cons(p) for p in products))
+        named = [
+            {"name": product.get("name", "Unknown"), **analysis}
+            for product, analysis in zip(products, analyses, strict=True)
+        ]
+
+        user_prompt = COMPARE_VERDICT_USER.format(
             product_name=current_product.get("name", "Unknown"),
             product_price=current_product.get("price", "N/A"),
             product_currency=current_product.get("currency", "USD"),
             product_rating=current_product.get("rating", "N/A"),
             product_reviews=current_product.get("review_count", "N/A"),
             product_brand=current_product.get("brand", "Unknown"),
-            alternatives=alternatives_text,
+            pros_cons=format_pros_cons(named),
+            value_table=format_value_table(value_scores or []),
         )
 
         response = await self._generate(COMPARE_SYSTEM, user_prompt)
@@ -205,15 +412,18 @@ class LLMService:
 
         return {
             "verdict": parsed.get("verdict", "Unable to generate comparison"),
-            "current_analysis": parsed.get(
-                "current_analysis", {"pros": [], "cons": []}
-            ),
-            "alternatives_analysis": parsed.get("alternatives_analysis", []),
+            "current_analysis": analyses[0],
+            "alternatives_analysis": named[1:],
             "recommendation": parsed.get("recommendation"),
         }
 
     async def chat(self, messages: list[dict], context: dict) -> str:
-        """Chat with context from page content."""
+        """
+        Chat with context from page content.
+
+        Only the latest turns are sent verbatim; older ones are replaced by
+        the conversation's rolling summary (see ChatHistory).
+        """
         product_info = format_product_info(context.get("product"))
 
         system_prompt = CHAT_SYSTEM.format(
@@ -224,15 +434,29 @@ class LLMService:
             product_info=product_info,
         )
 
+        history = [msg for msg in messages if msg["role"] in ("user", "assistant")]
+        summary, recent = get_chat_history().window(
+            history, context.get("url", ""), self.summarize_history
+        )
+        if summary:
+            system_prompt += CHAT_HISTORY_SUMMARY.format(summary=summary)
+
         # Convert messages to the format expected by the API
-        chat_messages = [
-            {"role": msg["role"], "content": msg["content"]}
-            for msg in messages
-            if msg["role"] in ("user", "assistant")
-        ]
+        chat_messages = [{"role": msg["role"], "content": msg["content"]} for msg in recent]
 
         return await self._generate(
             system_prompt,
             "",  # Empty user prompt, using messages instead
             messages=chat_messages,
         )
+
+    async def summarize_history(
+        self, summary: str, messages: list[dict], max_words: int = 200
+    ) -> str:
+        """Fold chat messages into a conversation's running summary."""
+        user_prompt = CHAT_SUMMARY_USER.format(
+            summary=summary or "(none yet)",
+            messages="\n".join(f"{msg['role']}: {msg['content']}" for msg in messages),
+            max_words=max_words,
+        )
+        return await self._generate(CHAT_SUMMARY_SYSTEM, user_prompt)
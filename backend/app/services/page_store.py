@@ -0,0 +1,87 @@
+import hashlib
+import json
+from functools import lru_cache
+from typing import Optional
+
+from ..config import get_settings
+from ..models import PageContent
+from .cache import MemoryCache, make_cache
+
+settings = get_settings()
+
+
+def canonical_page_json(content: PageContent) -> str:
+    """
+    The page as compact JSON with sorted keys.
+
+    extracted_at is left out, so re-extracting an unchanged page gives the
+    same hash.
+    """
+    return json.dumps(
+        content.model_dump(exclude={"extracted_at"}),
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+
+
+def content_hash(content: PageContent) -> str:
+    """sha256 hex digest of the page's canonical JSON."""
+    return hashlib.sha256(canonical_page_json(content).encode("utf-8")).hexdigest()
+
+
+class PageTooLargeError(Exception):
+    """A page is over the size the store accepts."""
+
+
+class PageStore:
+    """
+    Pages stored under their content hash.
+
+    Clients upload a page once and send its hash to each endpoint instead
+    of the page. Entries expire after the TTL and are evicted LRU beyond
+    max_entries (and, on the disk backend, the cache file's byte cap).
+    Memory use is bounded by max_entries times max_page_bytes.
+    """
+
+    def __init__(self, backend: Optional[MemoryCache] = None):
+        self.backend = backend or make_cache("pages", settings.page_store_max_entries)
+        self.ttl = settings.page_store_ttl
+        self.max_page_bytes = settings.page_store_max_page_bytes
+        self.stored = 0
+
+    def put(self, content: PageContent) -> str:
+        """
+        Store a page, refreshing its TTL if it is already stored.
+
+        Returns:
+            The page's content hash
+
+        Raises:
+            PageTooLargeError: If the page's JSON is over max_page_bytes
+        """
+        data = canonical_page_json(content)
+        size = len(data.encode("utf-8"))
+        if size > self.max_page_bytes:
+            raise PageTooLargeError(f"Page is {size} bytes; the limit is {self.max_page_bytes}")
+        key = hashlib.sha256(data.encode("utf-8")).hexdigest()
+        # Kept as JSON so either backend can hold it and reads parse in one pass
+        self.backend.set(key, data, self.ttl)
+        self.stored += 1
+        return key
+
+    def get(self, key: str) -> Optional[PageContent]:
+        """The page stored under a content hash, or None if unknown or expired."""
+        data = self.backend.get(key)
+        if data is None:
+            return None
+        return PageContent.model_validate_json(data)
+
+    def stats(self) -> dict:
+        return {**self.backend.stats(), "stored": self.stored}
+
+
+@lru_cache()
+def get_page_store() -> PageStore:
+    """Get the shared page store."""
+    return PageStore()
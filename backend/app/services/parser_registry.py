@@ -0,0 +1,96 @@
+import time
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+
+import soupsieve
+from bs4 import BeautifulSoup
+
+from ..models import ProductInfo
+
+Selectors = dict[str, soupsieve.SoupSieve]
+ParseFunc = Callable[[BeautifulSoup, Selectors], Optional[ProductInfo]]
+
+
+class SiteParser:
+    """A product page parser for one retailer, with precompiled selectors."""
+
+    def __init__(
+        self,
+        name: str,
+        domains: list[str],
+        selectors: dict[str, str],
+        parse: ParseFunc,
+    ):
+        self.name = name
+        self.domains = [domain.lower() for domain in domains]
+        self.selectors: Selectors = {
+            key: soupsieve.compile(selector) for key, selector in selectors.items()
+        }
+        self.parse = parse
+
+        self.calls = 0
+        self.failures = 0
+        self.total_time = 0.0
+
+    def __call__(self, soup: BeautifulSoup) -> Optional[ProductInfo]:
+        self.calls += 1
+        start = time.perf_counter()
+        try:
+            product = self.parse(soup, self.selectors)
+        except Exception as e:
+            print(f"{self.name} parsing error: {e}")
+            product = None
+        self.total_time += time.perf_counter() - start
+        if product is None:
+            self.failures += 1
+        return product
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "failure_rate": round(self.failures / self.calls, 4) if self.calls else 0.0,
+            "total_ms": round(self.total_time * 1000, 3),
+            "avg_ms": round(self.total_time * 1000 / self.calls, 3) if self.calls else 0.0,
+        }
+
+
+class ParserRegistry:
+    """Site parsers indexed by domain, with a fallback for unknown sites."""
+
+    def __init__(self, fallback: SiteParser):
+        self.fallback = fallback
+        self._by_domain: dict[str, SiteParser] = {}
+        self._parsers: dict[str, SiteParser] = {fallback.name: fallback}
+
+    def register(self, parser: SiteParser) -> SiteParser:
+        """Register a parser for each of its domains."""
+        for domain in parser.domains:
+            self._by_domain[domain] = parser
+        self._parsers[parser.name] = parser
+        return parser
+
+    def resolve(self, url: str) -> SiteParser:
+        """
+        Find the parser for a URL.
+
+        Looks up the exact host first, then drops leading labels
+        ("www.amazon.co.uk" -> "amazon.co.uk" -> "co.uk") until a registered
+        domain matches, so cost depends on the host, not the registry size.
+        """
+        host = (urlsplit(url).hostname or "").lower()
+        while host:
+            parser = self._by_domain.get(host)
+            if parser:
+                return parser
+            _, _, host = host.partition(".")
+        return self.fallback
+
+    def parse(self, html: str, url: str) -> Optional[ProductInfo]:
+        """Parse a product page with the parser registered for its domain."""
+        parser = self.resolve(url)
+        soup = BeautifulSoup(html, "html.parser")
+        return parser(soup)
+
+    def stats(self) -> dict:
+        return {name: parser.stats() for name, parser in self._parsers.items()}
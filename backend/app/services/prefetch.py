@@ -0,0 +1,187 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import AsyncIterator, Optional
+
+from ..config import get_settings
+from ..models import ProductAlternative, ProductInfo
+from .cache import make_cache
+from .scraper import ScraperService
+
+settings = get_settings()
+
+
+class AlternativesPrefetcher:
+    """
+    Alternatives cache with speculative, low-priority background scrapes.
+
+    Prefetches are started when a product page is summarized, so a later
+    compare finds the scrape done or in flight. They are the first work to
+    go under load: new ones are dropped and running ones cancelled while
+    foreground comparisons are scraping.
+    """
+
+    def __init__(self, scraper_factory=None):
+        self.enabled = settings.prefetch_enabled
+        self.max_inflight = settings.prefetch_max_inflight
+        self.budget_per_minute = settings.prefetch_budget_per_minute
+        self.max_foreground = settings.prefetch_max_foreground
+        self.ttl = settings.alternatives_cache_ttl
+        self.cache = make_cache("alternatives", settings.alternatives_cache_max_entries)
+        self._scraper_factory = scraper_factory or ScraperService
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._awaited: set[str] = set()
+        self._started: deque[float] = deque()
+        self._foreground = 0
+        self.counters = {"submitted": 0, "completed": 0, "used": 0, "cancelled": 0}
+        self.dropped: dict[str, int] = {}
+
+    @staticmethod
+    def key(query: str) -> str:
+        return " ".join(query.lower().split())
+
+    def _entry(self, query: str) -> Optional[dict]:
+        if not settings.cache_enabled:
+            return None
+        return self.cache.get(self.key(query))
+
+    def get(self, query: str, max_results: int) -> Optional[list[ProductAlternative]]:
+        """Cached alternatives for a search query, or None."""
+        entry = self._entry(query)
+        if entry is None:
+            return None
+        return [ProductAlternative(**alt) for alt in entry["alternatives"][:max_results]]
+
+    def store(
+        self,
+        query: str,
+        alternatives: list[ProductAlternative],
+        prefetched: bool = False,
+    ) -> None:
+        """Cache the alternatives found for a search query."""
+        if settings.cache_enabled and alternatives:
+            self.cache.set(
+                self.key(query),
+                {
+                    "alternatives": [alt.model_dump() for alt in alternatives],
+                    "prefetched": prefetched,
+                },
+                self.ttl,
+            )
+
+    async def lookup(self, query: str, max_results: int) -> Optional[list[ProductAlternative]]:
+        """
+        Cached alternatives, waiting for a prefetch of the same query if one is running.
+
+        Returns:
+            The alternatives, or None if the caller has to scrape
+        """
+        key = self.key(query)
+        entry = self._entry(query)
+        task = self._inflight.get(key)
+        if entry is None and task is not None:
+            self._awaited.add(key)
+            try:
+                # Shielded so a cancelled caller does not cancel the prefetch
+                await asyncio.shield(task)
+            except asyncio.CancelledError:
+                if not task.cancelled():
+                    raise
+                return None
+            except Exception:
+                return None
+            finally:
+                self._awaited.discard(key)
+            entry = self._entry(query)
+        if entry is None:
+            return None
+        if entry["prefetched"]:
+            # Counts compares served by a prefetch, finished or still running
+            self.counters["used"] += 1
+        return [ProductAlternative(**alt) for alt in entry["alternatives"][:max_results]]
+
+    @asynccontextmanager
+    async def foreground(self) -> AsyncIterator[None]:
+        """Mark a user-facing scrape, shedding prefetches if load is high."""
+        self._foreground += 1
+        if self._foreground >= self.max_foreground:
+            self._shed()
+        try:
+            yield
+        finally:
+            self._foreground -= 1
+
+    def _shed(self) -> None:
+        for key, task in self._inflight.items():
+            # A compare already waiting on a prefetch is foreground work
+            if key not in self._awaited and not task.done():
+                task.cancel()
+                self.counters["cancelled"] += 1
+
+    def _drop(self, reason: str) -> bool:
+        self.dropped[reason] = self.dropped.get(reason, 0) + 1
+        return False
+
+    def submit(self, product: ProductInfo, query: str, max_results: int = 5) -> bool:
+        """
+        Start a background alternatives search for a product, if allowed.
+
+        Returns:
+            Whether a prefetch was started
+        """
+        if not self.enabled or not settings.cache_enabled:
+            return False
+
+        key = self.key(query)
+        if key in self._inflight or self.cache.get(key) is not None:
+            return self._drop("duplicate")
+        if self._foreground >= self.max_foreground:
+            return self._drop("load")
+        if len(self._inflight) >= self.max_inflight:
+            return self._drop("inflight")
+
+        now = time.time()
+        while self._started and now - self._started[0] > 60:
+            self._started.popleft()
+        if len(self._started) >= self.budget_per_minute:
+            return self._drop("budget")
+
+        self._started.append(now)
+        self.counters["submitted"] += 1
+        task = asyncio.create_task(self._run(product, query, max_results))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return True
+
+    async def _run(self, product: ProductInfo, query: str, max_results: int) -> None:
+        alternatives = await self._scraper_factory().search_product_alternatives(
+            query=query,
+            current_product_name=product.name,
+            max_results=max_results,
+        )
+        self.store(query, alternatives, prefetched=True)
+        self.counters["completed"] += 1
+
+    async def shutdown(self) -> None:
+        """Cancel prefetches still running."""
+        tasks = list(self._inflight.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "inflight": len(self._inflight),
+            **self.counters,
+            "dropped": self.dropped,
+            "cache": self.cache.stats(),
+        }
+
+
+@lru_cache()
+def get_prefetcher() -> AlternativesPrefetcher:
+    """Get the shared alternatives prefetcher."""
+    return AlternativesPrefetcher()
@@ -1,13 +1,27 @@
-import re
 from typing import Optional
-from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright, Browser
+import httpx
 
 from ..config import get_settings
 from ..models import ProductInfo
+from . import deadline
+from .browser_pool import get_browser_pool
+from .cache import get_product_cache
+from .site_parsers import get_parser_registry
+from .structured_data import extract_structured_product
+from .tracing import span
 
 settings = get_settings()
 
+# Plain HTTP fetches need a browser-like identity or many shops refuse them.
+HTTP_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
 
 class ProductExtractorService:
     """Service for extracting product information from web pages."""
@@ -15,6 +29,11 @@ class ProductExtractorService:
     def __init__(self):
         self.timeout = settings.scraper_timeout
         self.headless = settings.scraper_headless
+        self.http_fast_path = settings.product_http_fast_path
+        self.http_timeout = settings.product_http_timeout
+        self.cache_enabled = settings.cache_enabled
+        self.cache = get_product_cache()
+        self.parsers = get_parser_registry()
 
     async def extract_from_url(self, url: str) -> Optional[ProductInfo]:
         """
@@ -26,237 +45,102 @@ class ProductExtractorService:
         Returns:
             ProductInfo if extraction successful, None otherwise
         """
+        cached = self.cache.get(url) if self.cache_enabled else None
+        if cached and cached["fresh"]:
+            return cached["product"]
+
+        if self.http_fast_path or cached:
+            with span("product.http"):
+                status, product, etag, last_modified = await self._extract_via_http(url, cached)
+            if status == 304 and cached:
+                self.cache.refresh(url, cached)
+                return cached["product"]
+            if product:
+                self._store(url, product, etag, last_modified)
+                return product
+
+        browser = None
         try:
-            playwright = await async_playwright().start()
-            browser = await playwright.chromium.launch(headless=self.headless)
+            browser = await get_browser_pool().new_context()
             page = await browser.new_page()
 
-            await page.goto(url, timeout=self.timeout)
-            await page.wait_for_load_state("domcontentloaded")
+            with span("product.navigate"):
+                response = await page.goto(url, timeout=deadline.budget_ms(self.timeout))
+                await page.wait_for_load_state("domcontentloaded")
 
             html = await page.content()
+            headers = response.headers if response else {}
             await browser.close()
+            browser = None
 
-            return self._parse_product_html(html, url)
+            with span("product.parse"):
+                product = self._parse_product_html(html, url)
+            if product:
+                self._store(url, product, headers.get("etag"), headers.get("last-modified"))
+            return product
 
         except Exception as e:
             print(f"Product extraction error: {e}")
             return None
 
-    def _parse_product_html(self, html: str, url: str) -> Optional[ProductInfo]:
-        """Parse product information from HTML."""
-        soup = BeautifulSoup(html, "html.parser")
-
-        # Determine site type and use appropriate parser
-        if "amazon" in url.lower():
-            return self._parse_amazon(soup)
-        elif "ebay" in url.lower():
-            return self._parse_ebay(soup)
-        else:
-            return self._parse_generic(soup)
-
-    def _parse_amazon(self, soup: BeautifulSoup) -> Optional[ProductInfo]:
-        """Parse Amazon product page."""
-        try:
-            # Name
-            name_elem = soup.select_one("#productTitle")
-            name = name_elem.get_text(strip=True) if name_elem else "Unknown"
-
-            # Price
-            price = None
-            price_elem = soup.select_one(".a-price .a-offscreen, #priceblock_ourprice, #priceblock_dealprice")
-            if price_elem:
-                price = self._parse_price(price_elem.get_text(strip=True))
-
-            # Rating
-            rating = None
-            rating_elem = soup.select_one("#acrPopover, .a-icon-star")
-            if rating_elem:
-                rating_text = rating_elem.get("title", "") or rating_elem.get_text()
-                match = re.search(r"(\d+\.?\d*)", rating_text)
-                if match:
-                    rating = float(match.group(1))
-
-            # Review count
-            review_count = None
-            review_elem = soup.select_one("#acrCustomerReviewText")
-            if review_elem:
-                match = re.search(r"([\d,]+)", review_elem.get_text())
-                if match:
-                    review_count = int(match.group(1).replace(",", ""))
-
-            # Brand
-            brand = ""
-            brand_elem = soup.select_one("#bylineInfo, .po-brand .a-span9")
-            if brand_elem:
-                brand = brand_elem.get_text(strip=True).replace("Visit the ", "").replace(" Store", "")
-
-            # Images
-            images = []
-            for img in soup.select("#imgTagWrapperId img, #landingImage"):
-                src = img.get("src") or img.get("data-old-hires")
-                if src:
-                    images.append(src)
-
-            # Description
-            description = ""
-            desc_elem = soup.select_one("#productDescription, #feature-bullets")
-            if desc_elem:
-                description = desc_elem.get_text(" ", strip=True)[:2000]
-
-            # Availability
-            availability = "unknown"
-            avail_elem = soup.select_one("#availability")
-            if avail_elem:
-                avail_text = avail_elem.get_text().lower()
-                if "in stock" in avail_text:
-                    availability = "in_stock"
-                elif "out of stock" in avail_text:
-                    availability = "out_of_stock"
-
-            return ProductInfo(
-                name=name,
-                price=price,
-                currency="USD",
-                images=images[:5],
-                description=description,
-                rating=rating,
-                review_count=review_count,
-                availability=availability,
-                brand=brand,
-                category="",
-            )
-
-        except Exception as e:
-            print(f"Amazon parsing error: {e}")
-            return None
-
-    def _parse_ebay(self, soup: BeautifulSoup) -> Optional[ProductInfo]:
-        """Parse eBay product page."""
-        try:
-            # Name
-            name_elem = soup.select_one("h1.x-item-title__mainTitle")
-            name = name_elem.get_text(strip=True) if name_elem else "Unknown"
-
-            # Price
-            price = None
-            price_elem = soup.select_one(".x-price-primary .ux-textspans")
-            if price_elem:
-                price = self._parse_price(price_elem.get_text(strip=True))
-
-            # Images
-            images = []
-            for img in soup.select(".ux-image-carousel-item img"):
-                src = img.get("src")
-                if src:
-                    images.append(src)
-
-            return ProductInfo(
-                name=name,
-                price=price,
-                currency="USD",
-                images=images[:5],
-                description="",
-                rating=None,
-                review_count=None,
-                availability="unknown",
-                brand="",
-                category="",
-            )
+        finally:
+            # The pooled browser outlives the request; its context must not
+            if browser:
+                await browser.close()
+
+    def _store(
+        self,
+        url: str,
+        product: ProductInfo,
+        etag: Optional[str],
+        last_modified: Optional[str],
+    ) -> None:
+        """Cache an extracted product if caching is enabled."""
+        if self.cache_enabled:
+            self.cache.store(url, product, etag, last_modified)
+
+    async def _extract_via_http(
+        self,
+        url: str,
+        cached: Optional[dict] = None,
+    ) -> tuple[int, Optional[ProductInfo], Optional[str], Optional[str]]:
+        """
+        Fetch the page without a browser and read its structured data.
 
-        except Exception as e:
-            print(f"eBay parsing error: {e}")
-            return None
+        Sends If-None-Match/If-Modified-Since when a cached entry has
+        validators. Returns the status code, the product (if the page
+        publishes structured data) and the response validators.
+        """
+        headers = dict(HTTP_HEADERS)
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
 
-    def _parse_generic(self, soup: BeautifulSoup) -> Optional[ProductInfo]:
-        """Parse generic product page using schema.org markup."""
         try:
-            # Try to find schema.org Product markup
-            product_schema = soup.select_one('[itemtype*="schema.org/Product"]')
-
-            if product_schema:
-                name_elem = product_schema.select_one('[itemprop="name"]')
-                price_elem = product_schema.select_one('[itemprop="price"]')
-                image_elem = product_schema.select_one('[itemprop="image"]')
-                desc_elem = product_schema.select_one('[itemprop="description"]')
-                rating_elem = product_schema.select_one('[itemprop="ratingValue"]')
-                brand_elem = product_schema.select_one('[itemprop="brand"]')
-
-                name = name_elem.get_text(strip=True) if name_elem else "Unknown"
-                price = None
-                if price_elem:
-                    price_content = price_elem.get("content") or price_elem.get_text()
-                    price = self._parse_price(price_content)
-
-                images = []
-                if image_elem:
-                    src = image_elem.get("src") or image_elem.get("content")
-                    if src:
-                        images.append(src)
-
-                description = desc_elem.get_text(strip=True)[:2000] if desc_elem else ""
-
-                rating = None
-                if rating_elem:
-                    rating_content = rating_elem.get("content") or rating_elem.get_text()
-                    match = re.search(r"(\d+\.?\d*)", rating_content)
-                    if match:
-                        rating = float(match.group(1))
-
-                brand = ""
-                if brand_elem:
-                    brand = brand_elem.get_text(strip=True)
-
-                return ProductInfo(
-                    name=name,
-                    price=price,
-                    currency="USD",
-                    images=images,
-                    description=description,
-                    rating=rating,
-                    review_count=None,
-                    availability="unknown",
-                    brand=brand,
-                    category="",
-                )
-
-            # Fallback to generic extraction
-            name_elem = soup.select_one("h1, .product-title, .product-name")
-            name = name_elem.get_text(strip=True) if name_elem else "Unknown Product"
-
-            price_elem = soup.select_one(".price, .product-price, [class*='price']")
-            price = None
-            if price_elem:
-                price = self._parse_price(price_elem.get_text())
-
-            return ProductInfo(
-                name=name,
-                price=price,
-                currency="USD",
-                images=[],
-                description="",
-                rating=None,
-                review_count=None,
-                availability="unknown",
-                brand="",
-                category="",
-            )
-
+            async with httpx.AsyncClient(
+                timeout=deadline.budget(self.http_timeout),
+                headers=headers,
+                follow_redirects=True,
+            ) as client:
+                response = await client.get(url)
+            etag = response.headers.get("etag")
+            last_modified = response.headers.get("last-modified")
+            if response.status_code != 200:
+                return response.status_code, None, etag, last_modified
+            product = extract_structured_product(response.text)
+            return response.status_code, product, etag, last_modified
         except Exception as e:
-            print(f"Generic parsing error: {e}")
-            return None
-
-    def _parse_price(self, price_text: str) -> Optional[float]:
-        """Parse price from text."""
-        if not price_text:
-            return None
+            print(f"HTTP product fetch error: {e}")
+            return 0, None, None, None
 
-        # Remove currency symbols and extract number
-        match = re.search(r"[\d,]+\.?\d*", price_text.replace(",", ""))
-        if match:
-            try:
-                return float(match.group())
-            except ValueError:
-                pass
+    def _parse_product_html(self, html: str, url: str) -> Optional[ProductInfo]:
+        """Parse product information from HTML."""
+        # JSON-LD/microdata fast path avoids building the DOM at all
+        product = extract_structured_product(html)
+        if product:
+            return product
 
-        return None
+        # Dispatch to the site parser registered for the URL's domain
+        return self.parsers.parse(html, url)
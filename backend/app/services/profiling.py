@@ -0,0 +1,134 @@
+import cProfile
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+from ..config import get_settings
+from .tracing import Trace
+
+settings = get_settings()
+
+
+class StackSampler:
+    """
+    Sampling profiler for one thread, producing collapsed stacks.
+
+    A background thread records the target thread's stack every interval.
+    The output is the folded format read by flamegraph.pl and speedscope:
+    one "outer;...;inner count" line per distinct stack.
+    """
+
+    def __init__(self, interval: float = 0.005, thread_id: Optional[int] = None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _label(frame) -> str:
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def _sample(self) -> None:
+        frame = sys._current_frames().get(self.thread_id)
+        stack = []
+        while frame is not None:
+            stack.append(self._label(frame))
+            frame = frame.f_back
+        if stack:
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class RequestProfiler:
+    """Profiles one request with the configured profiler and writes the result."""
+
+    def __init__(self, mode: Optional[str] = None, directory: Optional[str] = None):
+        self.mode = mode or settings.profiling_mode
+        self.directory = directory or settings.profiling_dir
+        self._sampler: Optional[StackSampler] = None
+        self._profile: Optional[cProfile.Profile] = None
+        self._started = 0.0
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        if self.mode == "cprofile":
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._sampler = StackSampler(settings.profiling_interval)
+            self._sampler.start()
+
+    def stop(self) -> float:
+        """Stop profiling. Returns the profiled wall time in milliseconds."""
+        if self._profile:
+            self._profile.disable()
+        if self._sampler:
+            self._sampler.stop()
+        return (time.perf_counter() - self._started) * 1000
+
+    def write(self, profile_id: str, request: dict, trace: Optional[Trace]) -> list[str]:
+        """
+        Write the profile and a JSON summary of the request and its stages.
+
+        Returns:
+            The paths written
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, profile_id)
+        paths = []
+        if self._profile:
+            # Readable with pstats, snakeviz or flameprof
+            self._profile.dump_stats(f"{base}.prof")
+            paths.append(f"{base}.prof")
+        if self._sampler:
+            with open(f"{base}.folded", "w", encoding="utf-8") as f:
+                f.write(self._sampler.folded())
+            paths.append(f"{base}.folded")
+
+        summary = {
+            **request,
+            "mode": self.mode,
+            "stages": [
+                {
+                    "name": span.name,
+                    "offset_ms": round((span.start_ns - trace.root.start_ns) / 1e6, 1),
+                    "duration_ms": round(span.duration_ms, 1),
+                    "attributes": span.attributes,
+                }
+                for span in trace.spans
+            ]
+            if trace
+            else [],
+        }
+        with open(f"{base}.json", "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, default=str)
+        paths.append(f"{base}.json")
+        return paths
+
+
+def profile_id_for(method: str, path: str) -> str:
+    """File-safe id naming a profile after its time and request."""
+    slug = re.sub(r"[^a-zA-Z0-9]+", "-", path).strip("-") or "root"
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{method.lower()}-{slug}-{os.urandom(3).hex()}"
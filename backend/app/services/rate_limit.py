@@ -0,0 +1,382 @@
+import asyncio
+import hashlib
+import heapq
+import ipaddress
+import itertools
+import math
+import sqlite3
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+from typing import Callable, Iterable, Optional
+
+from ..config import get_settings
+
+settings = get_settings()
+
+# Routes sharing capacity share a bucket and a queue
+ROUTE_CLASSES = {
+    "chat": "llm",
+    "summarize": "llm",
+    "analyze": "llm",
+    "compare": "browser",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class RateLimitedError(Exception):
+    """A request was turned away; its decision, if any, has the response headers."""
+
+    def __init__(self, message: str, decision: Optional["Decision"] = None):
+        super().__init__(message)
+        self.decision = decision
+
+
+class Decision:
+    """Outcome of charging a request to a client's bucket."""
+
+    __slots__ = ("allowed", "limit", "remaining", "reset", "retry_after")
+
+    def __init__(
+        self, allowed: bool, limit: float, remaining: float, reset: float, retry_after: float
+    ):
+        self.allowed = allowed
+        self.limit = limit
+        self.remaining = remaining
+        self.reset = reset
+        self.retry_after = retry_after
+
+    def headers(self) -> list[tuple[bytes, bytes]]:
+        """RateLimit-* response headers (IETF draft), plus Retry-After when refused."""
+        headers = [
+            (b"ratelimit-limit", str(int(self.limit)).encode()),
+            (b"ratelimit-remaining", str(int(self.remaining)).encode()),
+            (b"ratelimit-reset", str(math.ceil(self.reset)).encode()),
+        ]
+        if self.retry_after > 0:
+            headers.append((b"retry-after", str(max(1, math.ceil(self.retry_after))).encode()))
+        return headers
+
+
+def _refill(
+    tokens: float, updated: float, now: float, cost: float, rate: float, burst: float
+) -> tuple[Decision, float]:
+    """Token bucket step: the decision and the tokens left afterwards."""
+    tokens = min(burst, tokens + max(0.0, now - updated) * rate)
+    # A request costing more than the bucket holds could never pass
+    cost = min(cost, burst)
+    allowed = tokens >= cost
+    if allowed:
+        tokens -= cost
+    decision = Decision(
+        allowed=allowed,
+        limit=burst,
+        remaining=tokens,
+        reset=(burst - tokens) / rate,
+        retry_after=0.0 if allowed else (cost - tokens) / rate,
+    )
+    return decision, tokens
+
+
+class MemoryBucketStore:
+    """Token buckets held in this process."""
+
+    def __init__(self, max_keys: int = 100000, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets: dict[str, tuple[float, float]] = {}
+
+    async def take(self, key: str, cost: float, rate: float, burst: float) -> Decision:
+        now = self.clock()
+        tokens, updated = self._buckets.get(key, (burst, now))
+        decision, tokens = _refill(tokens, updated, now, cost, rate, burst)
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._sweep(now, rate, burst)
+        return decision
+
+    def _sweep(self, now: float, rate: float, burst: float) -> None:
+        # A bucket that has refilled is the same as no bucket
+        self._buckets = {
+            key: (tokens, updated)
+            for key, (tokens, updated) in self._buckets.items()
+            if tokens + (now - updated) * rate < burst
+        }
+
+
+class SqliteBucketStore:
+    """
+    Token buckets in a SQLite file, shared by every worker on the host.
+
+    Each charge is one IMMEDIATE transaction, so workers charging the same
+    client at once see each other's updates.
+    """
+
+    def __init__(self, path: str, sweep_interval: float = 60.0):
+        self.path = path
+        self.sweep_interval = sweep_interval
+        self._last_sweep = 0.0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=5.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def _take(self, key: str, cost: float, rate: float, burst: float) -> Decision:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT tokens, updated_at FROM buckets WHERE key = ?", (key,)
+                ).fetchone()
+                tokens, updated = row if row else (burst, now)
+                decision, tokens = _refill(tokens, updated, now, cost, rate, burst)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO buckets (key, tokens, updated_at) VALUES (?, ?, ?)",
+                    (key, tokens, now),
+                )
+                if now - self._last_sweep >= self.sweep_interval:
+                    self._last_sweep = now
+                    self._conn.execute(
+                        "DELETE FROM buckets WHERE updated_at < ?", (now - burst / rate,)
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return decision
+
+    async def take(self, key: str, cost: float, rate: float, burst: float) -> Decision:
+        return await asyncio.to_thread(self._take, key, cost, rate, burst)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class FairQueue:
+    """
+    Weighted-fair admission to a fixed number of request slots.
+
+    Start-time fair queuing: each waiting request is tagged with the later
+    of the queue's virtual time and its client's previous finish tag, and
+    its finish tag adds its cost. Free slots go to the smallest start tag.
+    A client with a long backlog advances its own tags, so requests from
+    other clients are slotted in between rather than waiting behind it.
+    """
+
+    def __init__(self, slots: int, max_queued: int):
+        self.slots = slots
+        self.max_queued = max_queued
+        self.active = 0
+        self.virtual_time = 0.0
+        self._finish: dict[str, float] = {}
+        self._queued: Counter[str] = Counter()
+        self._heap: list[tuple[float, int, str, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+    def _tag(self, client: str, cost: float) -> float:
+        start = max(self.virtual_time, self._finish.get(client, 0.0))
+        self._finish[client] = start + cost
+        return start
+
+    async def acquire(self, client: str, cost: float) -> None:
+        """
+        Wait for a slot.
+
+        Raises:
+            RateLimited: If the client already has max_queued requests waiting
+        """
+        if self.slots <= 0:
+            return
+        if self.active < self.slots and not self._heap:
+            self.virtual_time = self._tag(client, cost)
+            self.active += 1
+            return
+        if self._queued[client] >= self.max_queued:
+            raise RateLimitedError(f"Too many requests queued for this client ({self.max_queued})")
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._heap, (self._tag(client, cost), next(self._seq), client, future))
+        self._queued[client] += 1
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted a slot just as the caller gave up
+                self.release()
+            else:
+                future.cancel()
+                self._dequeued(client)
+            raise
+
+    def release(self) -> None:
+        if self.slots <= 0:
+            return
+        self.active -= 1
+        while self._heap and self.active < self.slots:
+            start, _, client, future = heapq.heappop(self._heap)
+            if future.done():
+                continue
+            self._dequeued(client)
+            self.virtual_time = start
+            self.active += 1
+            future.set_result(None)
+        if not self._heap and len(self._finish) > 1024:
+            # Clients whose tags are behind virtual time are tagged from it anyway
+            self._finish = {c: f for c, f in self._finish.items() if f > self.virtual_time}
+
+    def _dequeued(self, client: str) -> None:
+        self._queued[client] -= 1
+        if self._queued[client] <= 0:
+            del self._queued[client]
+
+    def stats(self) -> dict:
+        return {
+            "slots": self.slots,
+            "active": self.active,
+            "queued": sum(self._queued.values()),
+            "queued_clients": len(self._queued),
+        }
+
+
+class RateLimiter:
+    """
+    Per-client rate limiting and fair queuing by route class.
+
+    Each client has a token bucket per route class. A request is charged
+    its route's cost and refused if the bucket cannot cover it. Admitted
+    requests then wait for one of the class's slots in a fair queue.
+    """
+
+    def __init__(self, store=None, costs: Optional[dict[str, float]] = None):
+        self.store = store or MemoryBucketStore()
+        self.costs = costs if costs is not None else settings.rate_limit_costs
+        self.rate = settings.rate_limit_per_minute / 60
+        self.burst = settings.rate_limit_burst
+        slots = {"llm": settings.rate_limit_llm_slots, "browser": settings.rate_limit_browser_slots}
+        self.queues = {
+            route_class: FairQueue(slots[route_class], settings.rate_limit_max_queued)
+            for route_class in slots
+        }
+        self.counters: Counter[str] = Counter()
+
+    def cost(self, route: str) -> Optional[float]:
+        """Tokens charged for a request to route, or None if it is not limited."""
+        return self.costs.get(route)
+
+    async def acquire(self, client: str, route: str) -> Decision:
+        """
+        Charge a request and wait for a slot for it.
+
+        Returns:
+            The bucket decision, for the response headers
+
+        Raises:
+            RateLimited: If the client is out of tokens or has too many queued
+        """
+        cost = self.costs[route]
+        route_class = ROUTE_CLASSES.get(route, route)
+        try:
+            decision = await self.store.take(
+                f"{route_class}:{client}", cost, self.rate, self.burst
+            )
+        except (sqlite3.Error, OSError) as e:
+            # A broken shared store should not take the API down with it
+            print(f"Rate limit store error, allowing request: {e}")
+            self.counters["store_errors"] += 1
+            decision = Decision(True, self.burst, self.burst, 0.0, 0.0)
+        if not decision.allowed:
+            self.counters["limited"] += 1
+            raise RateLimitedError("Rate limit exceeded", decision)
+
+        queue = self.queues.get(route_class)
+        if queue:
+            try:
+                await queue.acquire(client, cost)
+            except RateLimited as e:
+                self.counters["queue_full"] += 1
+                # Tokens are not the problem; the queue should drain soon
+                decision.retry_after = 1.0
+                e.decision = decision
+                raise
+        self.counters["allowed"] += 1
+        return decision
+
+    def release(self, route: str) -> None:
+        queue = self.queues.get(ROUTE_CLASSES.get(route, route))
+        if queue:
+            queue.release()
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.store).__name__,
+            "allowed": self.counters["allowed"],
+            "limited": self.counters["limited"],
+            "queue_full": self.counters["queue_full"],
+            "store_errors": self.counters["store_errors"],
+            "queues": {name: queue.stats() for name, queue in self.queues.items()},
+        }
+
+
+Network = ipaddress.IPv4Network | ipaddress.IPv6Network
+
+
+def trusted_networks(entries: Iterable[str]) -> tuple[Network, ...]:
+    """Parse trusted proxy addresses or CIDR ranges."""
+    return tuple(ipaddress.ip_network(entry, strict=False) for entry in entries)
+
+
+def _is_trusted(host: Optional[str], networks: tuple[Network, ...]) -> bool:
+    if not host or not networks:
+        return False
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in networks)
+
+
+def client_key(
+    headers: dict[bytes, bytes], host: Optional[str], trusted_proxies: tuple[Network, ...] = ()
+) -> str:
+    """
+    Identify the client.
+
+    Clients are keyed on their remote address: identity headers are set by
+    the caller, who could send a new one with each request to get a fresh
+    bucket. Only requests from a trusted proxy, which authenticates clients
+    or sets the headers itself, are keyed on X-API-Key (hashed, so keys
+    are never stored), then X-Client-Id, then the address the proxy added
+    to X-Forwarded-For.
+    """
+    if _is_trusted(host, trusted_proxies):
+        api_key = headers.get(b"x-api-key")
+        if api_key:
+            return "key:" + hashlib.sha256(api_key).hexdigest()[:32]
+        client_id = headers.get(b"x-client-id")
+        if client_id:
+            return "id:" + client_id[:128].decode("latin-1")
+        forwarded = headers.get(b"x-forwarded-for", b"").decode("latin-1").split(",")[-1].strip()
+        if forwarded:
+            return f"ip:{forwarded}"
+    return f"ip:{host or 'unknown'}"
+
+
+@lru_cache()
+def get_rate_limiter() -> RateLimiter:
+    """Get the shared rate limiter with the configured bucket store."""
+    if settings.rate_limit_backend == "sqlite":
+        return RateLimiter(SqliteBucketStore(settings.rate_limit_sqlite_path))
+    return RateLimiter(MemoryBucketStore())
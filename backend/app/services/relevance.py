@@ -0,0 +1,125 @@
+import math
+import zlib
+from typing import Optional
+
+from ..config import get_settings
+from ..models import ProductAlternative, ProductInfo
+from .dedup import normalize_tokens
+
+settings = get_settings()
+
+Vector = dict[int, float]
+
+
+def hashed_features(text: str, dims: int, ngram: int = 3) -> Vector:
+    """
+    Hash a title's tokens and character n-grams into a unit-length sparse vector.
+
+    Whole tokens carry model numbers ("wh1000xm5") and n-grams tolerate
+    spelling and spacing variants. crc32 is used instead of hash() so
+    vectors are stable across processes.
+    """
+    vector: Vector = {}
+    for token in normalize_tokens(text):
+        grams = [token]
+        padded = f" {token} "
+        if len(padded) > ngram:
+            grams.extend(padded[i : i + ngram] for i in range(len(padded) - ngram + 1))
+        for gram in grams:
+            bucket = zlib.crc32(gram.encode()) % dims
+            vector[bucket] = vector.get(bucket, 0.0) + 1.0
+
+    norm = math.sqrt(sum(v * v for v in vector.values()))
+    if norm:
+        for bucket in vector:
+            vector[bucket] /= norm
+    return vector
+
+
+def cosine(a: Vector, b: Vector) -> float:
+    """Cosine similarity of two unit-length sparse vectors."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(value * b.get(bucket, 0.0) for bucket, value in a.items())
+
+
+def price_proximity(price: Optional[float], reference: Optional[float]) -> float:
+    """
+    How close a price is to the reference, from 1.0 (same) toward 0.0.
+
+    The smaller price over the larger, so half and double the price score
+    the same and a $20 case next to a $400 product scores 0.05. Unknown
+    prices score a neutral 0.5.
+    """
+    if not price or not reference or price <= 0 or reference <= 0:
+        return 0.5
+    return min(price, reference) / max(price, reference)
+
+
+class RelevanceRanker:
+    """Rank alternatives by how comparable they are to the current product."""
+
+    def __init__(
+        self,
+        top_k: Optional[int] = None,
+        price_weight: Optional[float] = None,
+        dims: Optional[int] = None,
+    ):
+        self.top_k = top_k if top_k is not None else settings.compare_llm_top_k
+        self.price_weight = (
+            price_weight if price_weight is not None else settings.relevance_price_weight
+        )
+        self.dims = dims if dims is not None else settings.relevance_feature_dims
+
+    def rank(
+        self,
+        current: ProductInfo,
+        alternatives: list[ProductAlternative],
+    ) -> list[tuple[ProductAlternative, float]]:
+        """
+        Score every alternative against the current product.
+
+        Args:
+            current: The product being viewed
+            alternatives: Alternatives to score
+
+        Returns:
+            (alternative, relevance) pairs, most relevant first
+        """
+        query = hashed_features(f"{current.brand} {current.name} {current.category}", self.dims)
+        scored = []
+        for alt in alternatives:
+            similarity = cosine(query, hashed_features(alt.name, self.dims))
+            proximity = price_proximity(alt.price, current.price)
+            relevance = (1 - self.price_weight) * similarity + self.price_weight * proximity
+            scored.append((alt, round(relevance, 4)))
+
+        # Stable sort keeps source order between equally relevant alternatives
+        return sorted(scored, key=lambda pair: pair[1], reverse=True)
+
+    def select(
+        self,
+        current: ProductInfo,
+        alternatives: list[ProductAlternative],
+    ) -> tuple[list[ProductAlternative], list[ProductAlternative]]:
+        """
+        Pick the top-k most comparable alternatives.
+
+        A top_k of 0 selects everything.
+
+        Returns:
+            Every alternative with its relevance set, in the original order,
+            and the selected subset, also in the original order
+        """
+        ranked = self.rank(current, alternatives)
+        kept = ranked[: self.top_k] if self.top_k > 0 else ranked
+        keep = {id(alt) for alt, _ in kept}
+        relevance = {id(alt): score for alt, score in ranked}
+
+        annotated, selected = [], []
+        for alt in alternatives:
+            scored = alt.model_copy(update={"relevance": relevance[id(alt)]})
+            annotated.append(scored)
+            if id(alt) in keep:
+                selected.append(scored)
+        return annotated, selected
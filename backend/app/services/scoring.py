@@ -0,0 +1,115 @@
+from typing import Optional
+
+from ..config import get_settings
+from ..models import ProductAlternative, ProductInfo, ValueScore
+
+settings = get_settings()
+
+
+class ValueScorer:
+    """Deterministic value metrics for a product and its alternatives."""
+
+    def __init__(
+        self,
+        prior_reviews: Optional[int] = None,
+        default_reviews: Optional[int] = None,
+        rating_weight: Optional[float] = None,
+    ):
+        self.prior_reviews = (
+            prior_reviews if prior_reviews is not None else settings.scoring_prior_reviews
+        )
+        self.default_reviews = (
+            default_reviews if default_reviews is not None else settings.scoring_default_reviews
+        )
+        self.rating_weight = (
+            rating_weight if rating_weight is not None else settings.scoring_rating_weight
+        )
+        if self.prior_reviews < 0:
+            raise ValueError("prior_reviews must be >= 0")
+
+    def score(
+        self,
+        current: ProductInfo,
+        alternatives: list[ProductAlternative],
+    ) -> list[ValueScore]:
+        """
+        Score the current product and every alternative.
+
+        Ratings are shrunk toward the group mean by review volume (a Bayesian
+        average), prices are ranked as percentiles, and the two are blended
+        into a 0-1 value score. Products are returned best value first.
+
+        Args:
+            current: The product being viewed
+            alternatives: Alternatives to compare against
+
+        Returns:
+            One ValueScore per product, ranked by value score
+        """
+        names = [current.name] + [alt.name for alt in alternatives]
+        prices = [current.price] + [alt.price for alt in alternatives]
+        ratings = [current.rating] + [alt.rating for alt in alternatives]
+        reviews = [current.review_count] + [alt.review_count for alt in alternatives]
+
+        rated = [r for r in ratings if r is not None]
+        mean_rating = sum(rated) / len(rated) if rated else None
+        m = self.prior_reviews
+
+        def bayesian(r: float, v: int) -> float:
+            v = max(v, 0)
+            # With no prior and no reviews there is nothing to weigh
+            if v + m == 0:
+                return r
+            return (v * r + m * mean_rating) / (v + m)
+
+        adjusted = [
+            None if r is None else bayesian(r, v)
+            for r, v in zip(
+                ratings,
+                (n if n is not None else self.default_reviews for n in reviews),
+                strict=True,
+            )
+        ]
+
+        priced = sorted(p for p in prices if p is not None and p > 0)
+        percentiles = [
+            None
+            if p is None or p <= 0
+            # Share of priced products at or below this price; 1.0 = most expensive
+            else sum(1 for q in priced if q <= p) / len(priced)
+            for p in prices
+        ]
+
+        current_price = current.price if current.price and current.price > 0 else None
+        scores = []
+        for i, name in enumerate(names):
+            price, adj, pct = prices[i], adjusted[i], percentiles[i]
+            rating_part = adj / 5 if adj is not None else 0.5
+            price_part = 1 - pct + 1 / len(priced) if pct is not None else 0.5
+            value = self.rating_weight * rating_part + (1 - self.rating_weight) * price_part
+
+            scores.append(
+                ValueScore(
+                    name=name,
+                    is_current=i == 0,
+                    price=price,
+                    rating=ratings[i],
+                    review_count=reviews[i],
+                    adjusted_rating=round(adj, 3) if adj is not None else None,
+                    price_percentile=round(pct, 3) if pct is not None else None,
+                    price_per_rating_point=(
+                        round(price / adj, 2) if price and adj else None
+                    ),
+                    relative_savings=(
+                        round((current_price - price) / current_price, 3)
+                        if current_price and price and i > 0
+                        else None
+                    ),
+                    value_score=round(value, 4),
+                )
+            )
+
+        ranked = sorted(scores, key=lambda s: s.value_score, reverse=True)
+        for rank, item in enumerate(ranked, 1):
+            item.rank = rank
+        return ranked
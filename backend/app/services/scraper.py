@@ -1,15 +1,25 @@
 import re
 import asyncio
-from typing import Optional
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, Callable, Optional
 from urllib.parse import quote_plus
-from playwright.async_api import async_playwright, Page, Browser
 from bs4 import BeautifulSoup
 
 from ..config import get_settings
 from ..models import ProductAlternative
+from . import deadline
+from .browser_pool import get_browser_pool
+from .cancellation import get_cancellation_counters
+from .content_extractor import ContentExtractor
+from .dedup import AlternativeDeduplicator
+from .tracing import span
+
+if TYPE_CHECKING:
+    from playwright.async_api import BrowserContext
 
 settings = get_settings()
 
+SourceCallback = Callable[[str, list[ProductAlternative]], Awaitable[None]]
+
 
 class ScraperService:
     """Service for scraping product information from the web."""
@@ -17,22 +27,24 @@ class ScraperService:
     def __init__(self):
         self.headless = settings.scraper_headless
         self.timeout = settings.scraper_timeout
+        self.selector_timeout = settings.scraper_selector_timeout
         self.max_pages = settings.scraper_max_pages
+        self.google_shopping_base_url = settings.google_shopping_base_url.rstrip("/")
+        self.amazon_base_url = settings.amazon_base_url.rstrip("/")
+        self.deduplicator = AlternativeDeduplicator()
+        self.content_extractor = ContentExtractor()
 
-    async def _get_browser(self) -> Browser:
-        """Get a Playwright browser instance."""
-        playwright = await async_playwright().start()
-        browser = await playwright.chromium.launch(
-            headless=self.headless,
-            args=["--no-sandbox", "--disable-setuid-sandbox"],
-        )
-        return browser
+    async def _get_browser(self) -> "BrowserContext":
+        """Get an isolated browser context from the shared browser pool."""
+        with span("browser.context"):
+            return await get_browser_pool().new_context()
 
     async def search_product_alternatives(
         self,
         query: str,
         current_product_name: str,
         max_results: int = 5,
+        on_results: Optional[SourceCallback] = None,
     ) -> list[ProductAlternative]:
         """
         Search for product alternatives across multiple sources.
@@ -41,19 +53,34 @@ class ScraperService:
             query: Search query for finding alternatives
             current_product_name: Name of the current product (to exclude)
             max_results: Maximum number of alternatives to return
+            on_results: Optional callback awaited with (source, results) as
+                each source finishes
 
         Returns:
             List of alternative products found
         """
         alternatives: list[ProductAlternative] = []
 
+        async def run_source(source: str, search) -> list[ProductAlternative]:
+            results = await search
+            if on_results:
+                await on_results(source, results)
+            return results
+
+        browser = None
         try:
             browser = await self._get_browser()
 
             # Search multiple sources in parallel
             tasks = [
-                self._search_google_shopping(browser, query, current_product_name),
-                self._search_amazon(browser, query, current_product_name),
+                run_source(
+                    "Google Shopping",
+                    self._search_google_shopping(browser, query, current_product_name),
+                ),
+                run_source(
+                    "Amazon",
+                    self._search_amazon(browser, query, current_product_name),
+                ),
             ]
 
             results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -62,25 +89,81 @@ class ScraperService:
                 if isinstance(result, list):
                     alternatives.extend(result)
 
-            await browser.close()
+        except asyncio.CancelledError:
+            get_cancellation_counters().scrapes += 1
+            raise
 
         except Exception as e:
             print(f"Scraping error: {e}")
 
-        # Remove duplicates and limit results
-        seen_names = set()
-        unique_alternatives = []
-        for alt in alternatives:
-            name_lower = alt.name.lower()
-            if name_lower not in seen_names and current_product_name.lower() not in name_lower:
-                seen_names.add(name_lower)
-                unique_alternatives.append(alt)
+        finally:
+            # The pooled browser outlives the request; its context must not
+            if browser:
+                await browser.close()
+
+        # Merge near-duplicates across sources and limit results
+        unique_alternatives = self.deduplicator.deduplicate(
+            alternatives, current_product_name
+        )
 
         return unique_alternatives[:max_results]
 
+    async def stream_product_alternatives(
+        self,
+        query: str,
+        current_product_name: str,
+        max_results: int = 5,
+    ) -> AsyncIterator[tuple[str, list[ProductAlternative]]]:
+        """
+        Search for product alternatives, yielding each source's results as they arrive.
+
+        Args:
+            query: Search query for finding alternatives
+            current_product_name: Name of the current product (to exclude)
+            max_results: Maximum number of alternatives to yield in total
+
+        Yields:
+            (source, alternatives) with near-duplicates of earlier results removed
+        """
+        browser = await self._get_browser()
+        searches = {
+            asyncio.create_task(
+                self._search_google_shopping(browser, query, current_product_name)
+            ): "Google Shopping",
+            asyncio.create_task(
+                self._search_amazon(browser, query, current_product_name)
+            ): "Amazon",
+        }
+        emitted: list[ProductAlternative] = []
+
+        try:
+            pending = set(searches)
+            while pending and len(emitted) < max_results:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception():
+                        print(f"{searches[task]} search error: {task.exception()}")
+                        continue
+                    fresh = self.deduplicator.filter_new(
+                        emitted, task.result(), current_product_name
+                    )[: max_results - len(emitted)]
+                    emitted.extend(fresh)
+                    yield searches[task], fresh
+
+        except asyncio.CancelledError:
+            get_cancellation_counters().scrapes += 1
+            raise
+
+        finally:
+            # Runs on normal exit and when the consumer stops early
+            for task in searches:
+                task.cancel()
+            await asyncio.gather(*searches, return_exceptions=True)
+            await browser.close()
+
     async def _search_google_shopping(
         self,
-        browser: Browser,
+        browser: "BrowserContext",
         query: str,
         exclude_name: str,
     ) -> list[ProductAlternative]:
@@ -92,66 +175,20 @@ class ScraperService:
             await page.set_viewport_size({"width": 1280, "height": 800})
 
             # Navigate to Google Shopping
-            search_url = f"https://www.google.com/search?q={quote_plus(query)}&tbm=shop"
-            await page.goto(search_url, timeout=self.timeout)
+            search_url = f"{self.google_shopping_base_url}/search?q={quote_plus(query)}&tbm=shop"
+            with span("scrape.google_shopping.navigate"):
+                await page.goto(search_url, timeout=deadline.budget_ms(self.timeout))
 
             # Wait for results
-            await page.wait_for_selector(".sh-dgr__grid-result", timeout=10000)
+            with span("scrape.google_shopping.wait_selector"):
+                await page.wait_for_selector(
+                    ".sh-dgr__grid-result", timeout=deadline.budget_ms(self.selector_timeout)
+                )
 
             # Get page content
             html = await page.content()
-            soup = BeautifulSoup(html, "html.parser")
-
-            # Parse product cards
-            products = soup.select(".sh-dgr__grid-result")[:5]
-
-            for product in products:
-                try:
-                    # Extract name
-                    name_elem = product.select_one("h3, .tAxDx")
-                    name = name_elem.get_text(strip=True) if name_elem else None
-
-                    if not name or exclude_name.lower() in name.lower():
-                        continue
-
-                    # Extract price
-                    price_elem = product.select_one(".a8Pemb, .kHxwFf")
-                    price_text = price_elem.get_text(strip=True) if price_elem else ""
-                    price = self._parse_price(price_text)
-
-                    # Extract image
-                    img_elem = product.select_one("img")
-                    image = img_elem.get("src") if img_elem else None
-
-                    # Extract link
-                    link_elem = product.select_one("a")
-                    url = link_elem.get("href", "") if link_elem else ""
-                    if url.startswith("/"):
-                        url = f"https://www.google.com{url}"
-
-                    # Extract rating
-                    rating_elem = product.select_one(".Rsc7Yb")
-                    rating = None
-                    if rating_elem:
-                        rating_text = rating_elem.get_text(strip=True)
-                        rating_match = re.search(r"(\d+\.?\d*)", rating_text)
-                        if rating_match:
-                            rating = float(rating_match.group(1))
-
-                    alternatives.append(
-                        ProductAlternative(
-                            name=name,
-                            price=price,
-                            currency="USD",
-                            url=url,
-                            image=image,
-                            rating=rating,
-                            source="Google Shopping",
-                        )
-                    )
-
-                except Exception:
-                    continue
+            with span("scrape.google_shopping.parse"):
+                alternatives = self._parse_google_shopping_results(html, exclude_name)
 
             await page.close()
 
@@ -162,7 +199,7 @@ class ScraperService:
 
     async def _search_amazon(
         self,
-        browser: Browser,
+        browser: "BrowserContext",
         query: str,
         exclude_name: str,
     ) -> list[ProductAlternative]:
@@ -174,70 +211,158 @@ class ScraperService:
             await page.set_viewport_size({"width": 1280, "height": 800})
 
             # Navigate to Amazon search
-            search_url = f"https://www.amazon.com/s?k={quote_plus(query)}"
-            await page.goto(search_url, timeout=self.timeout)
+            search_url = f"{self.amazon_base_url}/s?k={quote_plus(query)}"
+            with span("scrape.amazon.navigate"):
+                await page.goto(search_url, timeout=deadline.budget_ms(self.timeout))
 
             # Wait for results
-            await page.wait_for_selector('[data-component-type="s-search-result"]', timeout=10000)
+            with span("scrape.amazon.wait_selector"):
+                await page.wait_for_selector(
+                    '[data-component-type="s-search-result"]',
+                    timeout=deadline.budget_ms(self.selector_timeout),
+                )
 
             # Get page content
             html = await page.content()
-            soup = BeautifulSoup(html, "html.parser")
+            with span("scrape.amazon.parse"):
+                alternatives = self._parse_amazon_results(html, exclude_name)
+
+            await page.close()
+
+        except Exception as e:
+            print(f"Amazon search error: {e}")
 
-            # Parse product cards
-            products = soup.select('[data-component-type="s-search-result"]')[:5]
+        return alternatives
 
-            for product in products:
-                try:
-                    # Extract name
-                    name_elem = product.select_one("h2 a span, .a-text-normal")
-                    name = name_elem.get_text(strip=True) if name_elem else None
+    def _parse_google_shopping_results(
+        self,
+        html: str,
+        exclude_name: str,
+    ) -> list[ProductAlternative]:
+        """Parse product cards from a Google Shopping results page."""
+        alternatives = []
+        soup = BeautifulSoup(html, "html.parser")
 
-                    if not name or exclude_name.lower() in name.lower():
-                        continue
+        # Parse product cards
+        products = soup.select(".sh-dgr__grid-result")[:5]
 
-                    # Extract price
-                    price_elem = product.select_one(".a-price .a-offscreen")
-                    price_text = price_elem.get_text(strip=True) if price_elem else ""
-                    price = self._parse_price(price_text)
-
-                    # Extract image
-                    img_elem = product.select_one(".s-image")
-                    image = img_elem.get("src") if img_elem else None
-
-                    # Extract link
-                    link_elem = product.select_one("h2 a")
-                    href = link_elem.get("href", "") if link_elem else ""
-                    url = f"https://www.amazon.com{href}" if href else ""
-
-                    # Extract rating
-                    rating_elem = product.select_one(".a-icon-star-small .a-icon-alt")
-                    rating = None
-                    if rating_elem:
-                        rating_text = rating_elem.get_text(strip=True)
-                        rating_match = re.search(r"(\d+\.?\d*)", rating_text)
-                        if rating_match:
-                            rating = float(rating_match.group(1))
-
-                    alternatives.append(
-                        ProductAlternative(
-                            name=name[:100],  # Truncate long names
-                            price=price,
-                            currency="USD",
-                            url=url,
-                            image=image,
-                            rating=rating,
-                            source="Amazon",
-                        )
+        for product in products:
+            try:
+                # Extract name
+                name_elem = product.select_one("h3, .tAxDx")
+                name = name_elem.get_text(strip=True) if name_elem else None
+
+                if not name or (exclude_name and exclude_name.lower() in name.lower()):
+                    continue
+
+                # Extract price
+                price_elem = product.select_one(".a8Pemb, .kHxwFf")
+                price_text = price_elem.get_text(strip=True) if price_elem else ""
+                price = self._parse_price(price_text)
+
+                # Extract image
+                img_elem = product.select_one("img")
+                image = img_elem.get("src") if img_elem else None
+
+                # Extract link
+                link_elem = product.select_one("a")
+                url = link_elem.get("href", "") if link_elem else ""
+                if url.startswith("/"):
+                    url = f"https://www.google.com{url}"
+
+                # Extract rating
+                rating_elem = product.select_one(".Rsc7Yb")
+                rating = None
+                if rating_elem:
+                    rating_text = rating_elem.get_text(strip=True)
+                    rating_match = re.search(r"(\d+\.?\d*)", rating_text)
+                    if rating_match:
+                        rating = float(rating_match.group(1))
+
+                alternatives.append(
+                    ProductAlternative(
+                        name=name,
+                        price=price,
+                        currency="USD",
+                        url=url,
+                        image=image,
+                        rating=rating,
+                        source="Google Shopping",
                     )
+                )
+
+            except Exception:
+                continue
+
+        return alternatives
+
+    def _parse_amazon_results(
+        self,
+        html: str,
+        exclude_name: str,
+    ) -> list[ProductAlternative]:
+        """Parse product cards from an Amazon search results page."""
+        alternatives = []
+        soup = BeautifulSoup(html, "html.parser")
 
-                except Exception:
+        # Parse product cards
+        products = soup.select('[data-component-type="s-search-result"]')[:5]
+
+        for product in products:
+            try:
+                # Extract name
+                name_elem = product.select_one("h2 a span, .a-text-normal")
+                name = name_elem.get_text(strip=True) if name_elem else None
+
+                if not name or (exclude_name and exclude_name.lower() in name.lower()):
                     continue
 
-            await page.close()
+                # Extract price
+                price_elem = product.select_one(".a-price .a-offscreen")
+                price_text = price_elem.get_text(strip=True) if price_elem else ""
+                price = self._parse_price(price_text)
+
+                # Extract image
+                img_elem = product.select_one(".s-image")
+                image = img_elem.get("src") if img_elem else None
+
+                # Extract link
+                link_elem = product.select_one("h2 a")
+                href = link_elem.get("href", "") if link_elem else ""
+                url = f"https://www.amazon.com{href}" if href else ""
+
+                # Extract rating
+                rating_elem = product.select_one(".a-icon-star-small .a-icon-alt")
+                rating = None
+                if rating_elem:
+                    rating_text = rating_elem.get_text(strip=True)
+                    rating_match = re.search(r"(\d+\.?\d*)", rating_text)
+                    if rating_match:
+                        rating = float(rating_match.group(1))
+
+                # Extract review count
+                reviews_elem = product.select_one(".s-underline-text")
+                review_count = None
+                if reviews_elem:
+                    reviews_match = re.search(r"[\d,]+", reviews_elem.get_text(strip=True))
+                    if reviews_match:
+                        review_count = int(reviews_match.group().replace(",", ""))
+
+                alternatives.append(
+                    ProductAlternative(
+                        name=name[:100],  # Truncate long names
+                        price=price,
+                        currency="USD",
+                        url=url,
+                        image=image,
+                        rating=rating,
+                        review_count=review_count,
+                        source="Amazon",
+                    )
+                )
 
-        except Exception as e:
-            print(f"Amazon search error: {e}")
+            except Exception:
+                continue
 
         return alternatives
 
@@ -251,44 +376,41 @@ class ScraperService:
         Returns:
             Dictionary with extracted content
         """
+        browser = None
         try:
             browser = await self._get_browser()
             page = await browser.new_page()
 
-            await page.goto(url, timeout=self.timeout)
-            await page.wait_for_load_state("domcontentloaded")
+            with span("page.navigate"):
+                await page.goto(url, timeout=deadline.budget_ms(self.timeout))
+                await page.wait_for_load_state("domcontentloaded")
 
             # Get page HTML
             html = await page.content()
-            soup = BeautifulSoup(html, "html.parser")
-
-            # Extract basic info
             title = await page.title()
 
-            # Extract meta description
-            meta_desc = soup.select_one('meta[name="description"]')
-            description = meta_desc.get("content", "") if meta_desc else ""
-
-            # Extract main text
-            for tag in soup.select("script, style, nav, header, footer, aside"):
-                tag.decompose()
-
-            main = soup.select_one("main, article, .content, #content")
-            text = main.get_text(" ", strip=True) if main else soup.body.get_text(" ", strip=True)
-
-            await page.close()
             await browser.close()
+            browser = None
+
+            # Score blocks by text/link density and keep the main content
+            with span("page.extract"):
+                content = self.content_extractor.extract(html)
 
             return {
                 "url": url,
-                "title": title,
-                "description": description,
-                "text": text[:50000],
+                "title": title or content["title"],
+                "description": content["description"],
+                "text": content["text"],
+                "paragraphs": content["paragraphs"],
             }
 
         except Exception as e:
             print(f"Page extraction error: {e}")
-            return {"url": url, "title": "", "description": "", "text": ""}
+            return {"url": url, "title": "", "description": "", "text": "", "paragraphs": []}
+
+        finally:
+            if browser:
+                await browser.close()
 
     def _parse_price(self, price_text: str) -> Optional[float]:
         """Parse price from text."""
@@ -0,0 +1,116 @@
+import hashlib
+import re
+from collections import Counter, OrderedDict
+from typing import Optional
+
+# Words only: digits are dropped so timestamps, counters and view counts
+# do not change the fingerprint
+_WORD_RE = re.compile(r"[^\W\d_]+")
+
+BITS = 64
+
+# For each bit of a byte, the byte values that have it set
+_VALUES_WITH_BIT = [tuple(v for v in range(256) if v >> bit & 1) for bit in range(8)]
+
+
+def shingles(text: str, size: int = 3) -> Counter[str]:
+    """Word n-grams of the normalized text, with their counts."""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) <= size:
+        return Counter([" ".join(words)] if words else [])
+    return Counter(" ".join(words[i : i + size]) for i in range(len(words) - size + 1))
+
+
+def simhash(text: str, size: int = 3) -> int:
+    """
+    64-bit SimHash of a text's word shingles.
+
+    Each bit is set if the shingles whose hash has that bit set outweigh
+    those that do not. Rather than visiting 64 bits per shingle, the
+    weights are summed per (byte position, byte value) and the bits are
+    read from those 8 x 256 totals at the end.
+    """
+    byte_weights = [[0] * 256 for _ in range(BITS // 8)]
+    total = 0
+    for gram, weight in shingles(text, size).items():
+        digest = hashlib.blake2b(gram.encode("utf-8"), digest_size=BITS // 8).digest()
+        for position, value in enumerate(digest):
+            byte_weights[position][value] += weight
+        total += weight
+
+    fingerprint = 0
+    for position, weights in enumerate(byte_weights):
+        for bit, values in enumerate(_VALUES_WITH_BIT):
+            if 2 * sum(weights[v] for v in values) > total:
+                fingerprint |= 1 << (position * 8 + bit)
+    return fingerprint
+
+
+def max_distance_for(threshold: float) -> int:
+    """Differing bits allowed for a similarity threshold (1 - distance / 64)."""
+    return max(0, min(BITS - 1, int((1 - threshold) * BITS)))
+
+
+class NearDuplicateIndex:
+    """
+    SimHash fingerprints, findable by Hamming distance.
+
+    Fingerprints are split into max_distance + 1 bands. Two fingerprints
+    within max_distance bits of each other agree exactly on at least one
+    band, so a lookup only checks entries sharing a band value: a few dict
+    lookups and popcounts, whatever the index size. Entries live in scopes
+    (e.g. per site) and the oldest are evicted beyond max_entries.
+    """
+
+    def __init__(self, max_distance: int = 3, max_entries: int = 10000):
+        self.max_distance = max_distance
+        self.max_entries = max_entries
+        bands = max_distance + 1
+        widths = [BITS // bands + (1 if i < BITS % bands else 0) for i in range(bands)]
+        self._bands: list[tuple[int, int]] = []
+        shift = 0
+        for width in widths:
+            self._bands.append((shift, (1 << width) - 1))
+            shift += width
+        self._tables: list[dict[tuple[str, int], set[int]]] = [{} for _ in self._bands]
+        self._entries: OrderedDict[tuple[str, int], str] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, scope: str, fingerprint: int, value: str) -> None:
+        """Index a fingerprint, pointing at value (e.g. a cache key)."""
+        entry = (scope, fingerprint)
+        if entry not in self._entries:
+            for table, (shift, mask) in zip(self._tables, self._bands, strict=True):
+                table.setdefault((scope, fingerprint >> shift & mask), set()).add(fingerprint)
+        self._entries[entry] = value
+        self._entries.move_to_end(entry)
+        while len(self._entries) > self.max_entries:
+            self._remove(*self._entries.popitem(last=False)[0])
+
+    def _remove(self, scope: str, fingerprint: int) -> None:
+        for table, (shift, mask) in zip(self._tables, self._bands, strict=True):
+            band = (scope, fingerprint >> shift & mask)
+            candidates = table.get(band)
+            if candidates is not None:
+                candidates.discard(fingerprint)
+                if not candidates:
+                    del table[band]
+
+    def find(self, scope: str, fingerprint: int) -> Optional[tuple[str, int]]:
+        """
+        The closest indexed entry within max_distance bits.
+
+        Returns:
+            (value, distance), or None if there is none
+        """
+        best: Optional[tuple[int, int]] = None
+        for table, (shift, mask) in zip(self._tables, self._bands, strict=True):
+            for candidate in table.get((scope, fingerprint >> shift & mask), ()):
+                distance = (candidate ^ fingerprint).bit_count()
+                if distance <= self.max_distance and (best is None or distance < best[0]):
+                    best = (distance, candidate)
+        if best is None:
+            return None
+        return self._entries[(scope, best[1])], best[0]
@@ -0,0 +1,257 @@
+import re
+from functools import lru_cache
+from typing import Optional
+from bs4 import BeautifulSoup
+
+from ..models import ProductInfo
+from .parser_registry import ParserRegistry, Selectors, SiteParser
+
+
+def parse_price(price_text: str) -> Optional[float]:
+    """Parse price from text."""
+    if not price_text:
+        return None
+
+    # Remove currency symbols and extract number
+    match = re.search(r"[\d,]+\.?\d*", price_text.replace(",", ""))
+    if match:
+        try:
+            return float(match.group())
+        except ValueError:
+            pass
+
+    return None
+
+
+AMAZON_DOMAINS = [
+    "amazon.com", "amazon.ca", "amazon.com.mx", "amazon.com.br", "amazon.co.uk",
+    "amazon.de", "amazon.fr", "amazon.it", "amazon.es", "amazon.nl", "amazon.se",
+    "amazon.pl", "amazon.in", "amazon.co.jp", "amazon.com.au", "amazon.sg",
+    "amazon.ae", "amazon.sa", "amazon.com.tr",
+]
+
+AMAZON_SELECTORS = {
+    "name": "#productTitle",
+    "price": ".a-price .a-offscreen, #priceblock_ourprice, #priceblock_dealprice",
+    "rating": "#acrPopover, .a-icon-star",
+    "review_count": "#acrCustomerReviewText",
+    "brand": "#bylineInfo, .po-brand .a-span9",
+    "images": "#imgTagWrapperId img, #landingImage",
+    "description": "#productDescription, #feature-bullets",
+    "availability": "#availability",
+}
+
+
+def parse_amazon(soup: BeautifulSoup, sel: Selectors) -> Optional[ProductInfo]:
+    """Parse Amazon product page."""
+    # Name
+    name_elem = sel["name"].select_one(soup)
+    name = name_elem.get_text(strip=True) if name_elem else "Unknown"
+
+    # Price
+    price = None
+    price_elem = sel["price"].select_one(soup)
+    if price_elem:
+        price = parse_price(price_elem.get_text(strip=True))
+
+    # Rating
+    rating = None
+    rating_elem = sel["rating"].select_one(soup)
+    if rating_elem:
+        rating_text = rating_elem.get("title", "") or rating_elem.get_text()
+        match = re.search(r"(\d+\.?\d*)", rating_text)
+        if match:
+            rating = float(match.group(1))
+
+    # Review count
+    review_count = None
+    review_elem = sel["review_count"].select_one(soup)
+    if review_elem:
+        match = re.search(r"([\d,]+)", review_elem.get_text())
+        if match:
+            review_count = int(match.group(1).replace(",", ""))
+
+    # Brand
+    brand = ""
+    brand_elem = sel["brand"].select_one(soup)
+    if brand_elem:
+        brand = brand_elem.get_text(strip=True).replace("Visit the ", "").replace(" Store", "")
+
+    # Images
+    images = []
+    for img in sel["images"].select(soup):
+        src = img.get("src") or img.get("data-old-hires")
+        if src:
+            images.append(src)
+
+    # Description
+    description = ""
+    desc_elem = sel["description"].select_one(soup)
+    if desc_elem:
+        description = desc_elem.get_text(" ", strip=True)[:2000]
+
+    # Availability
+    availability = "unknown"
+    avail_elem = sel["availability"].select_one(soup)
+    if avail_elem:
+        avail_text = avail_elem.get_text().lower()
+        if "in stock" in avail_text:
+            availability = "in_stock"
+        elif "out of stock" in avail_text:
+            availability = "out_of_stock"
+
+    return ProductInfo(
+        name=name,
+        price=price,
+        currency="USD",
+        images=images[:5],
+        description=description,
+        rating=rating,
+        review_count=review_count,
+        availability=availability,
+        brand=brand,
+        category="",
+    )
+
+
+EBAY_DOMAINS = [
+    "ebay.com", "ebay.ca", "ebay.co.uk", "ebay.de", "ebay.fr", "ebay.it",
+    "ebay.es", "ebay.com.au", "ebay.ie", "ebay.at", "ebay.ch", "ebay.nl",
+]
+
+EBAY_SELECTORS = {
+    "name": "h1.x-item-title__mainTitle",
+    "price": ".x-price-primary .ux-textspans",
+    "images": ".ux-image-carousel-item img",
+}
+
+
+def parse_ebay(soup: BeautifulSoup, sel: Selectors) -> Optional[ProductInfo]:
+    """Parse eBay product page."""
+    # Name
+    name_elem = sel["name"].select_one(soup)
+    name = name_elem.get_text(strip=True) if name_elem else "Unknown"
+
+    # Price
+    price = None
+    price_elem = sel["price"].select_one(soup)
+    if price_elem:
+        price = parse_price(price_elem.get_text(strip=True))
+
+    # Images
+    images = []
+    for img in sel["images"].select(soup):
+        src = img.get("src")
+        if src:
+            images.append(src)
+
+    return ProductInfo(
+        name=name,
+        price=price,
+        currency="USD",
+        images=images[:5],
+        description="",
+        rating=None,
+        review_count=None,
+        availability="unknown",
+        brand="",
+        category="",
+    )
+
+
+GENERIC_SELECTORS = {
+    "schema": '[itemtype*="schema.org/Product"]',
+    "schema_name": '[itemprop="name"]',
+    "schema_price": '[itemprop="price"]',
+    "schema_image": '[itemprop="image"]',
+    "schema_description": '[itemprop="description"]',
+    "schema_rating": '[itemprop="ratingValue"]',
+    "schema_brand": '[itemprop="brand"]',
+    "name": "h1, .product-title, .product-name",
+    "price": ".price, .product-price, [class*='price']",
+}
+
+
+def parse_generic(soup: BeautifulSoup, sel: Selectors) -> Optional[ProductInfo]:
+    """Parse generic product page using schema.org markup."""
+    # Try to find schema.org Product markup
+    product_schema = sel["schema"].select_one(soup)
+
+    if product_schema:
+        name_elem = sel["schema_name"].select_one(product_schema)
+        price_elem = sel["schema_price"].select_one(product_schema)
+        image_elem = sel["schema_image"].select_one(product_schema)
+        desc_elem = sel["schema_description"].select_one(product_schema)
+        rating_elem = sel["schema_rating"].select_one(product_schema)
+        brand_elem = sel["schema_brand"].select_one(product_schema)
+
+        name = name_elem.get_text(strip=True) if name_elem else "Unknown"
+        price = None
+        if price_elem:
+            price_content = price_elem.get("content") or price_elem.get_text()
+            price = parse_price(price_content)
+
+        images = []
+        if image_elem:
+            src = image_elem.get("src") or image_elem.get("content")
+            if src:
+                images.append(src)
+
+        description = desc_elem.get_text(strip=True)[:2000] if desc_elem else ""
+
+        rating = None
+        if rating_elem:
+            rating_content = rating_elem.get("content") or rating_elem.get_text()
+            match = re.search(r"(\d+\.?\d*)", rating_content)
+            if match:
+                rating = float(match.group(1))
+
+        brand = ""
+        if brand_elem:
+            brand = brand_elem.get_text(strip=True)
+
+        return ProductInfo(
+            name=name,
+            price=price,
+            currency="USD",
+            images=images,
+            description=description,
+            rating=rating,
+            review_count=None,
+            availability="unknown",
+            brand=brand,
+            category="",
+        )
+
+    # Fallback to generic extraction
+    name_elem = sel["name"].select_one(soup)
+    name = name_elem.get_text(strip=True) if name_elem else "Unknown Product"
+
+    price_elem = sel["price"].select_one(soup)
+    price = None
+    if price_elem:
+        price = parse_price(price_elem.get_text())
+
+    return ProductInfo(
+        name=name,
+        price=price,
+        currency="USD",
+        images=[],
+        description="",
+        rating=None,
+        review_count=None,
+        availability="unknown",
+        brand="",
+        category="",
+    )
+
+
+@lru_cache()
+def get_parser_registry() -> ParserRegistry:
+    """Get the shared parser registry with the built-in site parsers."""
+    registry = ParserRegistry(
+        fallback=SiteParser("generic", [], GENERIC_SELECTORS, parse_generic)
+    )
+    registry.register(SiteParser("amazon", AMAZON_DOMAINS, AMAZON_SELECTORS, parse_amazon))
+    registry.register(SiteParser("ebay", EBAY_DOMAINS, EBAY_SELECTORS, parse_ebay))
+    return registry
@@ -0,0 +1,242 @@
+"""Fast extraction of schema.org Product data from raw HTML.
+
+Scans the page text with regular expressions instead of building a DOM, so
+pages that publish JSON-LD or microdata never need a full parse.
+"""
+
+import html as html_lib
+import json
+import re
+from typing import Any, Optional
+
+from ..models import ProductInfo
+
+_JSONLD_RE = re.compile(
+    r"<script\b[^>]*\btype\s*=\s*[\"']?application/ld\+json[\"']?[^>]*>(.*?)</script\s*>",
+    re.I | re.S,
+)
+_PRODUCT_SCOPE_RE = re.compile(
+    r"<([a-z][a-z0-9]*)\b[^>]*\bitemtype\s*=\s*[\"'][^\"']*schema\.org/Product[\"'][^>]*>",
+    re.I,
+)
+_ITEMPROP_RE = re.compile(
+    r"<([a-z][a-z0-9]*)\b([^>]*\bitemprop\s*=\s*[\"']([^\"']+)[\"'][^>]*)>([^<]*)",
+    re.I,
+)
+_ATTR_RE = re.compile(r"(?<![-\w])(content|src|href|datetime)\s*=\s*[\"']([^\"']*)[\"']", re.I)
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+_TAG_RE = re.compile(r"<[^>]+>")
+
+_AVAILABILITY = {
+    "instock": "in_stock",
+    "instoreonly": "in_stock",
+    "onlineonly": "in_stock",
+    "limitedavailability": "in_stock",
+    "outofstock": "out_of_stock",
+    "soldout": "out_of_stock",
+    "discontinued": "out_of_stock",
+    "preorder": "pre_order",
+    "backorder": "pre_order",
+}
+
+
+def _to_float(value: Any) -> Optional[float]:
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        match = _NUMBER_RE.search(value.replace(",", ""))
+        if match:
+            return float(match.group())
+    return None
+
+
+def _to_int(value: Any) -> Optional[int]:
+    number = _to_float(value)
+    return int(number) if number is not None else None
+
+
+def _text(value: Any) -> str:
+    """Plain text from a JSON-LD value that may be a string, list or node."""
+    if isinstance(value, list):
+        value = value[0] if value else ""
+    if isinstance(value, dict):
+        value = value.get("name") or value.get("@id") or ""
+    if not isinstance(value, str):
+        return ""
+    return " ".join(html_lib.unescape(_TAG_RE.sub(" ", value)).split())
+
+
+def _availability(value: Any) -> str:
+    key = _text(value).rsplit("/", 1)[-1].replace("_", "").lower()
+    return _AVAILABILITY.get(key, "unknown")
+
+
+def _images(value: Any) -> list[str]:
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, dict):
+        url = value.get("url") or value.get("contentUrl")
+        return [url] if isinstance(url, str) else []
+    if isinstance(value, list):
+        images = []
+        for item in value:
+            images.extend(_images(item))
+        return images
+    return []
+
+
+def _is_product(node: dict) -> bool:
+    types = node.get("@type")
+    if isinstance(types, str):
+        types = [types]
+    return isinstance(types, list) and any(
+        t in ("Product", "ProductGroup", "IndividualProduct") for t in types
+    )
+
+
+def _find_product(data: Any) -> Optional[dict]:
+    """Depth-first search for the first Product node in a JSON-LD document."""
+    if isinstance(data, list):
+        for item in data:
+            found = _find_product(item)
+            if found:
+                return found
+    elif isinstance(data, dict):
+        if _is_product(data):
+            return data
+        for key in ("@graph", "mainEntity", "itemListElement", "item"):
+            if key in data:
+                found = _find_product(data[key])
+                if found:
+                    return found
+    return None
+
+
+def _product_from_jsonld(node: dict) -> ProductInfo:
+    offers = node.get("offers") or {}
+    if isinstance(offers, list):
+        offers = offers[0] if offers else {}
+    if not isinstance(offers, dict):
+        offers = {}
+    price = _to_float(offers.get("price"))
+    if price is None:
+        price = _to_float(offers.get("lowPrice"))
+    if price is None and isinstance(offers.get("priceSpecification"), dict):
+        price = _to_float(offers["priceSpecification"].get("price"))
+
+    rating = node.get("aggregateRating") or {}
+    if not isinstance(rating, dict):
+        rating = {}
+    review_count = rating.get("reviewCount") or rating.get("ratingCount")
+
+    return ProductInfo(
+        name=_text(node.get("name")) or "Unknown",
+        price=price,
+        currency=_text(offers.get("priceCurrency")) or "USD",
+        images=_images(node.get("image"))[:5],
+        description=_text(node.get("description"))[:2000],
+        rating=_to_float(rating.get("ratingValue")),
+        review_count=_to_int(review_count),
+        availability=_availability(offers.get("availability")),
+        brand=_text(node.get("brand")),
+        category=_text(node.get("category")),
+    )
+
+
+def extract_jsonld_product(html: str) -> Optional[ProductInfo]:
+    """Extract a Product from the page's JSON-LD blocks, if any."""
+    for match in _JSONLD_RE.finditer(html):
+        raw = match.group(1).strip()
+        if not raw:
+            continue
+        try:
+            data = json.loads(raw)
+        except json.JSONDecodeError:
+            # Some shops emit control characters inside strings.
+            try:
+                data = json.loads(raw, strict=False)
+            except json.JSONDecodeError:
+                continue
+        node = _find_product(data)
+        if node:
+            return _product_from_jsonld(node)
+    return None
+
+
+def _element_end(html: str, tag: str, start: int) -> int:
+    """Offset of the closing tag for an element opened just before start."""
+    depth = 1
+    for match in re.finditer(rf"<(/?){tag}\b[^>]*>", html[start:], re.I):
+        if match.group(1):
+            depth -= 1
+            if depth == 0:
+                return start + match.start()
+        elif not match.group(0).endswith("/>"):
+            depth += 1
+    return len(html)
+
+
+def extract_microdata_product(html: str) -> Optional[ProductInfo]:
+    """Extract a Product from schema.org microdata attributes, if any."""
+    scope = _PRODUCT_SCOPE_RE.search(html)
+    if not scope:
+        return None
+
+    # Only read properties inside the Product element, not related items after it
+    end = _element_end(html, scope.group(1), scope.end())
+    props: dict[str, str] = {}
+    pending_brand = False
+    for match in _ITEMPROP_RE.finditer(html, scope.start(), end):
+        attrs = match.group(2)
+        names = match.group(3).split()
+        attr_match = _ATTR_RE.search(attrs)
+        value = attr_match.group(2) if attr_match else match.group(4)
+        value = " ".join(html_lib.unescape(value).split())
+
+        for name in names:
+            if name == "brand" and not value:
+                # Nested Brand/Organization scope; its name comes next.
+                pending_brand = True
+                continue
+            if name == "name" and pending_brand:
+                props.setdefault("brand", value)
+                pending_brand = False
+                continue
+            if value:
+                props.setdefault(name, value)
+
+    if "name" not in props:
+        return None
+
+    return ProductInfo(
+        name=props["name"],
+        price=_to_float(props.get("price") or props.get("lowPrice")),
+        currency=props.get("priceCurrency") or "USD",
+        images=[props["image"]] if props.get("image") else [],
+        description=props.get("description", "")[:2000],
+        rating=_to_float(props.get("ratingValue")),
+        review_count=_to_int(props.get("reviewCount") or props.get("ratingCount")),
+        availability=_availability(props.get("availability")),
+        brand=props.get("brand", ""),
+        category=props.get("category", ""),
+    )
+
+
+def extract_structured_product(html: str) -> Optional[ProductInfo]:
+    """
+    Extract product data from JSON-LD or microdata without parsing the DOM.
+
+    Args:
+        html: Raw page HTML
+
+    Returns:
+        ProductInfo if the page publishes a usable Product, None otherwise
+    """
+    for extract in (extract_jsonld_product, extract_microdata_product):
+        product = extract(html)
+        # Only trust the fast path when it found more than a bare name.
+        if product and product.name != "Unknown" and (
+            product.price is not None or product.rating is not None
+        ):
+            return product
+    return None
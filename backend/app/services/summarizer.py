@@ -1,5 +1,9 @@
 from ..models import PageContent, SummaryResponse, AnalyzeResponse
+from ..config import get_settings
 from .llm_service import LLMService
+from .summary_cache import get_summary_cache
+
+settings = get_settings()
 
 
 class SummarizerService:
@@ -7,6 +11,7 @@ class SummarizerService:
 
     def __init__(self):
         self.llm = LLMService()
+        self.cache = get_summary_cache() if settings.cache_enabled else None
 
     async def summarize(self, content: PageContent) -> SummaryResponse:
         """
@@ -18,14 +23,21 @@ class SummarizerService:
         Returns:
             Summary with key points, sentiment, and topics
         """
+        cached = self.cache.get("summary", content) if self.cache else None
+        if cached is not None:
+            return SummaryResponse(**cached)
+
         result = await self.llm.summarize(content.model_dump())
 
-        return SummaryResponse(
+        response = SummaryResponse(
             summary=result.get("summary", ""),
             key_points=result.get("key_points", []),
             sentiment=result.get("sentiment"),
             topics=result.get("topics", []),
         )
+        if self.cache:
+            self.cache.put("summary", content, response.model_dump())
+        return response
 
     async def analyze(self, content: PageContent) -> AnalyzeResponse:
         """
@@ -37,9 +49,13 @@ class SummarizerService:
         Returns:
             Detailed analysis including entities and questions
         """
+        cached = self.cache.get("analysis", content) if self.cache else None
+        if cached is not None:
+            return AnalyzeResponse(**cached)
+
         result = await self.llm.analyze(content.model_dump())
 
-        return AnalyzeResponse(
+        response = AnalyzeResponse(
             summary=result.get("summary", ""),
             key_points=result.get("key_points", []),
             sentiment=result.get("sentiment"),
@@ -47,3 +63,6 @@ class SummarizerService:
             entities=result.get("entities", []),
             questions=result.get("questions", []),
         )
+        if self.cache:
+            self.cache.put("analysis", content, response.model_dump())
+        return response
@@ -0,0 +1,102 @@
+from collections import Counter
+from functools import lru_cache
+from typing import Optional
+from urllib.parse import urlsplit
+
+from ..config import get_settings
+from ..models import PageContent
+from .cache import MemoryCache, make_cache
+from .page_store import content_hash
+from .simhash import NearDuplicateIndex, max_distance_for, simhash
+from .tracing import span
+
+settings = get_settings()
+
+
+class SummaryCache:
+    """
+    Summaries and analyses, reused for identical and near-identical pages.
+
+    Exact hits match the page's content hash. Near hits match a page on
+    the same host whose SimHash fingerprint is within near_dup_threshold,
+    which catches reloads that differ only by ads, timestamps, counters or
+    tracking parameters. Product pages only get exact hits: their prices
+    and stock are in the digits fingerprints ignore. The fingerprint index
+    is kept in this process even on the disk backend.
+    """
+
+    def __init__(self, backend: Optional[MemoryCache] = None):
+        self.backend = backend or make_cache("summaries", settings.summary_cache_max_entries)
+        self.ttl = settings.cache_ttl
+        self.near_dup_enabled = settings.near_dup_enabled
+        self.index = NearDuplicateIndex(
+            max_distance_for(settings.near_dup_threshold), settings.summary_cache_max_entries
+        )
+        self.counters: Counter[str] = Counter()
+
+    @staticmethod
+    def _near_dup_scope(kind: str, content: PageContent) -> Optional[str]:
+        if content.page_type == "product":
+            return None
+        host = (urlsplit(content.url).hostname or "").lower()
+        return f"{kind}:{host}"
+
+    @staticmethod
+    def _fingerprint(content: PageContent) -> int:
+        return simhash(f"{content.title}\n{content.text}")
+
+    def get(self, kind: str, content: PageContent) -> Optional[dict]:
+        """
+        A cached result for this page, or for a near-duplicate of it.
+
+        Args:
+            kind: "summary" or "analysis"
+            content: The page the result is for
+        """
+        key = f"{kind}:{content_hash(content)}"
+        value = self.backend.get(key)
+        if value is not None:
+            self.counters["exact_hits"] += 1
+            return value
+
+        scope = self._near_dup_scope(kind, content)
+        if self.near_dup_enabled and scope is not None:
+            with span("summary_cache.near_dup"):
+                match = self.index.find(scope, self._fingerprint(content))
+            value = self.backend.get(match[0]) if match else None
+            if value is not None:
+                self.counters["near_hits"] += 1
+                # Later visits to this exact page become exact hits; it is
+                # not indexed itself so matches cannot drift page by page
+                self.backend.set(key, value, self.ttl)
+                return value
+
+        self.counters["misses"] += 1
+        return None
+
+    def put(self, kind: str, content: PageContent, value: dict) -> None:
+        """Cache a freshly generated result for this page."""
+        key = f"{kind}:{content_hash(content)}"
+        self.backend.set(key, value, self.ttl)
+        scope = self._near_dup_scope(kind, content)
+        if self.near_dup_enabled and scope is not None:
+            self.index.add(scope, self._fingerprint(content), key)
+
+    def stats(self) -> dict:
+        exact, near, misses = (self.counters[k] for k in ("exact_hits", "near_hits", "misses"))
+        total = exact + near + misses
+        return {
+            "entries": self.backend.stats()["entries"],
+            "fingerprints": len(self.index),
+            "exact_hits": exact,
+            "near_hits": near,
+            "misses": misses,
+            "exact_hit_rate": round(exact / total, 4) if total else 0.0,
+            "near_hit_rate": round(near / total, 4) if total else 0.0,
+        }
+
+
+@lru_cache()
+def get_summary_cache() -> SummaryCache:
+    """Get the shared summary cache."""
+    return SummaryCache()
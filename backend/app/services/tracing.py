@@ -0,0 +1,237 @@
+import asyncio
+import json
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, ContextManager, Iterator, Optional
+
+import httpx
+
+from ..config import get_settings
+
+settings = get_settings()
+
+_trace: ContextVar[Optional["Trace"]] = ContextVar("trace", default=None)
+_parent: ContextVar[Optional[str]] = ContextVar("trace_parent_span", default=None)
+
+# Returned by span() outside a traced request: entering it costs one
+# ContextVar lookup and nothing is recorded
+_NOOP = nullcontext()
+
+
+def _random_id(num_bytes: int) -> str:
+    return os.urandom(num_bytes).hex()
+
+
+class Span:
+    """One timed stage of a request."""
+
+    __slots__ = ("name", "span_id", "parent_id", "start_ns", "duration_ns", "attributes")
+
+    def __init__(self, name: str, parent_id: Optional[str], attributes: dict[str, Any]):
+        self.name = name
+        self.span_id = _random_id(8)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.duration_ns = 0
+        self.attributes = attributes
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration_ns / 1e6
+
+
+class Trace:
+    """Spans recorded while handling one request."""
+
+    def __init__(self, name: str, traceparent: Optional[str] = None):
+        self.trace_id, remote_parent = _parse_traceparent(traceparent)
+        self.root = Span(name, remote_parent, {})
+        self.spans: list[Span] = []
+        self.closed = False
+        self._started = time.perf_counter_ns()
+
+    @contextmanager
+    def span(self, name: str, attributes: dict[str, Any]) -> Iterator[Span]:
+        span = Span(name, _parent.get() or self.root.span_id, attributes)
+        token = _parent.set(span.span_id)
+        start = time.perf_counter_ns()
+        try:
+            yield span
+        finally:
+            span.duration_ns = time.perf_counter_ns() - start
+            _parent.reset(token)
+            # Background work that outlives the request is not reported
+            if not self.closed:
+                self.spans.append(span)
+
+    def finish(self, **attributes: Any) -> None:
+        """Close the trace; spans ending after this are dropped."""
+        self.root.duration_ns = time.perf_counter_ns() - self._started
+        self.root.attributes.update(attributes)
+        self.closed = True
+
+    def server_timing(self) -> str:
+        """
+        Server-Timing header value: total time so far plus each span name.
+
+        Spans sharing a name (parallel sources, retries) are summed and
+        their count noted in desc.
+        """
+        totals: dict[str, list] = {}
+        for span in self.spans:
+            entry = totals.setdefault(span.name, [0.0, 0])
+            entry[0] += span.duration_ms
+            entry[1] += 1
+        total_ms = (time.perf_counter_ns() - self._started) / 1e6
+        parts = [f"total;dur={total_ms:.1f}"]
+        for name, (duration, count) in totals.items():
+            part = f"{name};dur={duration:.1f}"
+            if count > 1:
+                part += f';desc="x{count}"'
+            parts.append(part)
+        return ", ".join(parts)
+
+    def to_otlp(self) -> dict:
+        """The trace as an OTLP/JSON ExportTraceServiceRequest."""
+
+        def attributes(values: dict[str, Any]) -> list[dict]:
+            out = []
+            for key, value in values.items():
+                if isinstance(value, bool):
+                    out.append({"key": key, "value": {"boolValue": value}})
+                elif isinstance(value, int):
+                    out.append({"key": key, "value": {"intValue": str(value)}})
+                elif isinstance(value, float):
+                    out.append({"key": key, "value": {"doubleValue": value}})
+                else:
+                    out.append({"key": key, "value": {"stringValue": str(value)}})
+            return out
+
+        def encode(span: Span, kind: int) -> dict:
+            encoded = {
+                "traceId": self.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": kind,
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.start_ns + span.duration_ns),
+                "attributes": attributes(span.attributes),
+            }
+            if span.parent_id:
+                encoded["parentSpanId"] = span.parent_id
+            return encoded
+
+        # Kinds: 2 = SERVER for the request, 1 = INTERNAL for stages
+        spans = [encode(self.root, 2)] + [encode(span, 1) for span in self.spans]
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": attributes({"service.name": settings.app_name})
+                    },
+                    "scopeSpans": [{"scope": {"name": "app.services.tracing"}, "spans": spans}],
+                }
+            ]
+        }
+
+
+def _parse_traceparent(header: Optional[str]) -> tuple[str, Optional[str]]:
+    """Trace id and parent span id from a W3C traceparent header, or a new trace."""
+    if header:
+        parts = header.strip().split("-")
+        if len(parts) == 4 and len(parts[1]) == 32 and len(parts[2]) == 16:
+            return parts[1], parts[2]
+    return _random_id(16), None
+
+
+def span(name: str, **attributes: Any) -> ContextManager:
+    """
+    Time a stage of the current request.
+
+    Usable as a context manager around sync or async code. Outside a traced
+    request (tracing disabled, background tasks) it does nothing.
+    """
+    trace = _trace.get()
+    if trace is None or trace.closed:
+        return _NOOP
+    return trace.span(name, attributes)
+
+
+def current_trace() -> Optional[Trace]:
+    """The trace of the request being handled, if it is traced."""
+    return _trace.get()
+
+
+def start_trace(name: str, traceparent: Optional[str] = None) -> tuple[Trace, Any]:
+    """Begin tracing the current request. Returns the trace and a reset token."""
+    trace = Trace(name, traceparent)
+    return trace, _trace.set(trace)
+
+
+def end_trace(token: Any) -> None:
+    _trace.reset(token)
+
+
+class JsonlExporter:
+    """Appends each trace as one OTLP/JSON line to a local file."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def _write(self, line: str) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    async def export(self, trace: Trace) -> None:
+        await asyncio.to_thread(self._write, json.dumps(trace.to_otlp()))
+
+
+class OtlpHttpExporter:
+    """Posts each trace as OTLP/JSON to a collector (e.g. the OpenTelemetry Collector)."""
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+
+    async def export(self, trace: Trace) -> None:
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            await client.post(self.endpoint, json=trace.to_otlp())
+
+
+class TraceExporter:
+    """Ships finished traces in the background so responses never wait on it."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.exported = 0
+        self.failed = 0
+        self._tasks: set[asyncio.Task] = set()
+
+    def submit(self, trace: Trace) -> None:
+        task = asyncio.create_task(self._export(trace))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _export(self, trace: Trace) -> None:
+        try:
+            await self.backend.export(trace)
+            self.exported += 1
+        except Exception as e:
+            self.failed += 1
+            print(f"Trace export error: {e!r}")
+
+    async def shutdown(self) -> None:
+        """Wait for exports still in flight."""
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+@lru_cache()
+def get_trace_exporter() -> Optional[TraceExporter]:
+    """The configured trace exporter, or None if traces are only sent as headers."""
+    if settings.tracing_exporter == "jsonl":
+        return TraceExporter(JsonlExporter(settings.tracing_export_path))
+    if settings.tracing_exporter == "otlp":
+        return TraceExporter(OtlpHttpExporter(settings.tracing_otlp_endpoint))
+    return None
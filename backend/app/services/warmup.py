@@ -0,0 +1,159 @@
+import asyncio
+import json
+import os
+import time
+from functools import lru_cache
+from typing import Awaitable, Callable, Optional
+
+from ..config import get_settings
+from .cache import MemoryCache, get_llm_cache, get_product_cache
+from .llm_service import LLMService
+
+settings = get_settings()
+
+_PRIMING_HTML = (
+    "<html><head><title>Warmup</title>"
+    '<script type="application/ld+json">{"@type": "Product", "name": "Warmup"}</script>'
+    "</head><body><article><p>Warmup paragraph.</p></article></body></html>"
+)
+
+
+def snapshot_caches() -> dict[str, MemoryCache]:
+    """In-memory caches included in the on-disk snapshot, by name."""
+    caches = {
+        "product": get_product_cache().backend,
+        "llm": get_llm_cache(),
+    }
+    if settings.serves_scraping:
+        from .prefetch import get_prefetcher
+
+        caches["alternatives"] = get_prefetcher().cache
+    # Disk-backed caches persist on their own
+    return {name: cache for name, cache in caches.items() if isinstance(cache, MemoryCache)}
+
+
+def save_cache_snapshot(path: str) -> dict[str, int]:
+    """Write unexpired cache entries to a JSON file. Returns entries per cache."""
+    data = {name: cache.dump() for name, cache in snapshot_caches().items()}
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+    return {name: len(entries) for name, entries in data.items()}
+
+
+def load_cache_snapshot(path: str) -> dict[str, int]:
+    """Load a snapshot written by save_cache_snapshot. Returns entries loaded per cache."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return {
+        name: cache.load(data.get(name, []))
+        for name, cache in snapshot_caches().items()
+    }
+
+
+class Warmup:
+    """Startup warmup steps and the readiness they gate."""
+
+    def __init__(self):
+        self.steps: dict[str, dict] = {}
+        self.ready = False
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+
+    async def _step(
+        self,
+        name: str,
+        run: Callable[[], Awaitable[Optional[dict]]],
+        timeout: float,
+    ) -> None:
+        start = time.perf_counter()
+        self.steps[name] = {"status": "running"}
+        try:
+            detail = await asyncio.wait_for(run(), timeout)
+            self.steps[name] = {"status": "ok", **(detail or {})}
+        except Exception as e:
+            # A failed step is reported but does not hold readiness back
+            print(f"Warmup step {name} failed: {e!r}")
+            self.steps[name] = {"status": "failed", "error": repr(e)}
+        self.steps[name]["ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+    async def _prime(self) -> dict:
+        # Compiles the site parser selectors and exercises the HTML parsers
+        from .content_extractor import ContentExtractor
+        from .site_parsers import get_parser_registry
+        from .structured_data import extract_structured_product
+
+        registry = get_parser_registry()
+        ContentExtractor().extract(_PRIMING_HTML)
+        extract_structured_product(_PRIMING_HTML)
+        return {"parsers": len(registry.stats())}
+
+    async def _load_snapshot(self) -> dict:
+        path = settings.cache_snapshot_path
+        if not os.path.exists(path):
+            return {"loaded": {}}
+        return {"loaded": load_cache_snapshot(path)}
+
+    async def _launch_browsers(self) -> dict:
+        from .browser_pool import get_browser_pool
+
+        await get_browser_pool().start()
+        return {"browsers": get_browser_pool().stats()["running"]}
+
+    async def _load_model(self) -> dict:
+        await LLMService().warmup()
+        return {"model": settings.llm_model}
+
+    async def run(self) -> None:
+        """Run every warmup step concurrently, then mark the process ready."""
+        self.started_at = time.time()
+        steps = []
+        if settings.serves_scraping:
+            steps.append(self._step("prime", self._prime, settings.warmup_timeout))
+        if settings.cache_snapshot_path:
+            steps.append(self._step("cache_snapshot", self._load_snapshot, settings.warmup_timeout))
+        if settings.warmup_browsers and settings.serves_scraping:
+            steps.append(self._step("browsers", self._launch_browsers, settings.warmup_timeout))
+        if settings.warmup_llm:
+            steps.append(self._step("llm", self._load_model, settings.warmup_timeout))
+
+        await asyncio.gather(*steps)
+        self.finished_at = time.time()
+        self.ready = True
+
+    def start(self) -> asyncio.Task:
+        """Run warmup in the background; readiness flips when it finishes."""
+        self.ready = False
+        self.task = asyncio.create_task(self.run())
+        return self.task
+
+    async def shutdown(self, grace: float = 10.0) -> None:
+        """
+        Stop warmup if it is still running.
+
+        Waits up to grace seconds first: cancelling a browser launch midway
+        can orphan the Playwright driver process.
+        """
+        if self.task and not self.task.done():
+            await asyncio.wait({self.task}, timeout=grace)
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+
+    def status(self) -> dict:
+        return {
+            "ready": self.ready,
+            "steps": self.steps,
+            "duration_ms": (
+                round((self.finished_at - self.started_at) * 1000, 1)
+                if self.started_at and self.finished_at
+                else None
+            ),
+        }
+
+
+@lru_cache()
+def get_warmup() -> Warmup:
+    """Get the process warmup state."""
+    return Warmup()
@@ -0,0 +1,250 @@
+"""End-to-end load generator for the API.
+
+Sends an open-loop stream of requests to /api/summarize, /api/chat and
+/api/compare at a target rate and reports throughput and p50/p95/p99
+latency per endpoint, as JSON. Latency is measured from each request's
+scheduled send time, so a backend that falls behind is not hidden by the
+generator waiting on it.
+
+Run the backend against the stand-ins for reproducible numbers:
+
+    python -m benchmarks.mock_llm --port 11435 &
+    python -m benchmarks.mock_shop --port 8081 &
+    LLM_BASE_URL=http://127.0.0.1:11435 CACHE_ENABLED=false \\
+    GOOGLE_SHOPPING_BASE_URL=http://127.0.0.1:8081 AMAZON_BASE_URL=http://127.0.0.1:8081 \\
+    uvicorn app.main:app --port 8000 &
+
+Usage:
+    python -m benchmarks.load --rps 10 --duration 30 --output load.json
+    python -m benchmarks.load --mix chat=3 summarize=1 --baseline load.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import httpx
+
+ENDPOINTS = {
+    "summarize": "/api/summarize",
+    "chat": "/api/chat",
+    "compare": "/api/compare",
+}
+
+
+def build_payloads(shop_url: str) -> dict[str, dict]:
+    """A representative request body per endpoint."""
+    article = {
+        "url": f"{shop_url}/article/home-office",
+        "title": "Setting up a home office",
+        "description": "A guide to desks, chairs and lighting.",
+        "text": "A good home office starts with a desk at the right height. " * 40,
+        "page_type": "article",
+    }
+    product = {
+        "name": "Sony WH-1000XM5 Wireless Noise Canceling Headphones",
+        "price": 348.0,
+        "currency": "USD",
+        "rating": 4.6,
+        "review_count": 12000,
+        "brand": "Sony",
+        "category": "Headphones",
+    }
+    return {
+        "summarize": {"content": article},
+        "chat": {
+            "messages": [
+                {
+                    "id": "msg-1",
+                    "role": "user",
+                    "content": "What should I buy first?",
+                    "timestamp": "2024-01-01T00:00:00Z",
+                }
+            ],
+            "context": article,
+        },
+        "compare": {
+            "url": f"{shop_url}/dp/B09XS7JWHH",
+            "content": {
+                "url": f"{shop_url}/dp/B09XS7JWHH",
+                "title": product["name"],
+                "description": "Wireless noise canceling headphones",
+                "text": "Industry-leading noise canceling headphones.",
+                "page_type": "product",
+                "product": product,
+            },
+        },
+    }
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def schedule(mix: dict[str, int]) -> itertools.cycle:
+    """Endpoints in a repeating order that matches the mix weights."""
+    return itertools.cycle([name for name, weight in mix.items() for _ in range(weight)])
+
+
+def summarize_samples(samples: list[tuple[float, Optional[int]]], elapsed: float) -> dict:
+    """Latency percentiles and status counts for (latency, status) samples."""
+    latencies = [latency for latency, _ in samples]
+    statuses: dict[str, int] = {}
+    for _, status in samples:
+        key = str(status) if status is not None else "error"
+        statuses[key] = statuses.get(key, 0) + 1
+    ok = sum(1 for _, status in samples if status is not None and status < 400)
+    return {
+        "requests": len(samples),
+        "ok": ok,
+        "errors": len(samples) - ok,
+        "status": statuses,
+        "throughput_rps": round(ok / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 1) if latencies else None,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1) if latencies else None,
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1) if latencies else None,
+        "max_ms": round(max(latencies) * 1000, 1) if latencies else None,
+    }
+
+
+async def run(
+    base_url: str = "http://127.0.0.1:8000",
+    rps: float = 5.0,
+    duration: float = 10.0,
+    mix: Optional[dict[str, int]] = None,
+    shop_url: str = "http://127.0.0.1:8081",
+    timeout: float = 120.0,
+    client: Optional[httpx.AsyncClient] = None,
+) -> dict:
+    """Drive the API at rps for duration seconds and collect the results."""
+    mix = mix or dict.fromkeys(ENDPOINTS, 1)
+    payloads = build_payloads(shop_url)
+    samples: dict[str, list[tuple[float, Optional[int]]]] = {name: [] for name in mix}
+    owns_client = client is None
+    client = client or httpx.AsyncClient(
+        base_url=base_url,
+        timeout=timeout,
+        limits=httpx.Limits(max_connections=None, max_keepalive_connections=64),
+    )
+
+    async def send(name: str, scheduled: float) -> None:
+        status = None
+        try:
+            response = await client.post(ENDPOINTS[name], json=payloads[name])
+            status = response.status_code
+        except httpx.HTTPError:
+            pass
+        samples[name].append((time.perf_counter() - scheduled, status))
+
+    order = schedule(mix)
+    total = max(1, int(rps * duration))
+    tasks = []
+    start = time.perf_counter()
+    try:
+        for i in range(total):
+            scheduled = start + i / rps
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(send(next(order), scheduled)))
+        await asyncio.gather(*tasks)
+    finally:
+        if owns_client:
+            await client.aclose()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "benchmark": "load",
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "config": {"rps": rps, "duration": duration, "mix": mix},
+        "elapsed_s": round(elapsed, 2),
+        "results": {
+            **{name: summarize_samples(points, elapsed) for name, points in samples.items()},
+            "all": summarize_samples(
+                [point for points in samples.values() for point in points], elapsed
+            ),
+        },
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """List endpoints whose p95 latency regressed by more than the tolerance."""
+    regressions = []
+    for name, result in current["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or previous.get("p95_ms") is None or result["p95_ms"] is None:
+            continue
+        if result["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {previous['p95_ms']}ms -> {result['p95_ms']}ms")
+    return regressions
+
+
+def parse_mix(values: list[str]) -> dict[str, int]:
+    """Parse endpoint=weight pairs; a bare endpoint name has weight 1."""
+    mix = {}
+    for value in values:
+        name, _, weight = value.partition("=")
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"unknown endpoint {name!r}")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--rps", type=float, default=5.0, help="Requests started per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to send for")
+    parser.add_argument(
+        "--mix", nargs="*", default=list(ENDPOINTS), help="Endpoints as name or name=weight"
+    )
+    parser.add_argument("--shop-url", default="http://127.0.0.1:8081", help="Mock shop origin")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--output", help="Write results JSON to this file")
+    parser.add_argument("--baseline", help="Previous results JSON to compare against")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="Allowed p95 slowdown vs baseline"
+    )
+    args = parser.parse_args()
+
+    report = asyncio.run(
+        run(
+            args.base_url,
+            args.rps,
+            args.duration,
+            parse_mix(args.mix),
+            args.shop_url,
+            args.timeout,
+        )
+    )
+    output = json.dumps(report, indent=2)
+
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+    print(output)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+"""Stand-in LLM server for offline load tests.
+
+Speaks the Ollama (/api/chat, /api/tags) and OpenAI (/v1/chat/completions,
+/v1/models) protocols, streaming and non-streaming, with a configurable
+time to first token, token rate and error rate. Every prompt gets the same
+canned answer, a JSON object that parses for summarize, analyze, compare
+and chat alike.
+
+Usage:
+    python -m benchmarks.mock_llm --port 11435 --ttft 0.3 --tokens-per-sec 40
+    LLM_BASE_URL=http://127.0.0.1:11435 uvicorn app.main:app --port 8000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import AsyncIterator, Iterator, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+DEFAULT_RESPONSE = {
+    "summary": "A mock summary of the page.",
+    "key_points": ["First mock point", "Second mock point", "Third mock point"],
+    "sentiment": "neutral",
+    "topics": ["mock", "testing"],
+    "entities": ["Mock Corp"],
+    "questions": ["What does the mock server return?"],
+    "verdict": "The current product is a reasonable choice.",
+    "pros_cons_analysis": {
+        "current": {"pros": ["Solid build"], "cons": ["Price"]},
+        "alternatives": [],
+    },
+    "recommendation": "Buy the cheaper alternative if price matters most.",
+    "pros": ["Solid build"],
+    "cons": ["Price"],
+}
+
+_TOKEN_RE = re.compile(r"\S+\s*")
+
+
+class MockLLM:
+    """Timing, failure and response behaviour of the stand-in server."""
+
+    def __init__(
+        self,
+        ttft: float = 0.2,
+        tokens_per_sec: float = 50.0,
+        error_rate: float = 0.0,
+        response: Optional[str] = None,
+        model: str = "mock",
+        seed: Optional[int] = None,
+    ):
+        self.ttft = ttft
+        self.tokens_per_sec = tokens_per_sec
+        self.error_rate = error_rate
+        self.response = response if response is not None else json.dumps(DEFAULT_RESPONSE)
+        self.model = model
+        self.random = random.Random(seed)
+        self.counters = {
+            "requests": 0,
+            "streamed": 0,
+            "errors": 0,
+            "inflight": 0,
+            "peak_inflight": 0,
+        }
+
+    def tokens(self) -> list[str]:
+        """The canned response split into whitespace-delimited 'tokens'."""
+        return _TOKEN_RE.findall(self.response) or [self.response]
+
+    def should_fail(self) -> bool:
+        return self.random.random() < self.error_rate
+
+    @contextmanager
+    def inflight(self) -> Iterator[None]:
+        """Count a generation in progress, tracking the peak."""
+        self.counters["inflight"] += 1
+        self.counters["peak_inflight"] = max(
+            self.counters["peak_inflight"], self.counters["inflight"]
+        )
+        try:
+            yield
+        finally:
+            self.counters["inflight"] -= 1
+
+    async def generate(self) -> str:
+        """Wait as long as generating the whole response would take."""
+        tokens = self.tokens()
+        await asyncio.sleep(self.ttft + len(tokens) / self.tokens_per_sec)
+        return self.response
+
+    async def stream(self) -> AsyncIterator[str]:
+        """Yield tokens at the configured rate after the first-token delay."""
+        await asyncio.sleep(self.ttft)
+        for token in self.tokens():
+            yield token
+            await asyncio.sleep(1 / self.tokens_per_sec)
+
+    def stats(self) -> dict:
+        return dict(self.counters)
+
+
+def create_app(mock: MockLLM) -> FastAPI:
+    """Build the stand-in server around a MockLLM."""
+    app = FastAPI(title="Mock LLM")
+
+    def error() -> JSONResponse:
+        mock.counters["errors"] += 1
+        return JSONResponse(status_code=500, content={"error": "mock failure"})
+
+    async def tracked(body: AsyncIterator[str]) -> AsyncIterator[str]:
+        with mock.inflight():
+            async for chunk in body:
+                yield chunk
+
+    @app.get("/api/tags")
+    async def ollama_tags():
+        return {"models": [{"name": mock.model}]}
+
+    @app.get("/v1/models")
+    async def openai_models():
+        return {"object": "list", "data": [{"id": mock.model, "object": "model"}]}
+
+    @app.post("/api/chat")
+    async def ollama_chat(request: Request):
+        body = await request.json()
+        mock.counters["requests"] += 1
+        if mock.should_fail():
+            return error()
+
+        if body.get("stream", True):
+            mock.counters["streamed"] += 1
+
+            async def lines() -> AsyncIterator[str]:
+                async for token in mock.stream():
+                    message = {"role": "assistant", "content": token}
+                    yield json.dumps({"model": mock.model, "message": message, "done": False}) + "\n"
+                final = {"role": "assistant", "content": ""}
+                yield json.dumps({"model": mock.model, "message": final, "done": True}) + "\n"
+
+            return StreamingResponse(tracked(lines()), media_type="application/x-ndjson")
+
+        with mock.inflight():
+            content = await mock.generate()
+        return {
+            "model": mock.model,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "message": {"role": "assistant", "content": content},
+            "done": True,
+            "eval_count": len(mock.tokens()),
+        }
+
+    @app.post("/v1/chat/completions")
+    async def openai_chat(request: Request):
+        body = await request.json()
+        mock.counters["requests"] += 1
+        if mock.should_fail():
+            return error()
+
+        if body.get("stream", False):
+            mock.counters["streamed"] += 1
+
+            async def events() -> AsyncIterator[str]:
+                async for token in mock.stream():
+                    chunk = {
+                        "object": "chat.completion.chunk",
+                        "choices": [{"index": 0, "delta": {"content": token}}],
+                    }
+                    yield f"data: {json.dumps(chunk)}\n\n"
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(tracked(events()), media_type="text/event-stream")
+
+        with mock.inflight():
+            content = await mock.generate()
+        tokens = len(mock.tokens())
+        return {
+            "id": f"chatcmpl-mock-{mock.counters['requests']}",
+            "object": "chat.completion",
+            "model": mock.model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {"prompt_tokens": 0, "completion_tokens": tokens, "total_tokens": tokens},
+        }
+
+    @app.get("/mock/stats")
+    async def mock_stats():
+        return mock.stats()
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--ttft", type=float, default=0.2, help="Seconds to first token")
+    parser.add_argument("--tokens-per-sec", type=float, default=50.0)
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Share of requests answered with a 500"
+    )
+    parser.add_argument("--response-file", help="Return this file's contents instead of the default")
+    parser.add_argument("--model", default="mock")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    response = (
+        Path(args.response_file).read_text(encoding="utf-8") if args.response_file else None
+    )
+    mock = MockLLM(args.ttft, args.tokens_per_sec, args.error_rate, response, args.model, args.seed)
+    uvicorn.run(create_app(mock), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
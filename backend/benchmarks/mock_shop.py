@@ -0,0 +1,72 @@
+"""Stand-in shop site for offline load tests.
+
+Serves the saved HTML fixtures at the paths the scraper and product
+extractor request: Google Shopping and Amazon search results, and Amazon,
+eBay and generic product pages, after a configurable delay.
+
+Usage:
+    python -m benchmarks.mock_shop --port 8081 --latency 0.2
+    GOOGLE_SHOPPING_BASE_URL=http://127.0.0.1:8081 \\
+    AMAZON_BASE_URL=http://127.0.0.1:8081 uvicorn app.main:app --port 8000
+"""
+
+import argparse
+import asyncio
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.responses import HTMLResponse
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "html"
+
+
+def create_app(latency: float = 0.0) -> FastAPI:
+    """Build the stand-in shop, answering every page after latency seconds."""
+    app = FastAPI(title="Mock Shop")
+    pages = {path.stem: path.read_text(encoding="utf-8") for path in FIXTURES_DIR.glob("*.html")}
+
+    async def page(name: str) -> HTMLResponse:
+        await asyncio.sleep(latency)
+        return HTMLResponse(pages[name])
+
+    @app.get("/search")
+    async def google_shopping(q: str = ""):
+        return await page("google_shopping")
+
+    @app.get("/s")
+    async def amazon_search(k: str = ""):
+        return await page("amazon_search")
+
+    @app.get("/dp/{asin}")
+    async def amazon_product(asin: str):
+        return await page("amazon_product")
+
+    @app.get("/itm/{item_id}")
+    async def ebay_item(item_id: str):
+        return await page("ebay_item")
+
+    @app.get("/product/{slug}")
+    async def generic_product(slug: str):
+        return await page("generic_product")
+
+    @app.get("/article/{slug}")
+    async def article(slug: str):
+        return await page("generic_article")
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before each page")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    uvicorn.run(create_app(args.latency), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Offline parser throughput benchmark.
+
+Runs the product and search-result parsers over the saved HTML fixtures and
+reports pages/sec, p50/p99 parse time and peak memory per parser, as JSON.
+
+Usage:
+    python -m benchmarks.parsers --iterations 200 --output parsers.json
+    python -m benchmarks.parsers --baseline parsers.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+from app.services.content_extractor import ContentExtractor
+from app.services.product_extractor import ProductExtractorService
+from app.services.scraper import ScraperService
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "html"
+
+# The search fixtures are results for the Amazon product fixture.
+EXCLUDE_NAME = "Sony WH-1000XM5"
+
+
+def load_fixture(name: str) -> str:
+    """Load a saved HTML page from the fixture corpus."""
+    return (FIXTURES_DIR / name).read_text(encoding="utf-8")
+
+
+def build_cases() -> dict[str, tuple[Callable[[str], object], str]]:
+    """Map each benchmark case to its parser callable and fixture HTML."""
+    extractor = ProductExtractorService()
+    scraper = ScraperService()
+    content = ContentExtractor()
+
+    def product(url: str) -> Callable[[str], object]:
+        return lambda html: extractor._parse_product_html(html, url)
+
+    return {
+        "product.amazon": (
+            product("https://www.amazon.com/dp/B09XS7JWHH"),
+            load_fixture("amazon_product.html"),
+        ),
+        "product.ebay": (
+            product("https://www.ebay.com/itm/1234567890"),
+            load_fixture("ebay_item.html"),
+        ),
+        "product.schema_org": (
+            product("https://shop.example.com/trail-runner-3"),
+            load_fixture("schema_org_product.html"),
+        ),
+        "product.generic": (
+            product("https://makergoods.example.com/walnut-organizer"),
+            load_fixture("generic_product.html"),
+        ),
+        "search.google_shopping": (
+            lambda html: scraper._parse_google_shopping_results(html, EXCLUDE_NAME),
+            load_fixture("google_shopping.html"),
+        ),
+        "search.amazon": (
+            lambda html: scraper._parse_amazon_results(html, EXCLUDE_NAME),
+            load_fixture("amazon_search.html"),
+        ),
+        "content.article": (
+            content.extract,
+            load_fixture("generic_article.html"),
+        ),
+        "content.amazon": (
+            content.extract,
+            load_fixture("amazon_product.html"),
+        ),
+    }
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def run_case(parse: Callable[[str], object], html: str, iterations: int, warmup: int) -> dict:
+    """Time one parser over a fixture and measure its peak allocation."""
+    for _ in range(warmup):
+        parse(html)
+
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        parse(html)
+        timings.append(time.perf_counter() - start)
+
+    # Memory is measured on a separate pass since tracemalloc skews timings.
+    tracemalloc.start()
+    parse(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = sum(timings)
+    return {
+        "iterations": iterations,
+        "html_bytes": len(html.encode("utf-8")),
+        "pages_per_sec": round(iterations / total, 2) if total else None,
+        "mean_ms": round(statistics.fmean(timings) * 1000, 4),
+        "p50_ms": round(_percentile(timings, 50) * 1000, 4),
+        "p99_ms": round(_percentile(timings, 99) * 1000, 4),
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+def run(iterations: int = 100, warmup: int = 5, only: list[str] | None = None) -> dict:
+    """Run every benchmark case and collect the results."""
+    results = {}
+    for name, (parse, html) in build_cases().items():
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        results[name] = run_case(parse, html, iterations, warmup)
+
+    return {
+        "benchmark": "parsers",
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """List cases whose p50 regressed by more than the tolerance."""
+    regressions = []
+    for name, result in current["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous:
+            continue
+        if result["p50_ms"] > previous["p50_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p50 {previous['p50_ms']}ms -> {result['p50_ms']}ms"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--only", nargs="*", help="Case name prefixes to run")
+    parser.add_argument("--output", help="Write results JSON to this file")
+    parser.add_argument("--baseline", help="Previous results JSON to compare against")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="Allowed p50 slowdown vs baseline"
+    )
+    args = parser.parse_args()
+
+    report = run(args.iterations, args.warmup, args.only)
+    output = json.dumps(report, indent=2)
+
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+    print(output)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
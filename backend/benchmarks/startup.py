@@ -0,0 +1,146 @@
+"""API process startup benchmark.
+
+Imports app.main in fresh interpreters and reports import time, resident
+memory after startup and which heavy dependencies were loaded, for the full
+router set and a chat-only worker (API_ROUTES=["chat"]), as JSON.
+
+Usage:
+    python -m benchmarks.startup --repeats 5 --output startup.json
+    python -m benchmarks.startup --baseline startup.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+CONFIGS = {
+    "full": '["summarize", "analyze", "compare", "chat", "stats"]',
+    "chat_only": '["chat"]',
+}
+
+# Modules that dominate startup cost when imported
+HEAVY_MODULES = ["playwright", "bs4", "soupsieve", "app.services.scraper"]
+
+# Runs in the child interpreter; prints one JSON line
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+rss_kb = None
+try:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                rss_kb = int(line.split()[1])
+except OSError:
+    import resource
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        rss_kb //= 1024
+heavy = %r
+print(json.dumps({
+    "import_ms": elapsed * 1000,
+    "rss_kb": rss_kb,
+    "modules": len(sys.modules),
+    "loaded": [name for name in heavy if name in sys.modules],
+}))
+"""
+
+
+def probe(api_routes: str) -> dict:
+    """Import app.main once in a fresh interpreter with the given routers."""
+    env = {**os.environ, "API_ROUTES": api_routes}
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE % HEAVY_MODULES],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run_config(api_routes: str, repeats: int) -> dict:
+    """Probe one configuration repeatedly and summarize the samples."""
+    samples = [probe(api_routes) for _ in range(repeats)]
+    return {
+        "repeats": repeats,
+        "import_ms_p50": round(statistics.median(s["import_ms"] for s in samples), 1),
+        "import_ms_min": round(min(s["import_ms"] for s in samples), 1),
+        "rss_mb_p50": round(statistics.median(s["rss_kb"] for s in samples) / 1024, 1),
+        "modules": samples[-1]["modules"],
+        "heavy_modules_loaded": samples[-1]["loaded"],
+    }
+
+
+def run(repeats: int = 5, only: list[str] | None = None) -> dict:
+    """Run every configuration and collect the results."""
+    results = {}
+    for name, api_routes in CONFIGS.items():
+        if only and name not in only:
+            continue
+        results[name] = run_config(api_routes, repeats)
+
+    return {
+        "benchmark": "startup",
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """List configurations whose import time or RSS regressed beyond the tolerance."""
+    regressions = []
+    for name, result in current["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous:
+            continue
+        for metric, unit in (("import_ms_p50", "ms"), ("rss_mb_p50", "MB")):
+            if result[metric] > previous[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{name}: {metric} {previous[metric]}{unit} -> {result[metric]}{unit}"
+                )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--only", nargs="*", choices=list(CONFIGS), help="Configurations to run")
+    parser.add_argument("--output", help="Write results JSON to this file")
+    parser.add_argument("--baseline", help="Previous results JSON to compare against")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="Allowed regression vs baseline"
+    )
+    args = parser.parse_args()
+
+    report = run(args.repeats, args.only)
+    output = json.dumps(report, indent=2)
+
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+    print(output)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,9 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
@@ -93,3 +99,37 @@ def test_analyze_endpoint():
     }
     response = client.post("/api/analyze", json=payload)
     assert response.status_code in [200, 500]
+
+
+def test_stats_endpoint():
+    """Test runtime stats endpoint."""
+    response = client.get("/api/stats")
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert "amazon" in data["parsers"]
+    assert "hit_rate" in data["product_cache"]
+
+
+def test_chat_only_worker_skips_scraping_stack():
+    """A chat-only process serves chat without importing the scraper."""
+    probe = (
+        "import json, sys\n"
+        "from app.main import app\n"
+        "paths = list(app.openapi()['paths'])\n"
+        "print(json.dumps({\n"
+        "    'paths': paths,\n"
+        "    'loaded': [m for m in ('playwright', 'bs4', 'app.services.scraper') if m in sys.modules],\n"
+        "}))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=Path(__file__).resolve().parent.parent,
+        env={**os.environ, "API_ROUTES": '["chat"]'},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    assert "/api/chat" in report["paths"]
+    assert "/api/compare" not in report["paths"]
+    assert report["loaded"] == []
@@ -0,0 +1,84 @@
+import time
+
+from app.models import ProductInfo
+from app.services.cache import MemoryCache, ProductCache, canonicalize_url
+from app.services.product_extractor import ProductExtractorService
+
+
+def test_canonicalize_url_strips_tracking():
+    """Test that tracking parameters and fragments are removed."""
+    assert (
+        canonicalize_url("HTTPS://Shop.Example.com/item/42/?utm_source=x&color=red&gclid=1#reviews")
+        == "https://shop.example.com/item/42?color=red"
+    )
+    assert canonicalize_url("https://x.com/p?b=2&a=1") == canonicalize_url("https://x.com/p?a=1&b=2")
+
+
+def test_canonicalize_amazon_product_links():
+    """Test that Amazon product URL variants share one key."""
+    expected = "https://www.amazon.com/dp/B09XS7JWHH"
+    assert canonicalize_url("https://www.amazon.com/Sony-WH-1000XM5/dp/B09XS7JWHH/ref=sr_1_4?qid=1&th=1") == expected
+    assert canonicalize_url("https://www.amazon.com/gp/product/B09XS7JWHH") == expected
+
+
+def test_retailer_tracking_params_only_stripped_on_that_retailer():
+    """Test that Amazon/eBay tracking names survive on other shops."""
+    assert canonicalize_url("https://www.ebay.com/itm/123?_trksid=p1&hash=x&var=7") == (
+        "https://www.ebay.com/itm/123?var=7"
+    )
+    assert canonicalize_url("https://shop.example.com/p/42?th=1&tag=blue&ref=a&utm_medium=x") == (
+        "https://shop.example.com/p/42?ref=a&tag=blue&th=1"
+    )
+
+
+def test_memory_cache_ttl_and_lru():
+    """Test expiry and least-recently-used eviction."""
+    cache = MemoryCache(max_entries=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    cache.get("a")
+    cache.set("c", 3, ttl=60)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    cache.set("old", 1, ttl=-1)
+    assert cache.get("old") is None
+    assert cache.stats()["hits"] == 2
+
+
+def test_product_cache_domain_ttl():
+    """Test per-domain TTLs match the most specific suffix."""
+    cache = ProductCache(MemoryCache())
+    cache.default_ttl = 900
+    cache.domain_ttls = {"amazon.com": 300, "smile.amazon.com": 60}
+
+    assert cache.ttl_for("https://www.amazon.com/dp/B0") == 300
+    assert cache.ttl_for("https://smile.amazon.com/dp/B0") == 60
+    assert cache.ttl_for("https://notamazon.com/p") == 900
+
+
+async def test_extract_from_url_revalidates_stale_entry():
+    """Test that a stale entry is served again after a 304 response."""
+    url = "https://shop.example.com/item?utm_campaign=mail"
+    product = ProductInfo(name="Lamp", price=20.0)
+
+    service = ProductExtractorService()
+    service.cache_enabled = True
+    service.cache = ProductCache(MemoryCache())
+    service.cache.store(url, product, etag='"v1"')
+    entry = service.cache.backend.get(canonicalize_url(url))
+    entry["fresh_until"] = time.time() - 1
+
+    seen = {}
+
+    async def fake_fetch(fetch_url, cached=None):
+        seen["etag"] = cached["etag"]
+        return 304, None, None, None
+
+    service._extract_via_http = fake_fetch
+    result = await service.extract_from_url("https://shop.example.com/item")
+
+    assert result == product
+    assert seen["etag"] == '"v1"'
+    assert service.cache.stats()["revalidated"] == 1
+    assert service.cache.get(url)["fresh"]
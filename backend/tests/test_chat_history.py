@@ -0,0 +1,110 @@
+import asyncio
+
+from app.services.chat_history import ChatHistory, estimate_tokens
+from app.services.llm_service import LLMService
+
+URL = "https://example.com/article"
+
+
+def conversation(turns: int, words: int = 5) -> list[dict]:
+    messages = []
+    for i in range(turns):
+        messages.append({"id": f"u{i}", "role": "user", "content": f"question {i} " * words})
+        messages.append({"id": f"a{i}", "role": "assistant", "content": f"answer {i} " * words})
+    return messages
+
+
+def make_history(turns: int = 2, token_budget: int = 1000) -> ChatHistory:
+    history = ChatHistory()
+    history.max_turns = turns
+    history.token_budget = token_budget
+    return history
+
+
+def test_split_keeps_recent_turns_within_budget():
+    """Test that the window is bounded by turns and tokens but keeps the latest message."""
+    messages = conversation(5)
+    older, recent = make_history(turns=2).split(messages)
+    assert [m["id"] for m in recent] == ["u3", "a3", "u4", "a4"]
+    assert older == messages[:6]
+
+    budget = sum(estimate_tokens(m["content"]) for m in messages[-3:])
+    _, recent = make_history(turns=5, token_budget=budget).split(messages)
+    assert [m["id"] for m in recent] == ["a3", "u4", "a4"]
+
+    huge = [{"id": "u0", "role": "user", "content": "x" * 100000}]
+    assert make_history(token_budget=10).split(huge) == ([], huge)
+
+
+async def test_summary_is_built_off_the_critical_path():
+    """Test that a turn returns before the summary and later turns use it."""
+    release = asyncio.Event()
+    calls = []
+
+    async def summarize(summary, messages):
+        calls.append((summary, [m["id"] for m in messages]))
+        await release.wait()
+        return f"{summary}+{len(messages)}"
+
+    history = make_history(turns=2)
+    summary, recent = history.window(conversation(3), URL, summarize)
+    assert summary is None
+    assert [m["id"] for m in recent] == ["u1", "a1", "u2", "a2"]
+
+    # A second turn while the refresh is running does not start another
+    history.window(conversation(3), URL, summarize)
+    await asyncio.sleep(0)
+    assert len(calls) == 1
+    release.set()
+    await asyncio.sleep(0.01)
+
+    summary, _ = history.window(conversation(3), URL, summarize)
+    assert summary == "+2"
+
+    # The next turn folds only the newly older messages into the summary
+    summary, _ = history.window(conversation(4), URL, summarize)
+    assert summary == "+2"
+    await asyncio.sleep(0.01)
+    assert calls[-1] == ("+2", ["u1", "a1"])
+    assert history.window(conversation(4), URL, summarize)[0] == "+2+2"
+    assert history.stats()["refreshes"] == 2
+
+
+async def test_edited_history_discards_summary():
+    """Test that a summary is only reused for the conversation prefix it covers."""
+    async def summarize(summary, messages):
+        return "|".join(m["content"].split()[0] + m["id"] for m in messages)
+
+    history = make_history(turns=1)
+    history.window(conversation(3), URL, summarize)
+    await asyncio.sleep(0.01)
+    assert history.window(conversation(3), URL, summarize)[0]
+
+    edited = conversation(3)
+    edited[3]["id"] = "edited"
+    assert history.window(edited, URL, summarize)[0] is None
+    assert history.window(conversation(3), "https://example.com/other", summarize)[0] is None
+
+
+async def test_chat_sends_summary_and_recent_turns(monkeypatch):
+    """Test that LLMService.chat sends the summary in the system prompt, not old turns."""
+    history = make_history(turns=1)
+    monkeypatch.setattr("app.services.llm_service.get_chat_history", lambda: history)
+    sent = []
+
+    async def generate(system_prompt, user_prompt, messages=None):
+        sent.append((system_prompt, messages))
+        return "summary of turns" if messages is None else "reply"
+
+    llm = LLMService()
+    monkeypatch.setattr(llm, "_generate", generate)
+    context = {"url": URL, "title": "Article", "text": "Body"}
+
+    assert await llm.chat(conversation(3), context) == "reply"
+    assert len(sent[0][1]) == 2
+    await asyncio.sleep(0.01)
+
+    await llm.chat(conversation(3), context)
+    system_prompt, messages = sent[-1]
+    assert "summary of turns" in system_prompt
+    assert [m["content"] for m in messages] == ["question 2 " * 5, "answer 2 " * 5]
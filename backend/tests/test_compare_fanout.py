@@ -0,0 +1,78 @@
+import asyncio
+import json
+
+from app.services.cache import get_llm_cache
+from app.services.llm_service import LLMService
+
+CURRENT = {"name": "Desk Lamp", "price": 40.0, "rating": 4.4, "review_count": 120}
+ALTERNATIVES = [
+    {"name": f"Lamp {letter}", "price": 30.0 + i, "source": "Amazon"}
+    for i, letter in enumerate("ABCD")
+]
+
+
+def make_service(mode="auto", delay=0.1):
+    service = LLMService()
+    service.compare_mode = mode
+    service.fanout_min_alternatives = 3
+    service.fanout_concurrency = 8
+    prompts = []
+    service.in_flight = service.peak_in_flight = 0
+
+    async def fake_generate(system_prompt, user_prompt, messages=None):
+        prompts.append(user_prompt)
+        service.in_flight += 1
+        service.peak_in_flight = max(service.peak_in_flight, service.in_flight)
+        await asyncio.sleep(delay)
+        service.in_flight -= 1
+        if "Decide between" in user_prompt:
+            return json.dumps({"verdict": "Lamp A wins", "recommendation": "Buy Lamp A"})
+        if "pros and cons of this product" in user_prompt:
+            if "Lamp D" in user_prompt:
+                return "Sorry, I cannot help with that."
+            return json.dumps({"pros": ["bright"], "cons": ["plastic"]})
+        return json.dumps({"verdict": "single call"})
+
+    service._generate = fake_generate
+    return service, prompts
+
+
+async def test_fanout_runs_per_product_calls_concurrently():
+    """Test that per-product calls all run at once, then one verdict call."""
+    get_llm_cache().clear()
+    service, prompts = make_service(mode="fanout", delay=0.01)
+
+    result = await service.compare_products(CURRENT, ALTERNATIVES)
+
+    assert len(prompts) == len(ALTERNATIVES) + 2
+    assert service.peak_in_flight == len(ALTERNATIVES) + 1
+    assert "Decide between" in prompts[-1]
+    assert result["verdict"] == "Lamp A wins"
+    assert result["current_analysis"] == {"pros": ["bright"], "cons": ["plastic"]}
+    assert [a["name"] for a in result["alternatives_analysis"]] == [a["name"] for a in ALTERNATIVES]
+
+
+async def test_fanout_reuses_cached_product_analyses():
+    """Test that per-product calls are cached across comparisons."""
+    get_llm_cache().clear()
+    service, prompts = make_service(mode="fanout", delay=0)
+
+    await service.compare_products(CURRENT, ALTERNATIVES)
+    prompts.clear()
+    result = await service.compare_products(CURRENT, ALTERNATIVES)
+
+    # Only the malformed Lamp D answer was not cached
+    assert len(prompts) == 2
+    assert "Lamp D" in prompts[0]
+    assert "Decide between" in prompts[1]
+    assert result["alternatives_analysis"][3] == {"name": "Lamp D", "pros": [], "cons": []}
+
+
+async def test_auto_mode_uses_single_call_for_few_alternatives():
+    """Test that small comparisons keep the single-completion path."""
+    service, prompts = make_service(mode="auto", delay=0)
+
+    result = await service.compare_products(CURRENT, ALTERNATIVES[:2])
+
+    assert len(prompts) == 1
+    assert result["verdict"] == "single call"
@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import jobs
+from app.services.jobs import CompareJobManager
+
+PRODUCT_PAYLOAD = {
+    "url": "https://shop.example.com/lamp?utm_source=mail",
+    "content": {
+        "url": "https://shop.example.com/lamp",
+        "title": "Desk Lamp",
+        "text": "A desk lamp.",
+        "page_type": "product",
+        "product": {"name": "Desk Lamp", "price": 20.0},
+    },
+}
+
+
+class FakeComparisonService:
+    calls = 0
+
+    async def compare(self, product, max_results=5, progress=None):
+        FakeComparisonService.calls += 1
+        await progress("alternatives_found", {"source": "Amazon", "count": 2})
+        await asyncio.sleep(0.05)
+        await progress("llm_started", {"alternatives": 2})
+        return {"current_product": product.model_dump(), "alternatives": [], "verdict": "ok"}
+
+
+@pytest.fixture
+def job_client(monkeypatch):
+    manager = CompareJobManager()
+    monkeypatch.setattr(jobs, "ComparisonService", FakeComparisonService)
+    monkeypatch.setattr("app.api.routes.compare.get_job_manager", lambda: manager)
+    FakeComparisonService.calls = 0
+    with TestClient(app) as client:
+        yield client
+
+
+def test_compare_job_runs_and_streams_events(job_client):
+    """Test job creation, deduplication and SSE progress events."""
+    first = job_client.post("/api/compare/jobs", json=PRODUCT_PAYLOAD)
+    assert first.status_code == 202
+    job_id = first.json()["data"]["job_id"]
+
+    second = job_client.post("/api/compare/jobs", json=PRODUCT_PAYLOAD)
+    assert second.json()["data"] == {
+        "job_id": job_id,
+        "status": second.json()["data"]["status"],
+        "deduplicated": True,
+    }
+
+    with job_client.stream("GET", f"/api/compare/jobs/{job_id}/events") as response:
+        body = "".join(response.iter_text())
+    assert "event: alternatives_found" in body
+    assert "event: llm_started" in body
+    assert '"verdict":"ok"' in body
+
+    snapshot = job_client.get(f"/api/compare/jobs/{job_id}").json()["data"]
+    assert snapshot["status"] == "done"
+    assert snapshot["result"]["verdict"] == "ok"
+    assert FakeComparisonService.calls == 1
+
+
+def test_compare_job_not_found(job_client):
+    """Test unknown job ids return JOB_NOT_FOUND."""
+    response = job_client.get("/api/compare/jobs/missing")
+    assert response.status_code == 404
+    assert "JOB_NOT_FOUND" in str(response.json())
+
+
+async def test_cancelled_job_ends_with_failed_event(monkeypatch):
+    """Test that shutdown cancellation still finishes the job for subscribers."""
+    monkeypatch.setattr(jobs, "ComparisonService", FakeComparisonService)
+    manager = CompareJobManager()
+    product = jobs.ProductInfo(name="Desk Lamp")
+    job, _ = manager.submit("https://shop.example.com/lamp", product)
+    other, deduplicated = manager.submit("https://shop.example.com/lamp", product, max_results=10)
+    assert not deduplicated and other is not job
+
+    await asyncio.sleep(0.01)
+    await manager.shutdown()
+
+    events = [event["event"] async for event in job.subscribe()]
+    assert job.status == "failed"
+    assert events[-1] == "failed"
+
+
+async def test_cancelled_queued_job_ends_with_failed_event(monkeypatch):
+    """Test that a job cancelled while waiting for a worker slot still finishes."""
+    monkeypatch.setattr(jobs, "ComparisonService", FakeComparisonService)
+    manager = CompareJobManager()
+    manager.workers = 1
+    running, _ = manager.submit("https://shop.example.com/lamp", jobs.ProductInfo(name="Lamp"))
+    queued, _ = manager.submit("https://shop.example.com/desk", jobs.ProductInfo(name="Desk"))
+
+    await asyncio.sleep(0.01)
+    assert (running.status, queued.status) == ("running", "queued")
+    queued.task.cancel()
+
+    async def collect() -> list[str]:
+        return [event["event"] async for event in queued.subscribe()]
+
+    events = await asyncio.wait_for(collect(), 1)
+    assert queued.status == "failed"
+    assert events == ["queued", "failed"]
+    await manager.shutdown()
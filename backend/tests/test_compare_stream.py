@@ -0,0 +1,83 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import ProductAlternative, ProductInfo
+from app.services.comparison import ComparisonService
+from app.services.prefetch import AlternativesPrefetcher
+
+
+class FakeScraper:
+    async def stream_product_alternatives(self, query, current_product_name, max_results=5):
+        yield "Amazon", [
+            ProductAlternative(name="Lamp A", url="https://a", price=10.0),
+            ProductAlternative(name="Lamp B", url="https://b", price=12.0),
+        ]
+        await asyncio.sleep(0.2)
+        yield "Google Shopping", [ProductAlternative(name="Lamp C", url="https://c")]
+
+
+class FakeLLM:
+    def __init__(self):
+        self.seen = None
+
+    async def compare_products(self, current_product, alternatives, value_scores=None):
+        self.seen = [alt["name"] for alt in alternatives]
+        return {"verdict": "Lamp A is the best value"}
+
+
+def make_service(min_alternatives=2, deadline=5.0):
+    service = ComparisonService()
+    service.scraper = FakeScraper()
+    service.llm = FakeLLM()
+    service.prefetcher = AlternativesPrefetcher()
+    service.stream_min_alternatives = min_alternatives
+    service.stream_llm_deadline = deadline
+    return service
+
+
+async def test_stream_starts_llm_before_slow_source_finishes():
+    """Test that the LLM stage overlaps with the remaining scraping."""
+    service = make_service(min_alternatives=2)
+    events = [
+        (event, data)
+        async for event, data in service.stream(ProductInfo(name="Desk Lamp"))
+    ]
+    names = [event for event, _ in events]
+
+    assert names[:2] == ["alternatives", "llm_started"]
+    assert names.index("comparison") < names.index("alternatives", 1)
+    assert names[-1] == "done"
+    assert service.llm.seen == ["Lamp A", "Lamp B"]
+    assert len(events[-1][1]["alternatives"]) == 3
+
+
+async def test_stream_waits_for_all_sources_when_below_threshold():
+    """Test the LLM gets every alternative when the threshold is not reached."""
+    service = make_service(min_alternatives=10)
+    events = [event async for event, _ in service.stream(ProductInfo(name="Desk Lamp"))]
+
+    assert events == ["alternatives", "alternatives", "llm_started", "comparison", "done"]
+    assert service.llm.seen == ["Lamp A", "Lamp B", "Lamp C"]
+
+
+def test_compare_stream_requires_product():
+    """Test streaming compare rejects pages without product info."""
+    client = TestClient(app)
+    response = client.post(
+        "/api/compare/stream",
+        json={"url": "https://example.com", "content": {"url": "https://example.com", "title": "x", "text": "y"}},
+    )
+    assert response.status_code == 400
+    assert "NO_PRODUCT_INFO" in str(response.json())
+
+
+async def test_stream_caches_scraped_alternatives():
+    """Test that a finished stream is reused by the next comparison."""
+    service = make_service(min_alternatives=10)
+    [event async for event, _ in service.stream(ProductInfo(name="Desk Lamp"))]
+
+    events = [event async for event, _ in service.stream(ProductInfo(name="Desk Lamp"))]
+    assert events == ["alternatives", "llm_started", "comparison", "done"]
+    assert service.prefetcher._foreground == 0
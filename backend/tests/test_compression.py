@@ -0,0 +1,124 @@
+import gzip
+import json
+import zlib
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.api.middleware import RequestDecompressionMiddleware, ResponseCompressionMiddleware
+from app.api.responses import FastJSONResponse
+from app.models import ProductInfo
+from app.services.compression import BodyTooLargeError, decode_body
+
+
+def make_client(max_bytes: int = 10000) -> TestClient:
+    app = FastAPI()
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        body = await request.json()
+        return {"keys": sorted(body), "length": request.headers["content-length"]}
+
+    app.add_middleware(RequestDecompressionMiddleware, max_bytes=max_bytes)
+    return TestClient(app)
+
+
+def test_gzip_request_body_is_decompressed():
+    """Test that routes see the decompressed body and its real length."""
+    body = json.dumps({"content": "x" * 5000, "url": "https://example.com"}).encode()
+    response = make_client().post(
+        "/echo",
+        content=gzip.compress(body),
+        headers={"Content-Encoding": "gzip", "Content-Type": "application/json"},
+    )
+    assert response.status_code == 200
+    assert response.json() == {"keys": ["content", "url"], "length": str(len(body))}
+
+
+def test_decompression_bomb_is_refused():
+    """Test that a small body inflating past the limit gets 413 without being expanded."""
+    bomb = gzip.compress(b"0" * 10_000_000)
+    assert len(bomb) < 20000
+    response = make_client(max_bytes=100000).post(
+        "/echo", content=bomb, headers={"Content-Encoding": "gzip"}
+    )
+    assert response.status_code == 413
+    assert response.json()["detail"]["code"] == "PAYLOAD_TOO_LARGE"
+
+    def chunks(size: int):
+        yield b'{"content": "'
+        for _ in range(size // 1000):
+            yield b"x" * 1000
+        yield b'"}'
+
+    # Chunked uploads carry no Content-Length, so the bytes are counted
+    client = make_client(max_bytes=100000)
+    response = client.post("/echo", content=chunks(200000))
+    assert "content-length" not in response.request.headers
+    assert response.status_code == 413
+    response = client.post("/echo", content=chunks(5000))
+    assert response.json() == {"keys": ["content"], "length": "5015"}
+
+    with pytest.raises(BodyTooLargeError):
+        decode_body("deflate", zlib.compress(b"0" * 1000), 999)
+
+
+def test_bad_encodings_are_rejected():
+    """Test unknown encodings get 415 and corrupt bodies get 400."""
+    client = make_client()
+    response = client.post("/echo", content=b"{}", headers={"Content-Encoding": "br"})
+    assert response.status_code == 415
+    assert "gzip" in response.headers["accept-encoding"]
+
+    truncated = gzip.compress(b'{"a": 1}' * 100)[:20]
+    response = client.post("/echo", content=truncated, headers={"Content-Encoding": "gzip"})
+    assert response.status_code == 400
+    assert response.json()["detail"]["code"] == "INVALID_BODY"
+
+
+def test_fast_json_response_serializes_models_directly():
+    """Test that pydantic models inside the content are encoded without model_dump()."""
+    product = ProductInfo(name="Desk Lamp", price=19.5)
+    response = FastJSONResponse({"success": True, "data": product})
+    assert json.loads(response.body) == {"success": True, "data": product.model_dump()}
+
+
+def test_large_responses_are_gzipped():
+    """Test that the app compresses large responses for clients that accept gzip."""
+    from app.main import app
+
+    client = TestClient(app)
+    response = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    response = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+def test_event_streams_are_not_gzipped():
+    """Test that SSE output is sent uncompressed and other streams are gzipped."""
+    app = FastAPI()
+
+    async def chunks():
+        for i in range(50):
+            yield f"data: {i} {'x' * 40}\n\n"
+
+    @app.get("/events")
+    async def events():
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    @app.get("/text")
+    async def text():
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    app.add_middleware(ResponseCompressionMiddleware, min_bytes=100)
+    client = TestClient(app)
+
+    response = client.get("/events", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.text.count("data:") == 50
+
+    response = client.get("/text", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text.count("data:") == 50
@@ -0,0 +1,47 @@
+from pathlib import Path
+
+from app.services.content_extractor import ContentExtractor
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "html"
+
+
+def test_extracts_article_body_only():
+    """Test that navigation, sidebars and link lists are dropped."""
+    html = (FIXTURES_DIR / "generic_article.html").read_text(encoding="utf-8")
+    result = ContentExtractor().extract(html)
+
+    tags = [p["tag"] for p in result["paragraphs"]]
+    assert tags == ["h1", "p", "p", "h2", "p", "p"]
+    assert result["title"] == "How Solid-State Batteries Work"
+    assert result["description"].startswith("An explainer")
+    assert "Trending" not in result["text"]
+    assert "Privacy" not in result["text"]
+    assert "EV range explained" not in result["text"]
+
+
+def test_respects_byte_budget():
+    """Test that output stops once the byte budget is reached."""
+    body = "".join(f"<p>Paragraph {i}, with enough text to be scored as content.</p>" for i in range(200))
+    result = ContentExtractor(max_bytes=500).extract(f"<html><body><article>{body}</article></body></html>")
+
+    assert len(result["text"].encode("utf-8")) <= 500 + 2 * len(result["paragraphs"])
+    assert result["paragraphs"][0]["text"].startswith("Paragraph 0")
+
+
+def test_stops_scanning_huge_pages():
+    """Test that scanning stops after the scan budget on very large pages."""
+    body = "<p>Repeated filler sentence, long enough to count as a paragraph.</p>" * 5000
+    result = ContentExtractor(scan_bytes=2000, chunk_size=1024).extract(
+        f"<html><body><div>{body}</div></body></html>"
+    )
+
+    assert 0 < len(result["paragraphs"]) < 100
+
+    # The scan budget is in bytes, so multi-byte text uses it up faster
+    body = "<p>Повторяющееся длинное предложение, которого хватает на абзац.</p>" * 5000
+    result = ContentExtractor(scan_bytes=2000, chunk_size=1024).extract(
+        f"<html><body><div>{body}</div></body></html>"
+    )
+    assert 0 < len(result["paragraphs"]) < 40
+
+    assert ContentExtractor(max_bytes=0).extract(f"<html><body>{body}</body></html>")["text"] == ""
@@ -0,0 +1,137 @@
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import ProductAlternative, ProductInfo
+from app.services import deadline
+from app.services.comparison import ComparisonService
+from app.services.dedup import AlternativeDeduplicator
+from app.services.llm_service import LLMService
+from app.services.prefetch import AlternativesPrefetcher
+
+
+class SlowScraper:
+    """Amazon answers quickly, Google Shopping never in time."""
+
+    def __init__(self):
+        self.deduplicator = AlternativeDeduplicator()
+        self.cancelled = False
+
+    async def search_product_alternatives(
+        self, query, current_product_name, max_results=5, on_results=None
+    ):
+        await on_results("Amazon", [ProductAlternative(name="Lamp A", url="https://a")])
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return []
+
+    async def stream_product_alternatives(self, query, current_product_name, max_results=5):
+        yield "Amazon", [ProductAlternative(name="Lamp A", url="https://a")]
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        yield "Google Shopping", [ProductAlternative(name="Lamp B", url="https://b")]
+
+
+class BudgetLLM:
+    def __init__(self):
+        self.budget = None
+
+    async def compare_products(self, current_product, alternatives, value_scores=None):
+        self.budget = deadline.remaining()
+        return {"verdict": "Lamp A is the best value"}
+
+
+def make_service(llm_reserve=0.2):
+    service = ComparisonService()
+    service.scraper = SlowScraper()
+    service.llm = BudgetLLM()
+    service.prefetcher = AlternativesPrefetcher()
+    service.llm_reserve = llm_reserve
+    return service
+
+
+def test_scope_keeps_the_earlier_deadline():
+    """Test that a nested scope cannot extend its parent's deadline."""
+    assert deadline.remaining(5.0) == 5.0
+    with deadline.scope(1.0):
+        with deadline.scope(60.0):
+            assert deadline.remaining() <= 1.0
+            assert deadline.remaining(0.5) == 0.5
+        with deadline.scope(0.0):
+            assert deadline.expired()
+            with pytest.raises(deadline.DeadlineExceededError):
+                deadline.budget_ms(10000)
+    assert deadline.remaining() is None
+
+
+async def test_compare_returns_partial_result_at_deadline():
+    """Test that a slow source is cut off and the LLM gets the rest of the budget."""
+    service = make_service(llm_reserve=0.2)
+    start = time.monotonic()
+    result = await service.compare(ProductInfo(name="Desk Lamp"), timeout=0.6)
+
+    assert time.monotonic() - start < 1.0
+    assert result["partial"] is True
+    assert [alt["name"] for alt in result["alternatives"]] == ["Lamp A"]
+    assert service.scraper.cancelled
+    assert 0.1 < service.llm.budget <= 0.2
+    # Partial results are not cached for later comparisons
+    assert await service.prefetcher.lookup("Desk Lamp alternatives", 5) is None
+
+
+async def test_stream_drops_sources_still_running_at_deadline():
+    """Test that the stream stops waiting for sources once the scrape budget is spent."""
+    service = make_service(llm_reserve=0.2)
+    service.stream_min_alternatives = 10
+    events = [
+        (event, data)
+        async for event, data in service.stream(ProductInfo(name="Desk Lamp"), timeout=0.6)
+    ]
+
+    assert [event for event, _ in events] == [
+        "alternatives",
+        "llm_started",
+        "comparison",
+        "done",
+    ]
+    assert events[-1][1]["partial"] is True
+    assert service.scraper.cancelled
+    assert 0 < service.llm.budget <= 0.2
+
+
+async def test_llm_call_is_skipped_once_deadline_passed():
+    """Test that an LLM call after the deadline fails fast instead of being sent."""
+    service = LLMService()
+    with deadline.scope(0.0):
+        with pytest.raises(deadline.DeadlineExceededError):
+            await service._generate("system", "user")
+
+
+def test_invalid_deadline_header_is_rejected():
+    """Test that X-Request-Deadline must be a positive number of seconds."""
+    client = TestClient(app)
+    product = {"name": "Desk Lamp"}
+    response = client.post(
+        "/api/compare",
+        headers={"X-Request-Deadline": "soon"},
+        json={
+            "url": "https://example.com",
+            "content": {
+                "url": "https://example.com",
+                "title": "x",
+                "text": "y",
+                "product": product,
+            },
+        },
+    )
+    assert response.status_code == 400
+    assert "INVALID_DEADLINE" in str(response.json())
@@ -0,0 +1,115 @@
+from app.models import ProductAlternative
+from app.services.dedup import AlternativeDeduplicator, jaccard, normalize_tokens, similarity
+
+
+def _alt(name, **kwargs):
+    return ProductAlternative(name=name, url=kwargs.pop("url", "https://example.com"), **kwargs)
+
+
+def test_normalize_tokens_drops_noise():
+    """Test that variant and filler words are ignored."""
+    assert normalize_tokens("Sony WH-1000XM5 Headphones, Black") == frozenset(
+        {"sony", "wh", "1000xm5", "headphones"}
+    )
+
+
+def test_jaccard():
+    """Test token-set similarity bounds."""
+    a = frozenset({"sony", "headphones"})
+    assert jaccard(a, a) == 1.0
+    assert jaccard(a, frozenset()) == 0.0
+    assert jaccard(a, frozenset({"sony", "speaker"})) == 1 / 3
+
+
+def test_merges_cross_source_duplicates_keeping_richest():
+    """Test that the same item from two sources collapses into one record."""
+    alternatives = [
+        _alt("Bose QuietComfort 45 Wireless Headphones", price=279.0, source="Google Shopping"),
+        _alt("Bose QuietComfort 45 Headphones - Black", rating=4.6, price=249.0, source="Amazon"),
+        _alt("Apple AirPods Max", price=549.0, rating=4.7, source="Amazon"),
+    ]
+    result = AlternativeDeduplicator(threshold=0.6).deduplicate(alternatives)
+
+    assert len(result) == 2
+    assert result[0].source == "Amazon"
+    assert result[0].rating == 4.6
+    assert result[1].name == "Apple AirPods Max"
+
+
+def test_fills_missing_fields_from_duplicates():
+    """Test that merged records borrow missing fields from their duplicates."""
+    alternatives = [
+        _alt("Kindle Paperwhite 16GB", price=139.99, image="https://img/1.jpg"),
+        _alt("Kindle Paperwhite (16 GB)", rating=4.7),
+    ]
+    result = AlternativeDeduplicator(threshold=0.5).deduplicate(alternatives)
+
+    assert len(result) == 1
+    assert result[0].price == 139.99
+    assert result[0].image == "https://img/1.jpg"
+
+
+def test_drops_variants_of_current_product():
+    """Test that colour variants of the current product are excluded."""
+    alternatives = [
+        _alt("Sony WH-1000XM5 Wireless Headphones Silver"),
+        _alt("Sennheiser Momentum 4 Wireless"),
+    ]
+    result = AlternativeDeduplicator(threshold=0.6).deduplicate(
+        alternatives, current_product_name="Sony WH-1000XM5 Wireless Headphones, Black"
+    )
+
+    assert [alt.name for alt in result] == ["Sennheiser Momentum 4 Wireless"]
+
+
+def test_filter_new_skips_duplicates_of_existing():
+    """Test incremental dedup against alternatives already handed out."""
+    existing = [_alt("Bose QuietComfort 45 Wireless Headphones", price=279.0)]
+    candidates = [
+        _alt("Bose QuietComfort 45 Headphones - Black"),
+        _alt("Apple AirPods Max"),
+        _alt("Apple AirPods Max - Silver"),
+    ]
+    result = AlternativeDeduplicator(threshold=0.6).filter_new(existing, candidates)
+
+    assert [alt.name for alt in result] == ["Apple AirPods Max"]
+
+
+def test_similarity_requires_matching_model_numbers():
+    """Test that titles with conflicting model numbers never match."""
+    iphone_13 = normalize_tokens("Apple iPhone 13 128GB")
+    assert similarity(iphone_13, normalize_tokens("Apple iPhone 14 128GB")) == 0.0
+    assert similarity(normalize_tokens("Apple iPhone 14"), normalize_tokens("Apple iPhone 14 128GB")) > 0.6
+
+
+def test_keeps_other_models_of_current_product():
+    """Test that the previous generation is kept as an alternative."""
+    alternatives = [
+        _alt("Apple iPhone 14 128GB"),
+        _alt("Sony WH-1000XM4 Wireless Noise Canceling Headphones"),
+    ]
+    dedup = AlternativeDeduplicator(threshold=0.6)
+
+    assert [a.name for a in dedup.deduplicate(alternatives[:1], "Apple iPhone 13 128GB")] == [
+        "Apple iPhone 14 128GB"
+    ]
+    assert [
+        a.name
+        for a in dedup.deduplicate(
+            alternatives[1:], "Sony WH-1000XM5 Wireless Noise Canceling Headphones"
+        )
+    ] == ["Sony WH-1000XM4 Wireless Noise Canceling Headphones"]
+
+
+def test_does_not_merge_different_model_numbers():
+    """Test that neighbouring models from one line stay separate, also incrementally."""
+    alternatives = [
+        _alt("Bose QuietComfort 45 Headphones"),
+        _alt("Bose QuietComfort 35 Headphones"),
+    ]
+    dedup = AlternativeDeduplicator(threshold=0.6)
+
+    assert len(dedup.deduplicate(alternatives)) == 2
+    assert [a.name for a in dedup.filter_new(alternatives[:1], alternatives[1:])] == [
+        "Bose QuietComfort 35 Headphones"
+    ]
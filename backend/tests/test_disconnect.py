@@ -0,0 +1,89 @@
+import asyncio
+import json
+
+from fastapi import FastAPI, Request
+
+from app.api.disconnect import ClientDisconnected, cancel_on_disconnect
+from app.services.cancellation import get_cancellation_counters
+
+
+def make_app(started: asyncio.Event, cancelled: asyncio.Event, delay: float) -> FastAPI:
+    app = FastAPI()
+
+    async def generate() -> str:
+        started.set()
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return "answer"
+
+    @app.post("/work")
+    async def work(request: Request):
+        return {"result": await cancel_on_disconnect(request, generate(), "work")}
+
+    return app
+
+
+async def call(app: FastAPI, disconnect_after: float) -> list[dict]:
+    """Drive the app over raw ASGI with a client that leaves after disconnect_after."""
+    messages = [{"type": "http.request", "body": b"{}", "more_body": False}]
+    sent: list[dict] = []
+
+    async def receive() -> dict:
+        if messages:
+            return messages.pop(0)
+        await asyncio.sleep(disconnect_after)
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/work",
+        "raw_path": b"/work",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("test", 1),
+        "server": ("test", 80),
+    }
+    await app(scope, receive, send)
+    return sent
+
+
+async def test_disconnect_cancels_the_work():
+    """Test that a client leaving mid-request cancels the handler's work."""
+    counters = get_cancellation_counters()
+    before = counters.requests.get("work", 0)
+    started, cancelled = asyncio.Event(), asyncio.Event()
+
+    sent = await asyncio.wait_for(call(make_app(started, cancelled, delay=5), 0.05), timeout=2)
+
+    assert started.is_set() and cancelled.is_set()
+    assert sent[0]["status"] == 499
+    assert counters.requests["work"] == before + 1
+
+
+async def test_finished_work_is_returned():
+    """Test that work finishing before any disconnect is returned as usual."""
+    started, cancelled = asyncio.Event(), asyncio.Event()
+
+    sent = await call(make_app(started, cancelled, delay=0.01), disconnect_after=5)
+
+    assert not cancelled.is_set()
+    assert sent[0]["status"] == 200
+    assert json.loads(sent[1]["body"]) == {"result": "answer"}
+
+
+def test_client_disconnected_status():
+    """Test the error carried by ClientDisconnected."""
+    error = ClientDisconnected()
+    assert error.status_code == 499
+    assert error.detail["code"] == "CLIENT_DISCONNECTED"
@@ -0,0 +1,107 @@
+import sqlite3
+import time
+
+from app.models import ProductInfo
+from app.services import cache as cache_module
+from app.services.disk_cache import RAW, DiskCache, decode_value, encode_value
+
+
+def test_disk_cache_roundtrip_and_ttl(tmp_path):
+    """Test that values round-trip and expire."""
+    cache = DiskCache(str(tmp_path / "cache.sqlite3"), "llm")
+    cache.set("a", {"pros": ["Light"], "cons": []}, ttl=60)
+    cache.set("old", "gone", ttl=-1)
+
+    assert cache.get("a") == {"pros": ["Light"], "cons": []}
+    assert cache.get("old") is None
+    assert cache.get("missing", "default") == "default"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_large_values_are_compressed():
+    """Test that values over the threshold are stored compressed."""
+    _, codec = encode_value("short", 1024)
+    assert codec == RAW
+    value = {"text": "lorem ipsum " * 500}
+    data, codec = encode_value(value, 1024)
+    assert codec != RAW
+    assert len(data) < len("lorem ipsum " * 500)
+    assert decode_value(data, codec) == value
+    assert decode_value(*encode_value(value, 10**9)) == value
+
+
+def test_disk_cache_is_shared_between_connections(tmp_path):
+    """Test that a second worker's connection sees entries and namespaces stay apart."""
+    path = str(tmp_path / "cache.sqlite3")
+    worker_a = DiskCache(path, "llm")
+    worker_b = DiskCache(path, "llm")
+    other = DiskCache(path, "alternatives")
+
+    worker_a.set("key", "answer", ttl=60)
+    assert worker_a.get("key") == "answer"
+    worker_a.flush()
+
+    assert worker_b.get("key") == "answer"
+    assert other.get("key") is None
+    worker_a.close()
+    # Survives a restart
+    assert DiskCache(path, "llm").get("key") == "answer"
+
+
+def test_disk_cache_sweep_evicts_least_recently_used(tmp_path):
+    """Test entry and byte limits evict the least recently used entries."""
+    cache = DiskCache(str(tmp_path / "cache.sqlite3"), "llm", max_entries=2, sweep_interval=3600)
+    cache.touch_interval = 0
+    cache.set("a", 1, ttl=60)
+    time.sleep(0.01)
+    cache.set("b", 2, ttl=60)
+    time.sleep(0.01)
+    cache.get("a")
+    cache.set("c", 3, ttl=60)
+    cache.sweep()
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+    cache.max_bytes = len(b"3")
+    cache.sweep()
+    assert len(cache) == 1
+    assert cache.get("c") == 3
+
+
+def test_make_cache_uses_configured_backend(tmp_path, monkeypatch):
+    """Test that the disk backend is selected by settings."""
+    monkeypatch.setattr(cache_module.settings, "cache_backend", "disk")
+    monkeypatch.setattr(cache_module.settings, "cache_disk_path", str(tmp_path / "c.sqlite3"))
+    disk = cache_module.make_cache("product", 10)
+    assert isinstance(disk, DiskCache)
+    products = cache_module.ProductCache(backend=disk)
+    products.store("https://shop.example.com/p/1", ProductInfo(name="Lamp", price=20.0), etag='"v1"')
+    assert products.get("https://shop.example.com/p/1")["product"].name == "Lamp"
+
+    monkeypatch.setattr(cache_module.settings, "cache_backend", "memory")
+    assert isinstance(cache_module.make_cache("product", 10), cache_module.MemoryCache)
+
+
+def test_disk_cache_does_not_block_on_a_locked_database(tmp_path):
+    """Test that reads and writes return at once while another worker holds the write lock."""
+    path = str(tmp_path / "cache.sqlite3")
+    cache = DiskCache(path, "llm", write_timeout=1.0)
+    cache.set("old", "value", ttl=60)
+    cache.flush()
+
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN EXCLUSIVE")
+    started = time.perf_counter()
+    cache.set("new", "value", ttl=60)
+    assert cache.get("new") == "value"
+    assert cache.get("old") == "value"
+    assert time.perf_counter() - started < 0.5
+    other.execute("ROLLBACK")
+
+    # The queued write lands once the lock is released
+    cache.flush()
+    assert cache.stats()["write_errors"] == 0
+    assert DiskCache(path, "llm").get("new") == "value"
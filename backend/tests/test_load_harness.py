@@ -0,0 +1,73 @@
+import json
+import socket
+import threading
+import time
+
+import httpx
+import uvicorn
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import llm_service as llm_module
+from benchmarks import load
+from benchmarks.mock_llm import MockLLM, create_app
+
+
+def test_mock_llm_speaks_ollama_and_openai():
+    """Test both protocols, streaming and not, return the canned JSON."""
+    client = TestClient(create_app(MockLLM(ttft=0, tokens_per_sec=10000)))
+
+    ollama = client.post("/api/chat", json={"messages": [], "stream": False}).json()
+    assert json.loads(ollama["message"]["content"])["summary"]
+
+    streamed = client.post("/api/chat", json={"messages": []}).text.splitlines()
+    assert json.loads(streamed[-1])["done"] is True
+    content = "".join(json.loads(line)["message"]["content"] for line in streamed)
+    assert json.loads(content)["verdict"]
+
+    events = client.post("/v1/chat/completions", json={"stream": True}).text
+    assert events.rstrip().endswith("data: [DONE]")
+    openai = client.post("/v1/chat/completions", json={}).json()
+    assert json.loads(openai["choices"][0]["message"]["content"])["key_points"]
+
+
+def test_mock_llm_error_rate():
+    """Test that the configured share of requests fails."""
+    client = TestClient(create_app(MockLLM(ttft=0, error_rate=1.0)))
+    assert client.post("/api/chat", json={"stream": False}).status_code == 500
+
+
+def _serve_mock_llm(mock: MockLLM) -> tuple[uvicorn.Server, str]:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(
+        uvicorn.Config(create_app(mock), host="127.0.0.1", port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, f"http://127.0.0.1:{port}"
+
+
+async def test_load_generator_reports_latency_percentiles(monkeypatch):
+    """Test a short chat load run against the API backed by the mock LLM."""
+    mock = MockLLM(ttft=0.05, tokens_per_sec=2000)
+    server, base_url = _serve_mock_llm(mock)
+    monkeypatch.setattr(llm_module.settings, "llm_base_url", base_url)
+    monkeypatch.setattr(llm_module.settings, "llm_provider", "ollama")
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            report = await load.run(rps=20, duration=0.5, mix={"chat": 1}, client=client)
+    finally:
+        server.should_exit = True
+
+    chat = report["results"]["chat"]
+    assert chat["requests"] == 10
+    assert chat["ok"] == 10
+    assert chat["p50_ms"] >= 50
+    assert chat["p50_ms"] <= chat["p95_ms"] <= chat["p99_ms"] <= chat["max_ms"]
+    assert mock.counters["requests"] == 10
+    assert load.compare(report, report, 0.2) == []
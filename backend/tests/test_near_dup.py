@@ -0,0 +1,94 @@
+import random
+
+from app.models import PageContent
+from app.services.simhash import NearDuplicateIndex, max_distance_for, simhash
+from app.services.summarizer import SummarizerService
+from app.services.summary_cache import SummaryCache
+
+WORDS = [
+    "lamp", "garden", "river", "market", "policy", "engine", "winter", "signal",
+    "harbor", "museum", "circuit", "forest", "ledger", "canvas", "orbit", "meadow",
+]
+
+
+def article(seed: int, words: int = 400) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) + rng.choice(WORDS) for _ in range(words))
+
+
+def test_noise_keeps_fingerprint_close():
+    """Test that counters and a changed ad stay within the threshold, other text does not."""
+    body = article(1)
+    first = simhash(f"{body} 128 comments. Posted 3 hours ago. Ad: buy shoes")
+    reload = simhash(f"{body} 131 comments. Posted 4 hours ago. Ad: cheap flights")
+    other = simhash(article(2))
+
+    assert (first ^ reload).bit_count() <= max_distance_for(0.95)
+    assert (first ^ other).bit_count() > max_distance_for(0.95)
+    assert max_distance_for(0.95) == 3
+    assert max_distance_for(1.0) == 0
+
+
+def test_index_finds_within_distance_and_scope():
+    """Test banded lookups against a linear scan, with scopes and eviction."""
+    rng = random.Random(7)
+    index = NearDuplicateIndex(max_distance=3, max_entries=1000)
+    stored = [rng.getrandbits(64) for _ in range(1000)]
+    for i, fingerprint in enumerate(stored):
+        index.add("site", fingerprint, f"key{i}")
+
+    for i in range(0, 1000, 50):
+        flipped = stored[i] ^ (1 << 3) ^ (1 << 40) ^ (1 << 63)
+        assert index.find("site", flipped) == (f"key{i}", 3)
+        assert index.find("other", flipped) is None
+        assert index.find("site", flipped ^ (1 << 20)) is None
+
+    index.add("site", 12345, "newest")
+    assert len(index) == 1000
+    assert index.find("site", stored[0]) is None
+    assert index.find("site", 12345) == ("newest", 0)
+
+
+def make_page(text: str, **fields) -> PageContent:
+    return PageContent(
+        url=fields.pop("url", "https://news.example.com/story"), title="Story", text=text, **fields
+    )
+
+
+def test_summary_cache_counts_exact_and_near_hits():
+    """Test that reloads are near hits, other hosts and product pages are not."""
+    cache = SummaryCache()
+    body = article(3)
+    cache.put("summary", make_page(f"{body} 10 comments"), {"summary": "cached"})
+
+    assert cache.get("summary", make_page(f"{body} 10 comments")) == {"summary": "cached"}
+    assert cache.get("summary", make_page(f"{body} 12 comments")) == {"summary": "cached"}
+    assert cache.get("analysis", make_page(f"{body} 12 comments")) is None
+    assert cache.get("summary", make_page(body, url="https://mirror.example.org/story")) is None
+
+    cache.put("summary", make_page(body, page_type="product"), {"summary": "$10"})
+    assert cache.get("summary", make_page(f"{body} 2", page_type="product")) is None
+
+    stats = cache.stats()
+    assert (stats["exact_hits"], stats["near_hits"], stats["misses"]) == (1, 1, 3)
+    assert stats["near_hit_rate"] == 0.2
+
+
+async def test_summarizer_skips_llm_for_near_duplicates():
+    """Test that a reloaded page is summarized from cache."""
+    calls = []
+
+    class FakeLLM:
+        async def summarize(self, content):
+            calls.append(content["url"])
+            return {"summary": "A story.", "key_points": ["one"], "topics": []}
+
+    service = SummarizerService()
+    service.llm = FakeLLM()
+    service.cache = SummaryCache()
+    body = article(4)
+
+    first = await service.summarize(make_page(f"{body} Updated 09:15"))
+    second = await service.summarize(make_page(f"{body} Updated 09:40"))
+    assert first == second
+    assert len(calls) == 1
@@ -0,0 +1,69 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import PageContent
+from app.services.page_store import PageStore, PageTooLargeError, content_hash, get_page_store
+
+client = TestClient(app)
+
+PAGE = {
+    "url": "https://example.com/lamp",
+    "title": "Desk Lamp",
+    "text": "A lamp for your desk.",
+    "page_type": "product",
+    "product": {"name": "Desk Lamp", "price": 19.5},
+}
+
+
+def test_hash_ignores_extraction_time():
+    """Test that re-extracting an unchanged page gives the same hash."""
+    first = PageContent(**PAGE, extracted_at="2024-01-01T00:00:00")
+    second = PageContent(**PAGE, extracted_at="2024-06-01T12:00:00")
+    changed = PageContent(**{**PAGE, "text": "A brighter lamp."})
+
+    assert content_hash(first) == content_hash(second)
+    assert content_hash(first) != content_hash(changed)
+
+
+def test_page_store_roundtrip_and_limits():
+    """Test that pages round-trip by hash and oversized pages are refused."""
+    store = PageStore()
+    key = store.put(PageContent(**PAGE))
+    assert store.get(key).product.name == "Desk Lamp"
+    assert store.get("0" * 64) is None
+
+    store.max_page_bytes = 50
+    with pytest.raises(PageTooLargeError):
+        store.put(PageContent(**PAGE))
+
+
+def test_endpoints_accept_content_hash():
+    """Test uploading a page once and referencing it from another endpoint."""
+    response = client.post("/api/pages", json={"content": PAGE})
+    assert response.status_code == 200
+    key = response.json()["data"]["content_hash"]
+    assert key == content_hash(PageContent(**PAGE))
+
+    assert client.get(f"/api/pages/{key}").json()["data"]["title"] == "Desk Lamp"
+
+    no_product = PageContent(**{**PAGE, "product": None})
+    payload = {"url": PAGE["url"], "content_hash": content_hash(no_product)}
+    response = client.post("/api/compare", json=payload)
+    assert response.json()["detail"]["code"] == "CONTENT_NOT_FOUND"
+
+    # Reaches the product check, so the stored page was resolved
+    get_page_store().put(no_product)
+    response = client.post("/api/compare", json=payload)
+    assert response.status_code == 400
+    assert response.json()["detail"]["code"] == "NO_PRODUCT_INFO"
+
+
+def test_unknown_hash_asks_client_to_upload():
+    """Test that a hash miss gets CONTENT_NOT_FOUND, and no page at all is a 422."""
+    response = client.post("/api/summarize", json={"content_hash": "f" * 64})
+    assert response.status_code == 404
+    assert response.json()["detail"]["code"] == "CONTENT_NOT_FOUND"
+    assert "POST /api/pages" in response.json()["detail"]["message"]
+
+    assert client.post("/api/summarize", json={}).status_code == 422
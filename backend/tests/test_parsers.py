@@ -0,0 +1,111 @@
+from pathlib import Path
+
+from app.services.product_extractor import ProductExtractorService
+from app.services.scraper import ScraperService
+from app.services.site_parsers import get_parser_registry
+from benchmarks.parsers import run
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "html"
+
+
+def load_fixture(name: str) -> str:
+    return (FIXTURES_DIR / name).read_text(encoding="utf-8")
+
+
+def test_parse_amazon_product():
+    """Test Amazon product page parsing."""
+    product = ProductExtractorService()._parse_product_html(
+        load_fixture("amazon_product.html"), "https://www.amazon.com/dp/B09XS7JWHH"
+    )
+    assert product.name.startswith("Sony WH-1000XM5")
+    assert product.price == 328.0
+    assert product.rating == 4.4
+    assert product.review_count == 12718
+    assert product.availability == "in_stock"
+    assert product.brand == "Sony"
+
+
+def test_parse_ebay_item():
+    """Test eBay item page parsing."""
+    product = ProductExtractorService()._parse_product_html(
+        load_fixture("ebay_item.html"), "https://www.ebay.com/itm/1234567890"
+    )
+    assert product.name.startswith("Apple iPhone 13")
+    assert product.price == 389.99
+    assert len(product.images) == 2
+
+
+def test_parse_schema_org_product():
+    """Test schema.org structured data parsing."""
+    product = ProductExtractorService()._parse_product_html(
+        load_fixture("schema_org_product.html"), "https://shop.example.com/trail-runner-3"
+    )
+    assert product.name == "Trail Runner 3 Running Shoes"
+    assert product.price == 129.95
+    assert product.rating == 4.6
+    assert product.review_count == 318
+    assert product.availability == "in_stock"
+
+
+def test_parse_generic_product():
+    """Test fallback parsing for pages without structured data."""
+    product = ProductExtractorService()._parse_product_html(
+        load_fixture("generic_product.html"), "https://makergoods.example.com/walnut"
+    )
+    assert product.name == "Walnut Desk Organizer"
+    assert product.price == 64.0
+
+
+def test_parse_google_shopping_results():
+    """Test Google Shopping card parsing excludes the current product."""
+    results = ScraperService()._parse_google_shopping_results(
+        load_fixture("google_shopping.html"), "Sony WH-1000XM5"
+    )
+    assert [alt.name for alt in results] == [
+        "Bose QuietComfort 45 Wireless Headphones",
+        "Sennheiser Momentum 4 Wireless",
+        "Soundcore by Anker Space Q45",
+    ]
+    assert results[0].url.startswith("https://www.google.com/shopping/")
+    assert results[1].price == 1299.95
+
+
+def test_parse_amazon_results():
+    """Test Amazon search card parsing."""
+    results = ScraperService()._parse_amazon_results(
+        load_fixture("amazon_search.html"), "Sony WH-1000XM5"
+    )
+    assert len(results) == 4
+    assert results[0].rating == 4.7
+    assert results[0].url.startswith("https://www.amazon.com/")
+    assert results[-1].price is None
+
+
+def test_parser_benchmark_runs_offline():
+    """Test the parser benchmark harness produces a result per case."""
+    report = run(iterations=2, warmup=0)
+    assert "search.amazon" in report["results"]
+    for result in report["results"].values():
+        assert result["pages_per_sec"] > 0
+        assert result["p99_ms"] >= result["p50_ms"]
+
+
+def test_registry_resolves_by_domain():
+    """Test domain dispatch with suffix fallback and no substring matches."""
+    registry = get_parser_registry()
+    assert registry.resolve("https://www.amazon.co.uk/dp/B0").name == "amazon"
+    assert registry.resolve("https://smile.amazon.com/dp/B0").name == "amazon"
+    assert registry.resolve("https://www.ebay.de/itm/1").name == "ebay"
+    assert registry.resolve("https://amazon-deals.example.com/p").name == "generic"
+    assert registry.resolve("https://blog.example.com/ebay-tips").name == "generic"
+
+
+def test_registry_records_parser_stats():
+    """Test per-parser call counts and timing."""
+    registry = get_parser_registry()
+    before = registry.stats()["ebay"]["calls"]
+    registry.parse(load_fixture("ebay_item.html"), "https://www.ebay.com/itm/1")
+
+    stats = registry.stats()["ebay"]
+    assert stats["calls"] == before + 1
+    assert stats["total_ms"] > 0
@@ -0,0 +1,86 @@
+import asyncio
+
+from app.models import ProductAlternative, ProductInfo
+from app.services.comparison import ComparisonService, build_search_query
+from app.services.prefetch import AlternativesPrefetcher
+
+PRODUCT = ProductInfo(name="Desk Lamp", price=40.0)
+QUERY = build_search_query(PRODUCT)
+
+
+class FakeScraper:
+    calls = 0
+
+    async def search_product_alternatives(self, query, current_product_name, max_results=5, on_results=None):
+        FakeScraper.calls += 1
+        await asyncio.sleep(0.05)
+        return [ProductAlternative(name="Lamp A", url="https://a", price=35.0)]
+
+
+def make_prefetcher(**overrides):
+    FakeScraper.calls = 0
+    prefetcher = AlternativesPrefetcher(scraper_factory=FakeScraper)
+    prefetcher.enabled = True
+    for name, value in overrides.items():
+        setattr(prefetcher, name, value)
+    return prefetcher
+
+
+async def test_compare_waits_for_inflight_prefetch():
+    """Test that compare reuses a running prefetch instead of scraping again."""
+    prefetcher = make_prefetcher()
+    assert prefetcher.submit(PRODUCT, QUERY)
+
+    service = ComparisonService()
+    service.prefetcher = prefetcher
+    service.scraper = FakeScraper()
+
+    async def fake_analyze(product, alternatives):
+        return {"alternatives": [alt.model_dump() for alt in alternatives]}
+
+    service._analyze = fake_analyze
+    data = await service.compare(PRODUCT)
+
+    assert FakeScraper.calls == 1
+    assert [alt["name"] for alt in data["alternatives"]] == ["Lamp A"]
+    assert prefetcher.stats()["used"] == 1
+
+
+async def test_prefetch_dropped_under_load_and_budget():
+    """Test that prefetches yield to foreground work and respect the budget."""
+    prefetcher = make_prefetcher(max_foreground=1, budget_per_minute=1)
+
+    async with prefetcher.foreground():
+        assert not prefetcher.submit(PRODUCT, QUERY)
+    assert prefetcher.submit(PRODUCT, QUERY)
+    assert not prefetcher.submit(ProductInfo(name="Floor Lamp"), "floor lamp alternatives")
+
+    # Foreground scraping cancels the running prefetch
+    async with prefetcher.foreground():
+        await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert prefetcher.stats()["dropped"] == {"load": 1, "budget": 1}
+    assert prefetcher.stats()["cancelled"] == 1
+    assert prefetcher.get(QUERY, 5) is None
+
+
+async def test_prefetch_disabled_by_default():
+    """Test that prefetching is opt-in."""
+    prefetcher = AlternativesPrefetcher(scraper_factory=FakeScraper)
+    assert not prefetcher.submit(PRODUCT, QUERY)
+
+
+async def test_finished_prefetch_counts_as_used():
+    """Test that a prefetch completed before compare is counted when served."""
+    prefetcher = make_prefetcher()
+    prefetcher.submit(PRODUCT, QUERY)
+    await asyncio.sleep(0.1)
+    assert prefetcher.stats()["inflight"] == 0
+
+    assert [alt.name for alt in await prefetcher.lookup(QUERY, 5)] == ["Lamp A"]
+    assert prefetcher.stats()["used"] == 1
+
+    prefetcher.store("other query", [ProductAlternative(name="X", url="https://x")])
+    await prefetcher.lookup("other query", 5)
+    assert prefetcher.stats()["used"] == 1
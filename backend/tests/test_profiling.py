@@ -0,0 +1,81 @@
+import asyncio
+import json
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import middleware as middleware_module
+from app.api.middleware import ProfilingMiddleware
+from app.services.profiling import StackSampler
+from app.services.tracing import span
+
+
+def busy_loop(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_stack_sampler_folds_stacks():
+    """Test that samples come out as collapsed 'a;b;c count' lines."""
+    sampler = StackSampler(interval=0.001)
+    sampler.start()
+    busy_loop(0.05)
+    sampler.stop()
+
+    lines = sampler.folded().splitlines()
+    assert lines
+    assert any("busy_loop (test_profiling.py" in line for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+
+def make_client(tmp_path, monkeypatch, **overrides) -> TestClient:
+    options = {
+        "profiling_token": "secret",
+        "profiling_sample_rate": 0.0,
+        "profiling_mode": "sampling",
+        "profiling_dir": str(tmp_path),
+        **overrides,
+    }
+    for name, value in options.items():
+        monkeypatch.setattr(middleware_module.settings, name, value)
+
+    app = FastAPI()
+
+    @app.get("/work")
+    async def work():
+        with span("stage"):
+            busy_loop(0.02)
+            await asyncio.sleep(0)
+        return {"ok": True}
+
+    app.add_middleware(ProfilingMiddleware)
+    return TestClient(app)
+
+
+def test_profiles_requests_with_the_token(tmp_path, monkeypatch):
+    """Test that an authorized header writes the profile and stage timings."""
+    client = make_client(tmp_path, monkeypatch)
+
+    assert "x-profile-id" not in client.get("/work").headers
+    assert "x-profile-id" not in client.get("/work", headers={"X-Profile": "wrong"}).headers
+    assert list(tmp_path.iterdir()) == []
+
+    response = client.get("/work", headers={"X-Profile": "secret"})
+    profile_id = response.headers["x-profile-id"]
+    summary = json.loads((tmp_path / f"{profile_id}.json").read_text())
+    assert summary["path"] == "/work"
+    assert summary["status"] == 200
+    assert summary["mode"] == "sampling"
+    assert [stage["name"] for stage in summary["stages"]] == ["stage"]
+    assert (tmp_path / f"{profile_id}.folded").exists()
+
+
+def test_sample_rate_and_cprofile_mode(tmp_path, monkeypatch):
+    """Test random sampling without a header, written as a cProfile dump."""
+    client = make_client(
+        tmp_path, monkeypatch, profiling_token="", profiling_sample_rate=1.0, profiling_mode="cprofile"
+    )
+    profile_id = client.get("/work").headers["x-profile-id"]
+    assert (tmp_path / f"{profile_id}.prof").stat().st_size > 0
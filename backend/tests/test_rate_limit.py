@@ -0,0 +1,145 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.middleware import RateLimitMiddleware
+from app.services.rate_limit import (
+    FairQueue,
+    MemoryBucketStore,
+    RateLimitedError,
+    RateLimiter,
+    SqliteBucketStore,
+    client_key,
+    trusted_networks,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def test_token_bucket_limits_and_refills():
+    """Test that a bucket allows its burst, refuses beyond it and refills over time."""
+    clock = FakeClock()
+    store = MemoryBucketStore(clock=clock)
+
+    first = await store.take("llm:a", 4, rate=1.0, burst=10)
+    second = await store.take("llm:a", 4, rate=1.0, burst=10)
+    refused = await store.take("llm:a", 4, rate=1.0, burst=10)
+    assert first.allowed and second.allowed
+    assert not refused.allowed
+    assert refused.remaining == 2
+    assert refused.retry_after == 2.0
+
+    # Other clients have their own bucket
+    assert (await store.take("llm:b", 4, rate=1.0, burst=10)).allowed
+
+    clock.now += 2
+    assert (await store.take("llm:a", 4, rate=1.0, burst=10)).allowed
+
+
+async def test_sqlite_buckets_are_shared_between_workers(tmp_path):
+    """Test that two stores on one file draw from the same bucket."""
+    path = str(tmp_path / "limits.sqlite3")
+    worker_a, worker_b = SqliteBucketStore(path), SqliteBucketStore(path)
+
+    assert (await worker_a.take("browser:a", 10, rate=0.01, burst=20)).allowed
+    assert (await worker_b.take("browser:a", 10, rate=0.01, burst=20)).allowed
+    assert not (await worker_a.take("browser:a", 10, rate=0.01, burst=20)).allowed
+    worker_a.close()
+    worker_b.close()
+
+
+async def test_fair_queue_interleaves_a_heavy_backlog():
+    """Test that a light client is served before a heavy client's queued backlog."""
+    queue = FairQueue(slots=1, max_queued=10)
+    served = []
+
+    async def request(client: str) -> None:
+        await queue.acquire(client, 1)
+        served.append(client)
+        await asyncio.sleep(0)
+        queue.release()
+
+    await queue.acquire("heavy", 1)
+    tasks = [asyncio.create_task(request("heavy")) for _ in range(4)]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(request("light")))
+    await asyncio.sleep(0)
+    queue.release()
+    await asyncio.gather(*tasks)
+
+    assert served[0] == "light"
+    assert queue.stats()["active"] == 0
+
+
+async def test_fair_queue_caps_queued_requests_per_client():
+    """Test that a client cannot queue more than max_queued requests."""
+    queue = FairQueue(slots=1, max_queued=1)
+    await queue.acquire("a", 1)
+    waiting = asyncio.create_task(queue.acquire("a", 1))
+    await asyncio.sleep(0)
+
+    with pytest.raises(RateLimitedError):
+        await queue.acquire("a", 1)
+
+    waiting.cancel()
+    await asyncio.gather(waiting, return_exceptions=True)
+    assert queue.stats()["queued"] == 0
+
+
+def test_client_key_trusts_identity_headers_only_from_proxies():
+    """Test that identity headers count only behind a trusted proxy, and API keys are hashed."""
+    proxies = trusted_networks(["10.0.0.0/8"])
+    headers = {b"x-api-key": b"secret", b"x-client-id": b"ext-1"}
+
+    key = client_key(headers, "10.0.0.1", proxies)
+    assert key.startswith("key:") and "secret" not in key
+    assert client_key({b"x-client-id": b"ext-1"}, "10.0.0.1", proxies) == "id:ext-1"
+    forwarded = {b"x-forwarded-for": b"1.2.3.4, 203.0.113.9"}
+    assert client_key(forwarded, "10.0.0.1", proxies) == "ip:203.0.113.9"
+    assert client_key({}, "10.0.0.1", proxies) == "ip:10.0.0.1"
+
+    # A direct caller cannot pick a fresh bucket by changing headers
+    assert client_key(headers, "198.51.100.7", proxies) == "ip:198.51.100.7"
+    assert client_key(headers, "198.51.100.7") == "ip:198.51.100.7"
+
+
+def test_middleware_returns_429_with_rate_limit_headers():
+    """Test that limited routes send RateLimit headers and 429 once out of tokens."""
+    limiter = RateLimiter(MemoryBucketStore(), costs={"chat": 1, "compare": 10})
+    limiter.burst = 12
+    app = FastAPI()
+
+    @app.post("/api/compare")
+    async def compare():
+        return {"ok": True}
+
+    @app.post("/api/chat")
+    async def chat():
+        return {"ok": True}
+
+    app.add_middleware(RateLimitMiddleware, limiter=limiter, trusted_proxies=["10.0.0.0/8"])
+    client = TestClient(app, client=("10.0.0.2", 50000))
+    heavy = {"X-Client-Id": "heavy"}
+
+    response = client.post("/api/compare", headers=heavy)
+    assert response.status_code == 200
+    assert response.headers["ratelimit-limit"] == "12"
+    assert response.headers["ratelimit-remaining"] == "2"
+
+    response = client.post("/api/compare", headers=heavy)
+    assert response.status_code == 429
+    assert response.json()["detail"]["code"] == "RATE_LIMITED"
+    assert int(response.headers["retry-after"]) >= 1
+
+    # Chat is another route class, and other clients are unaffected
+    assert client.post("/api/chat", headers=heavy).status_code == 200
+    assert client.post("/api/compare", headers={"X-Client-Id": "other"}).status_code == 200
+    assert limiter.stats()["limited"] == 1
@@ -0,0 +1,82 @@
+from app.models import ProductAlternative, ProductInfo
+from app.services.comparison import ComparisonService
+from app.services.relevance import RelevanceRanker, cosine, hashed_features, price_proximity
+
+CURRENT = ProductInfo(name="Sony WH-1000XM5 Wireless Noise Canceling Headphones", price=399.99, brand="Sony")
+
+
+def alt(name, price=None):
+    return ProductAlternative(name=name, url=f"https://shop.example/{name}", price=price)
+
+
+def test_hashed_features_similarity():
+    """Test that related titles score higher than unrelated ones."""
+    query = hashed_features("Sony WH-1000XM5 Headphones", 1024)
+    close = hashed_features("Sony WH1000XM4 Wireless Headphones", 1024)
+    far = hashed_features("USB-C Charging Cable 6ft", 1024)
+
+    assert cosine(query, query) > 0.999
+    assert cosine(query, close) > cosine(query, far)
+    assert hashed_features("", 1024) == {}
+
+
+def test_price_proximity_is_symmetric_in_ratio():
+    """Test that half and double the price score the same."""
+    assert price_proximity(100.0, 100.0) == 1.0
+    assert abs(price_proximity(50.0, 100.0) - price_proximity(200.0, 100.0)) < 1e-9
+    assert price_proximity(None, 100.0) == 0.5
+
+
+def test_select_keeps_top_k_in_source_order():
+    """Test that accessories are dropped from the LLM set but still returned."""
+    alternatives = [
+        alt("Headphone Case for Sony WH-1000XM5", 19.99),
+        alt("Bose QuietComfort Ultra Wireless Noise Cancelling Headphones", 429.0),
+        alt("Replacement Ear Pads", 14.99),
+        alt("Apple AirPods Max Wireless Over-Ear Headphones", 449.0),
+    ]
+    annotated, selected = RelevanceRanker(top_k=2, price_weight=0.4).select(CURRENT, alternatives)
+
+    assert [a.name for a in annotated] == [a.name for a in alternatives]
+    assert all(a.relevance is not None for a in annotated)
+    assert [a.name for a in selected] == [alternatives[1].name, alternatives[3].name]
+
+
+def test_select_top_k_zero_keeps_everything():
+    """Test that a top_k of 0 disables trimming."""
+    alternatives = [alt("A"), alt("B")]
+    _, selected = RelevanceRanker(top_k=0).select(CURRENT, alternatives)
+    assert len(selected) == 2
+
+
+async def test_compare_sends_only_top_k_to_llm():
+    """Test that the compare pipeline trims the prompt but returns everything."""
+
+    class FakeScraper:
+        async def search_product_alternatives(self, query, current_product_name, max_results=5, on_results=None):
+            return [
+                alt("Headphone Case for Sony WH-1000XM5", 19.99),
+                alt("Bose QuietComfort Ultra Wireless Noise Cancelling Headphones", 429.0),
+                alt("Apple AirPods Max Wireless Over-Ear Headphones", 449.0),
+            ]
+
+    class FakeLLM:
+        async def compare_products(self, current_product, alternatives, value_scores=None):
+            self.seen = [a["name"] for a in alternatives]
+            self.scored = [s["name"] for s in value_scores]
+            self.ranks = sorted(s["rank"] for s in value_scores)
+            return {"verdict": "ok"}
+
+    service = ComparisonService()
+    service.scraper = FakeScraper()
+    service.llm = FakeLLM()
+    service.ranker = RelevanceRanker(top_k=2, price_weight=0.4)
+
+    data = await service.compare(CURRENT)
+
+    assert len(data["alternatives"]) == 3
+    assert data["compared"] == service.llm.seen
+    assert "Headphone Case for Sony WH-1000XM5" not in service.llm.seen
+    assert len(service.llm.scored) == 3
+    assert service.llm.ranks == [1, 2, 3]
+    assert len(data["value_scores"]) == 4
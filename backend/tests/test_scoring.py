@@ -0,0 +1,88 @@
+import pytest
+
+from app.models import ProductAlternative, ProductInfo
+from app.models.prompts import format_value_table
+from app.services.comparison import ComparisonService
+from app.services.scoring import ValueScorer
+
+
+def _alt(name, **kwargs):
+    return ProductAlternative(name=name, url="https://example.com", **kwargs)
+
+
+def test_bayesian_rating_favours_many_reviews():
+    """Test that a 5.0 from 3 reviews ranks below a 4.7 from 20k reviews."""
+    current = ProductInfo(name="Current", price=100.0, rating=4.0, review_count=500)
+    scores = ValueScorer(prior_reviews=50, rating_weight=1.0).score(
+        current,
+        [
+            _alt("Few reviews", price=100.0, rating=5.0, review_count=3),
+            _alt("Many reviews", price=100.0, rating=4.7, review_count=20000),
+        ],
+    )
+    by_name = {s.name: s for s in scores}
+
+    assert by_name["Many reviews"].adjusted_rating > by_name["Few reviews"].adjusted_rating
+    assert scores[0].name == "Many reviews"
+    assert [s.rank for s in scores] == [1, 2, 3]
+
+
+def test_zero_prior_with_zero_reviews_uses_raw_rating():
+    """Test that no prior and a listing with no reviews does not divide by zero."""
+    current = ProductInfo(name="Current", price=100.0, rating=4.0, review_count=0)
+    scores = ValueScorer(prior_reviews=0).score(
+        current, [_alt("Reviewed", price=90.0, rating=4.5, review_count=10)]
+    )
+    assert {s.name: s.adjusted_rating for s in scores} == {"Current": 4.0, "Reviewed": 4.5}
+
+    with pytest.raises(ValueError):
+        ValueScorer(prior_reviews=-1)
+
+
+def test_price_metrics():
+    """Test price percentile, savings and price per rating point."""
+    current = ProductInfo(name="Current", price=200.0, rating=4.0, review_count=1000)
+    scores = ValueScorer().score(
+        current,
+        [_alt("Cheap", price=100.0, rating=4.0, review_count=1000), _alt("No price", rating=4.5)],
+    )
+    by_name = {s.name: s for s in scores}
+
+    assert by_name["Cheap"].price_percentile == 0.5
+    assert by_name["Current"].price_percentile == 1.0
+    assert by_name["Cheap"].relative_savings == 0.5
+    assert by_name["Current"].relative_savings is None
+    assert by_name["No price"].price_per_rating_point is None
+    assert by_name["Cheap"].price_per_rating_point == pytest.approx(25.0, abs=0.1)
+    assert by_name["Current"].is_current
+
+
+def test_value_table_prompt():
+    """Test the compact value table fed to the compare prompt."""
+    current = ProductInfo(name="Current", price=200.0, rating=4.0)
+    scores = ValueScorer().score(current, [_alt("Cheap", price=100.0, rating=4.0)])
+    table = format_value_table([s.model_dump() for s in scores])
+
+    assert "Cheap" in table
+    assert "Current (current)" in table
+    assert "+50%" in table
+    assert format_value_table([]) == ""
+
+
+class DownLLM:
+    async def compare_products(self, current_product, alternatives, value_scores=None):
+        raise ConnectionError("LLM offline")
+
+
+async def test_local_ranking_when_llm_is_down():
+    """Test that comparisons still return a ranking without the LLM."""
+    service = ComparisonService()
+    service.llm = DownLLM()
+    result = await service._analyze(
+        ProductInfo(name="Current", price=200.0, rating=4.0),
+        [_alt("Cheap", price=100.0, rating=4.5, review_count=900)],
+    )
+
+    assert result["analysis_source"] == "local"
+    assert result["value_scores"][0]["name"] == "Cheap"
+    assert result["verdict"].startswith("Cheap looks like the best value")
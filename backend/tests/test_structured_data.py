@@ -0,0 +1,86 @@
+import re
+from pathlib import Path
+
+from app.services.structured_data import (
+    extract_jsonld_product,
+    extract_microdata_product,
+    extract_structured_product,
+)
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "html"
+
+
+def test_jsonld_product():
+    """Test JSON-LD Product extraction from the fixture page."""
+    html = (FIXTURES_DIR / "schema_org_product.html").read_text(encoding="utf-8")
+    product = extract_jsonld_product(html)
+
+    assert product.name == "Trail Runner 3 Running Shoes"
+    assert product.price == 129.95
+    assert product.rating == 4.6
+    assert product.review_count == 318
+    assert product.brand == "Example Outfitters"
+    assert product.availability == "in_stock"
+    assert len(product.images) == 2
+
+
+def test_jsonld_graph_and_aggregate_offer():
+    """Test Products nested in @graph with AggregateOffer pricing."""
+    html = """
+    <script type="application/ld+json">
+    {"@context": "https://schema.org", "@graph": [
+      {"@type": "WebPage", "name": "Shop"},
+      {"@type": ["Product"], "name": "Desk Lamp &amp; Charger",
+       "brand": "Lumen", "image": {"url": "https://img/lamp.jpg"},
+       "offers": {"@type": "AggregateOffer", "lowPrice": 39.5, "priceCurrency": "EUR",
+                  "availability": "http://schema.org/OutOfStock"},
+       "aggregateRating": {"ratingValue": 4.1, "ratingCount": "1,204"}}
+    ]}
+    </script>
+    """
+    product = extract_structured_product(html)
+
+    assert product.name == "Desk Lamp & Charger"
+    assert product.price == 39.5
+    assert product.currency == "EUR"
+    assert product.review_count == 1204
+    assert product.availability == "out_of_stock"
+    assert product.images == ["https://img/lamp.jpg"]
+
+
+def test_microdata_product():
+    """Test microdata extraction when no JSON-LD is present."""
+    html = (FIXTURES_DIR / "schema_org_product.html").read_text(encoding="utf-8")
+    html = re.sub(r"<script.*?</script>", "", html, flags=re.S)
+    assert extract_jsonld_product(html) is None
+
+    product = extract_microdata_product(html)
+    assert product.name == "Trail Runner 3 Running Shoes"
+    assert product.price == 129.95
+    assert product.brand == "Example Outfitters"
+    assert product.review_count == 318
+
+
+def test_microdata_ignores_items_after_product_scope():
+    """Test that related products after the Product element are not read."""
+    html = (
+        '<div itemscope itemtype="https://schema.org/Product">'
+        '<h1 itemprop="name">Desk Lamp</h1>'
+        '<div><span itemprop="price" content="39.99"></span></div>'
+        "</div>"
+        '<div itemscope itemtype="https://schema.org/Product">'
+        '<span itemprop="name">Floor Lamp</span>'
+        '<span itemprop="ratingValue">2.1</span>'
+        "</div>"
+    )
+    product = extract_microdata_product(html)
+    assert product.name == "Desk Lamp"
+    assert product.price == 39.99
+    assert product.rating is None
+
+
+def test_no_structured_data_falls_through():
+    """Test pages without usable structured data return None."""
+    html = (FIXTURES_DIR / "generic_product.html").read_text(encoding="utf-8")
+    assert extract_structured_product(html) is None
+    assert extract_structured_product('<script type="application/ld+json">{bad</script>') is None
@@ -0,0 +1,106 @@
+import asyncio
+import json
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.middleware import TracingMiddleware
+from app.services.tracing import JsonlExporter, TraceExporter, end_trace, span, start_trace
+
+
+def test_span_is_a_noop_outside_a_trace():
+    """Test that untraced code records nothing."""
+    with span("llm.generate") as recorded:
+        assert recorded is None
+
+
+async def test_spans_nest_and_sum_in_server_timing():
+    """Test parent links across tasks and per-name aggregation."""
+    trace, token = start_trace(
+        "POST /api/compare", "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+    )
+    try:
+        with span("scrape") as scrape:
+
+            async def source(name: str) -> None:
+                with span("scrape.navigate", source=name):
+                    await asyncio.sleep(0.01)
+
+            await asyncio.gather(source("amazon"), source("google_shopping"))
+        with span("llm.generate", model="mock"):
+            pass
+    finally:
+        end_trace(token)
+    trace.finish(**{"http.status_code": 200})
+
+    navigations = [s for s in trace.spans if s.name == "scrape.navigate"]
+    assert {s.parent_id for s in navigations} == {scrape.span_id}
+    assert scrape.parent_id == trace.root.span_id
+    assert trace.trace_id == "0af7651916cd43dd8448eb211c80319c"
+    assert trace.root.parent_id == "b7ad6b7169203331"
+
+    header = trace.server_timing()
+    assert header.startswith("total;dur=")
+    assert 'scrape.navigate;dur=' in header and 'desc="x2"' in header
+    assert "llm.generate;dur=" in header
+
+    spans = trace.to_otlp()["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert spans[0]["kind"] == 2
+    assert len(spans) == 1 + len(trace.spans)
+    assert {"key": "model", "value": {"stringValue": "mock"}} in spans[-1]["attributes"]
+
+
+def test_spans_after_the_request_are_dropped():
+    """Test that background work outliving a trace is not recorded."""
+    trace, token = start_trace("POST /api/summarize")
+    trace.finish()
+    with span("prefetch"):
+        pass
+    end_trace(token)
+    assert trace.spans == []
+
+
+class RecordingExporter:
+    def __init__(self):
+        self.traces = []
+
+    async def export(self, trace):
+        self.traces.append(trace)
+
+
+def test_middleware_sets_server_timing_and_exports(monkeypatch):
+    """Test the header on responses and that the whole trace is exported."""
+    backend = RecordingExporter()
+    exporter = TraceExporter(backend)
+    monkeypatch.setattr("app.api.middleware.get_trace_exporter", lambda: exporter)
+
+    app = FastAPI()
+
+    @app.get("/work")
+    async def work():
+        with span("stage"):
+            await asyncio.sleep(0)
+        return {"ok": True}
+
+    app.add_middleware(TracingMiddleware)
+    with TestClient(app) as client:
+        response = client.get("/work")
+        client.portal.call(exporter.shutdown)
+
+    assert "stage;dur=" in response.headers["server-timing"]
+    assert [s.name for s in backend.traces[0].spans] == ["stage"]
+    assert backend.traces[0].root.attributes["http.status_code"] == 200
+
+
+async def test_jsonl_exporter_writes_otlp_lines(tmp_path):
+    """Test that each trace is appended as one OTLP/JSON document."""
+    path = tmp_path / "traces.jsonl"
+    trace, token = start_trace("GET /health")
+    end_trace(token)
+    trace.finish()
+    await JsonlExporter(str(path)).export(trace)
+    await JsonlExporter(str(path)).export(trace)
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0])["resourceSpans"][0]["scopeSpans"][0]["spans"][0]["name"] == "GET /health"
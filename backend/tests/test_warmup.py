@@ -0,0 +1,48 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import warmup as warmup_module
+from app.services.cache import MemoryCache
+from app.services.warmup import Warmup, get_warmup
+
+
+def test_memory_cache_dump_and_load():
+    """Test that snapshots keep values and remaining lifetimes."""
+    cache = MemoryCache()
+    cache.set("a", {"x": 1}, ttl=60)
+    cache.set("b", "gone", ttl=-1)
+
+    restored = MemoryCache()
+    assert restored.load(cache.dump()) == 1
+    assert restored.get("a") == {"x": 1}
+    assert restored.get("b") is None
+
+
+async def test_warmup_reports_failed_steps_and_becomes_ready(monkeypatch):
+    """Test that a failing step is recorded without blocking readiness."""
+    monkeypatch.setattr(warmup_module.settings, "warmup_browsers", False)
+    monkeypatch.setattr(warmup_module.settings, "warmup_llm", True)
+    monkeypatch.setattr(warmup_module.settings, "cache_snapshot_path", "")
+
+    async def offline_model(self):
+        raise ConnectionError("LLM offline")
+
+    monkeypatch.setattr(Warmup, "_load_model", offline_model)
+    state = Warmup()
+    await state.start()
+
+    status = state.status()
+    assert status["ready"] is True
+    assert status["steps"]["prime"]["status"] == "ok"
+    assert status["steps"]["llm"]["status"] == "failed"
+    assert "browsers" not in status["steps"]
+
+
+def test_ready_endpoint_reflects_warmup():
+    """Test /ready answers 503 until warmup has finished."""
+    client = TestClient(app)
+    state = get_warmup()
+    state.ready = False
+    assert client.get("/ready").status_code == 503
+    state.ready = True
+    assert client.get("/ready").json()["ready"] is True